@@ -0,0 +1,3 @@
+from .app import ApiServer, api_server, build_app
+
+__all__ = ["ApiServer", "api_server", "build_app"]
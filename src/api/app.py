@@ -0,0 +1,253 @@
+import hmac
+import logging
+from typing import Any, Awaitable, Callable, Optional
+
+from aiohttp import web
+
+from api.cache import (
+    Version,
+    VersionCache,
+    decode_cursor,
+    encode_cursor,
+    make_etag,
+    parse_if_none_match,
+)
+from config.settings import settings
+from db.models import MovieModel, SeriesModel
+from db.repository.balance import BalanceRepo
+from db.repository.base import Cursor
+from db.repository.category import CategoryRepo
+from db.repository.counter import CounterRepo
+from db.repository.movies import MoviesRepository
+from db.repository.series import SeriesRepository
+from db.session import get_session
+
+logger = logging.getLogger(__name__)
+
+VERSIONS = web.AppKey("versions", VersionCache)
+
+Handler = Callable[[web.Request], Awaitable[web.StreamResponse]]
+
+
+def _owner(request: web.Request) -> int:
+    """Чьи данные отдавать: владелец семьи или ?owner_id= из ALLOWED_IDS"""
+    if settings.HOUSEHOLD_OWNER_ID:
+        return settings.HOUSEHOLD_OWNER_ID
+    raw = request.query.get("owner_id", "")
+    if not raw.isdigit():
+        raise web.HTTPBadRequest(text="owner_id is required")
+    if int(raw) not in settings.ALLOWED_IDS:
+        raise web.HTTPForbidden
+    return int(raw)
+
+
+def _page_args(request: web.Request) -> tuple[Optional[Cursor], int]:
+    try:
+        cursor = decode_cursor(request.query.get("cursor"))
+        limit = int(request.query.get("limit", settings.API_PAGE_LIMIT))
+    except ValueError as e:
+        raise web.HTTPBadRequest(text=str(e)) from e
+    return cursor, max(1, min(limit, settings.API_PAGE_LIMIT))
+
+
+def _page(items: list[dict[str, Any]], has_next: bool) -> dict[str, Any]:
+    last = items[-1] if items else None
+    return {
+        "items": items,
+        "next_cursor": (
+            encode_cursor(last["created_at"], last["id"]) if has_next and last else None
+        ),
+    }
+
+
+async def _conditional(
+    request: web.Request,
+    scope: str,
+    probe: Callable[[], Awaitable[Version]],
+    build: Callable[[], Awaitable[Any]],
+) -> web.Response:
+    """Ответ и ETag; при совпадении If-None-Match - 304 без выборки данных"""
+    version = await request.app[VERSIONS].get(scope, probe)
+    etag = make_etag(scope, version, request.query_string)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in parse_if_none_match(request.headers.get("If-None-Match")):
+        return web.Response(status=304, headers=headers)
+    return web.json_response(await build(), headers=headers)
+
+
+@web.middleware
+async def auth_middleware(request: web.Request, handler: Handler) -> web.StreamResponse:
+    if settings.API_TOKEN:
+        token = request.headers.get("Authorization", "").removeprefix("Bearer ")
+        if not hmac.compare_digest(token, settings.API_TOKEN):
+            raise web.HTTPUnauthorized
+    return await handler(request)
+
+
+async def categories(request: web.Request) -> web.Response:
+    owner_id = _owner(request)
+
+    async def probe() -> Version:
+        async with get_session() as session:
+            return await CounterRepo(session, owner_id).revisions(
+                "categories", "balance"
+            )
+
+    async def build() -> Any:
+        async with get_session() as session:
+            rows = await CategoryRepo(session, owner_id).get_with_cur_limit()
+        return {
+            "items": [
+                {
+                    "id": row.category.id,
+                    "name": row.category.name,
+                    "spent": row.limit,
+                    "max_limit": row.category.max_limit,
+                    "last_reset": row.category.last_reset,
+                    "next_reset": row.category.next_reset,
+                }
+                for row in rows
+            ]
+        }
+
+    return await _conditional(request, f"categories:{owner_id}", probe, build)
+
+
+async def category_balance(request: web.Request) -> web.Response:
+    owner_id = _owner(request)
+    category_id = int(request.match_info["category_id"])
+    cursor, limit = _page_args(request)
+
+    async def probe() -> Version:
+        # Ревизия записей общая на владельца: правка в любой категории
+        # меняет ETag всех, зато не пропускается ни одна
+        async with get_session() as session:
+            return await CounterRepo(session, owner_id).revisions(
+                "categories", "balance"
+            )
+
+    async def build() -> Any:
+        async with get_session() as session:
+            if await CategoryRepo(session, owner_id).get(id=category_id) is None:
+                raise web.HTTPNotFound
+            balances, has_next = await BalanceRepo(session, owner_id).get_page(
+                category_id, cursor, limit
+            )
+        items = [
+            {
+                "id": b.id,
+                "name": b.name,
+                "type": b.type,
+                "amount": b.amount,
+                "created_at": b.created_at,
+                "tags": [t.name for t in b.tags],
+            }
+            for b in balances
+        ]
+        return _page(items, has_next)
+
+    return await _conditional(
+        request, f"balance:{owner_id}:{category_id}", probe, build
+    )
+
+
+def _watchlist_item(item: MovieModel | SeriesModel) -> dict[str, Any]:
+    return {
+        "id": item.id,
+        "title": item.title,
+        "year": item.year,
+        "description": item.description,
+        "watched": item.watched,
+        "created_at": item.created_at,
+        "updated_at": item.updated_at,
+    }
+
+
+async def movies(request: web.Request) -> web.Response:
+    owner_id = _owner(request)
+    cursor, limit = _page_args(request)
+    raw = request.query.get("watched")
+    watched = None if raw is None else raw.lower() in {"1", "true", "yes"}
+
+    async def probe() -> Version:
+        async with get_session() as session:
+            return await CounterRepo(session, owner_id).revisions("movies")
+
+    async def build() -> Any:
+        async with get_session() as session:
+            items, has_next = await MoviesRepository(session, owner_id).get_page(
+                watched, cursor, limit
+            )
+        return _page([_watchlist_item(m) for m in items], has_next)
+
+    return await _conditional(request, f"movies:{owner_id}", probe, build)
+
+
+async def series(request: web.Request) -> web.Response:
+    owner_id = _owner(request)
+    cursor, limit = _page_args(request)
+    status = request.query.get("status")
+
+    async def probe() -> Version:
+        async with get_session() as session:
+            return await CounterRepo(session, owner_id).revisions("series")
+
+    async def build() -> Any:
+        async with get_session() as session:
+            items, has_next = await SeriesRepository(session, owner_id).get_page(
+                status, cursor, limit
+            )
+        return _page(
+            [
+                _watchlist_item(s)
+                | {
+                    "watch_status": s.watch_status,
+                    "season_current": s.season_current,
+                    "episode_current": s.episode_current,
+                }
+                for s in items
+            ],
+            has_next,
+        )
+
+    return await _conditional(request, f"series:{owner_id}", probe, build)
+
+
+def build_app(ttl: float) -> web.Application:
+    app = web.Application(middlewares=[auth_middleware])
+    app[VERSIONS] = VersionCache(ttl)
+    app.router.add_get("/api/categories", categories)
+    app.router.add_get(r"/api/categories/{category_id:\d+}/balance", category_balance)
+    app.router.add_get("/api/movies", movies)
+    app.router.add_get("/api/series", series)
+    return app
+
+
+class ApiServer:
+    """
+    Read-only JSON API для домашних дашбордов.
+
+    Работает в процессе бота и читает через тот же `database`, что и
+    Telegram-обработчики, - отдельного движка и пула нет.
+    """
+
+    def __init__(self) -> None:
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self) -> None:
+        if not settings.API_PORT or self._runner is not None:
+            return
+        runner = web.AppRunner(build_app(settings.API_ETAG_TTL), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, settings.API_HOST, settings.API_PORT).start()
+        self._runner = runner
+        logger.info("API listening on %s:%d", settings.API_HOST, settings.API_PORT)
+
+    async def stop(self) -> None:
+        if self._runner is None:
+            return
+        await self._runner.cleanup()
+        self._runner = None
+
+
+api_server = ApiServer()
@@ -0,0 +1,65 @@
+import base64
+import binascii
+import hashlib
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+from db.repository.base import Cursor
+
+Version = tuple[Any, ...]
+
+
+def encode_cursor(created_at: int, id_: int) -> str:
+    raw = f"{created_at}.{id_}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(value: Optional[str]) -> Optional[Cursor]:
+    """Позиция из запроса; ValueError, если она испорчена"""
+    if not value:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode()
+        created_at, id_ = raw.split(".")
+        return int(created_at), int(id_)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {value!r}") from e
+
+
+def make_etag(scope: str, version: Version, query: str) -> str:
+    digest = hashlib.sha1(
+        f"{scope}|{version}|{query}".encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def parse_if_none_match(header: Optional[str]) -> set[str]:
+    if not header:
+        return set()
+    return {tag.strip().removeprefix("W/") for tag in header.split(",")}
+
+
+class VersionCache:
+    """
+    Версии ресурсов (max(updated_at), count), живущие недолго.
+
+    Пока версия свежая, повторный опрос, где If-None-Match не менялся, получает 304
+    вообще без запросов к БД. Потом версия перечитывается одним запросом по
+    индексам; сами данные - только если она изменилась.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._versions: dict[str, tuple[float, Version]] = {}
+
+    async def get(self, scope: str, probe: Callable[[], Awaitable[Version]]) -> Version:
+        now = time.monotonic()
+        cached = self._versions.get(scope)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        version = await probe()
+        self._versions[scope] = (now + self.ttl, version)
+        return version
+
+    def clear(self) -> None:
+        self._versions.clear()
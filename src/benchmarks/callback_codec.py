@@ -0,0 +1,99 @@
+"""
+Упакованная callback_data против текстовой `a:b:{id}:{skip}`: размер и скорость.
+
+Текст разбирается так же, как в обработчиках (split и int), упакованная
+кнопка - через реестр действий. Третий вариант - навигация, несущая полное
+состояние (фильтр, сортировка, курсор, путь возврата), которая текстом
+в 64 байта уже не помещается.
+
+Запуск из src/:
+    python -m benchmarks.callback_codec --number 200000
+"""
+
+import argparse
+import timeit
+from typing import Callable
+
+from bot.callback import MAX_CALLBACK_BYTES, ActionRegistry, Nav
+
+registry = ActionRegistry()
+PAGE = registry.register(1, "page", category_id=int, skip=int)
+BROWSE = registry.register(
+    2, "browse", category_id=int, tag=int, sort=int, cursor=int, back=Nav
+)
+
+CATEGORY_ID = 48213
+SKIP = 130
+CURSOR = 1_760_000_000
+
+
+def text_encode() -> str:
+    return f"balance:detail:category:{CATEGORY_ID}:{SKIP}"
+
+
+def text_decode(data: str) -> tuple[int, int]:
+    _, _, _, category_id, skip = data.split(":")
+    return int(category_id), int(skip)
+
+
+def browse_nav() -> Nav:
+    return BROWSE.nav(
+        category_id=CATEGORY_ID,
+        tag=17,
+        sort=2,
+        cursor=CURSOR,
+        back=PAGE.nav(category_id=CATEGORY_ID, skip=SKIP),
+    )
+
+
+def browse_text() -> str:
+    return (
+        f"balance:detail:category:{CATEGORY_ID}:tag:17:sort:2:cursor:{CURSOR}"
+        f":back:balance:detail:category:{CATEGORY_ID}:{SKIP}"
+    )
+
+
+def per_call_ns(func: Callable[[], object], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    text = text_encode()
+    packed = PAGE.pack(category_id=CATEGORY_ID, skip=SKIP)
+    browse = browse_nav().pack()
+    assert text_decode(text) == (CATEGORY_ID, SKIP)  # noqa: S101
+    assert registry.unpack(browse) == browse_nav()  # noqa: S101
+
+    print(f"{'':24}{'bytes':>6}{'encode ns':>12}{'decode ns':>12}")
+    rows = [
+        ("text page", text, text_encode, lambda: text_decode(text)),
+        (
+            "packed page",
+            packed,
+            lambda: PAGE.pack(category_id=CATEGORY_ID, skip=SKIP),
+            lambda: registry.unpack(packed),
+        ),
+        (
+            "packed full state",
+            browse,
+            lambda: browse_nav().pack(),
+            lambda: registry.unpack(browse),
+        ),
+    ]
+    for name, data, encode, decode in rows:
+        print(
+            f"{name:24}{len(data):6}"
+            f"{per_call_ns(encode, args.number):12.0f}"
+            f"{per_call_ns(decode, args.number):12.0f}"
+        )
+    full_text = browse_text()
+    fits = "fits" if len(full_text) <= MAX_CALLBACK_BYTES else "does not fit"
+    print(f"full state as text: {len(full_text)} bytes, {fits} in {MAX_CALLBACK_BYTES}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Пропускная способность режима supervisor: 1 обработчик против N.
+
+Апдейты - нажатия кнопок "Баланс" и "Подробно" из разных чатов, их
+обрабатывают настоящие роутеры и БД; вместо Bot API - заглушка, отвечающая
+через `--api-latency` секунд. Прирост ограничен числом ядер машины.
+
+Запуск из src/:
+    python -m benchmarks.cluster_throughput --workers 1 2 4 --updates 2000
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, AsyncGenerator, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from cluster.supervisor import Supervisor
+from config.settings import settings
+from db.models import Base
+from db.repository.category import CategoryRepo
+from db.repository.user import UserModelRepo
+
+CHATS = 500
+BUTTONS = ["balance", "balance:detail:by_category"]
+
+
+class FakeSession(BaseSession):
+    """Bot API без сети: каждый запрос "успешен" через фиксированную задержку"""
+
+    def __init__(self, latency: float) -> None:
+        super().__init__()
+        self.latency = latency
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return True  # type: ignore[return-value]
+
+    async def stream_content(  # type: ignore[override]
+        self, url: str, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+def make_bot() -> Bot:
+    """Фабрика бота для процессов-обработчиков (должна импортироваться по имени)"""
+    latency = float(os.environ.get("BENCH_API_LATENCY", "0"))
+    return Bot("1:bench", session=FakeSession(latency))
+
+
+def make_update(update_id: int, chat_id: int) -> dict[str, Any]:
+    user = {"id": settings.ALLOWED_IDS[0], "is_bot": False, "first_name": "bench"}
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": user,
+            "chat_instance": str(chat_id),
+            "data": BUTTONS[update_id % len(BUTTONS)],
+            "message": {
+                "message_id": 1,
+                "date": 0,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": user,
+            },
+        },
+    }
+
+
+async def prepare(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    owner_id = settings.owner_for(settings.ALLOWED_IDS[0])
+    async with async_sessionmaker(engine).begin() as session:
+        await UserModelRepo(session).add(owner_id)
+        for i in range(10):
+            await CategoryRepo(session, owner_id).create(f"category {i}", 1_000_000, 0)
+    await engine.dispose()
+
+
+async def measure(workers: int, updates: int) -> float:
+    supervisor = Supervisor(workers, bot_factory=make_bot)
+    await supervisor.start()
+
+    # Прогрев: процессы импортируют роутеры и подключаются к БД
+    for chat_id in range(workers):
+        await supervisor.dispatch(make_update(-1 - chat_id, chat_id))
+    await supervisor.wait_idle()
+
+    started = time.perf_counter()
+    for update_id in range(updates):
+        await supervisor.dispatch(make_update(update_id, update_id % CHATS))
+    await supervisor.wait_idle()
+    elapsed = time.perf_counter() - started
+
+    await supervisor.stop()
+    return updates / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--api-latency", type=float, default=0.0, help="seconds")
+    args = parser.parse_args()
+
+    print(f"cpu cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        # Обработчики читают настройки из окружения при старте
+        os.environ["DB_URL"] = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        os.environ["BENCH_API_LATENCY"] = str(args.api_latency)
+        asyncio.run(prepare(os.environ["DB_URL"]))
+
+        base = None
+        for workers in args.workers:
+            rate = asyncio.run(measure(workers, args.updates))
+            base = base or rate
+            print(f"workers {workers:2}: {rate:8.0f} updates/s  x{rate / base:.2f}")
+
+
+if __name__ == "__main__":
+    main()
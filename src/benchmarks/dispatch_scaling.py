@@ -0,0 +1,89 @@
+"""
+Параллельная обработка апдейтов: пропускная способность при разных лимитах
+одновременных обработчиков и проверка порядка внутри чата.
+
+Обработчик имитирует ввод-вывод (БД, Bot API) случайной задержкой, поэтому
+без очереди чата апдейты одного чата обгоняют друг друга.
+
+Запуск из src/:
+    python -m benchmarks.dispatch_scaling --updates 2000 --chats 50
+"""
+
+import argparse
+import asyncio
+import logging
+import random
+import time
+from typing import Optional
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.types import CallbackQuery, Update
+
+from benchmarks.cluster_throughput import make_update
+from bot.ordering import ChatOrderingMiddleware
+
+
+async def run(
+    args: argparse.Namespace, limit: Optional[int]
+) -> tuple[float, int, Optional[ChatOrderingMiddleware]]:
+    rnd = random.Random(args.seed)  # noqa: S311
+    delays = [rnd.uniform(0, 2 * args.latency) for _ in range(args.updates)]
+    seen: dict[int, list[int]] = {}
+
+    router = Router()
+
+    @router.callback_query()
+    async def handler(clbq: CallbackQuery) -> None:
+        update_id = int(clbq.id)
+        await asyncio.sleep(delays[update_id])
+        seen.setdefault(clbq.chat_instance, []).append(update_id)  # type: ignore[arg-type]
+
+    dp = Dispatcher()
+    dp.include_router(router)
+    middleware = None
+    if limit is not None:
+        middleware = ChatOrderingMiddleware(limit)
+        dp.update.outer_middleware(middleware)
+
+    bot = Bot("1:bench")
+    updates = [
+        Update.model_validate(make_update(i, i % args.chats))
+        for i in range(args.updates)
+    ]
+
+    started = time.perf_counter()
+    # Как polling при handle_as_tasks=True: каждый апдейт - отдельная задача
+    await asyncio.gather(*(dp.feed_update(bot, u) for u in updates))
+    elapsed = time.perf_counter() - started
+    await bot.session.close()
+
+    reordered = sum(ids != sorted(ids) for ids in seen.values())
+    return args.updates / elapsed, reordered, middleware
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds")
+    parser.add_argument("--limits", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    # Предупреждения про долгое ожидание здесь ожидаемы
+    logging.getLogger("bot.ordering").setLevel(logging.ERROR)
+
+    rate, reordered, _ = asyncio.run(run(args, None))
+    print(f"unbounded  {rate:8.0f} updates/s, chats out of order: {reordered}")
+    for limit in args.limits:
+        rate, reordered, middleware = asyncio.run(run(args, limit))
+        stats = middleware.stats.snapshot() if middleware else {}
+        print(
+            f"limit {limit:4} {rate:8.0f} updates/s, chats out of order: {reordered}, "
+            f"max queue {stats['max_waiting']:.0f}, "
+            f"wait avg {stats['wait_avg'] * 1000:.0f} ms "
+            f"max {stats['wait_max'] * 1000:.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,559 @@
+"""
+Нагрузочный прогон: сотни виртуальных пользователей против `bot.dp.dp`.
+
+Каждый пользователь - отдельный чат, который по кругу выполняет сценарии
+(открыть баланс, пройти мастер добавления, листать сериалы, отмечать
+эпизоды, быстрый ввод), делая паузы «на подумать», и нажимает кнопки, которые
+бот ему показал. Апдейты идут через настоящие middleware, роутеры и БД;
+Bot API заменяет локальный HTTP-сервер, добавляющий задержку `--api-latency`
+и долей ответов 429 `--rate-limit`.
+
+Итог: устойчивые апдейты в секунду, перцентили времени обработки апдейта
+по сценариям, очередь писателя SQLite (ожидание и group commit) и ошибки
+по типам. Сценарии и паузы определяются `--seed`, поэтому прогоны разных
+коммитов сравнимы: `--json` сохраняет результат и хеш коммита,
+`--compare` печатает разницу против сохранённого.
+
+Запуск из src/:
+    python -m benchmarks.load --users 200 --duration 30
+    python -m benchmarks.load --users 200 --json before.json
+    python -m benchmarks.load --users 200 --compare before.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import subprocess
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+
+from aiohttp import web
+
+FIRST_USER_ID = 7_000_000
+CATEGORIES = ("Продукты", "Кафе", "Транспорт")
+SERIES_PER_USER = 5
+# Методы Bot API, которые возвращают сообщение
+MESSAGE_METHODS = {
+    "sendPhoto",
+    "sendMessage",
+    "editMessageMedia",
+    "editMessageCaption",
+    "editMessageReplyMarkup",
+}
+
+
+class FakeBotAPI:
+    """
+    Bot API на localhost: отвечает правдоподобными сообщениями и помнит,
+    что сейчас показано в каждом сообщении, - по этим экранам виртуальные
+    пользователи выбирают, куда нажать.
+    """
+
+    def __init__(self, latency: float, rate_limit: float, seed: int) -> None:
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.rnd = random.Random(seed)  # noqa: S311
+        self.messages: dict[tuple[int, int], dict[str, Any]] = {}
+        # Последнее отправленное ботом сообщение чата
+        self.last_sent: dict[int, int] = {}
+        self.calls: Counter[str] = Counter()
+        self.rate_limited = 0
+        self._message_ids = itertools.count(1)
+        self._file_ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        host, port = self._runner.addresses[0][:2]
+        self.url = f"http://{host}:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.rnd.uniform(0.5, 1.5) * self.latency)
+        if self.rnd.random() < self.rate_limit:
+            self.rate_limited += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": "Too Many Requests: retry after 1",
+                    "parameters": {"retry_after": 1},
+                },
+                status=429,
+            )
+        form = await request.post()
+        return web.json_response({"ok": True, "result": self.result(method, form)})
+
+    def photo(self, value: Any) -> list[dict[str, Any]]:
+        if isinstance(value, str) and not value.startswith("attach://"):
+            file_id = value
+        else:
+            file_id = f"photo{next(self._file_ids)}"
+        return [
+            {
+                "file_id": file_id,
+                "file_unique_id": f"u{file_id}",
+                "width": 1280,
+                "height": 720,
+            }
+        ]
+
+    def result(self, method: str, form: Any) -> Any:
+        if method not in MESSAGE_METHODS:
+            return True
+        chat_id = int(form["chat_id"])
+        if method.startswith("send"):
+            message_id = next(self._message_ids)
+            old: dict[str, Any] = {}
+        else:
+            message_id = int(form["message_id"])
+            old = self.messages.get((chat_id, message_id), {})
+
+        message: dict[str, Any] = {
+            "message_id": message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "photo": old.get("photo"),
+            "caption": form.get("caption", old.get("caption")),
+            "text": form.get("text"),
+        }
+        if method == "sendPhoto":
+            message["photo"] = self.photo(form["photo"])
+        elif method == "editMessageMedia":
+            media = json.loads(form["media"])
+            message["photo"] = self.photo(media["media"])
+            message["caption"] = media.get("caption")
+        # Правка без клавиатуры убирает её, как в Telegram
+        if "reply_markup" in form:
+            message["reply_markup"] = json.loads(form["reply_markup"])
+        message = {k: v for k, v in message.items() if v is not None}
+
+        self.messages[(chat_id, message_id)] = message
+        if method == "sendPhoto":
+            self.last_sent[chat_id] = message_id
+        return message
+
+
+class Stats:
+    def __init__(self, measure_from: float) -> None:
+        self.measure_from = measure_from
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        # Апдейты по секундам окна замера
+        self.per_second: Counter[int] = Counter()
+        self.errors: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def record(self, script: str, started: float, elapsed: float) -> None:
+        if started < self.measure_from:
+            return
+        self.latencies[script].append(elapsed)
+        self.per_second[int(started - self.measure_from)] += 1
+
+
+class ButtonMissingError(Exception):
+    """Ожидаемой кнопки нет: сценарий прерывается"""
+
+
+class VirtualUser:
+    def __init__(
+        self,
+        user_id: int,
+        *,
+        bot: Any,
+        dp: Any,
+        api: FakeBotAPI,
+        rnd: random.Random,
+        stats: Stats,
+        think: float,
+    ) -> None:
+        self.user_id = user_id
+        self.bot = bot
+        self.dp = dp
+        self.api = api
+        self.rnd = rnd
+        self.stats = stats
+        self.think = think
+        self.script = "start"
+        self.message_id: Optional[int] = None
+        self._user = {"id": user_id, "is_bot": False, "first_name": f"load{user_id}"}
+
+    async def feed(self, update: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        try:
+            await self.dp.feed_raw_update(self.bot, update)
+        except Exception as e:
+            self.stats.errors[type(e).__name__] += 1
+        self.stats.record(self.script, started, time.perf_counter() - started)
+        if self.think:
+            await asyncio.sleep(self.rnd.expovariate(1 / self.think))
+
+    async def text(self, text: str) -> None:
+        await self.feed(
+            {
+                "update_id": next(update_ids),
+                "message": {
+                    "message_id": next(update_ids),
+                    "date": int(time.time()),
+                    "chat": {"id": self.user_id, "type": "private"},
+                    "from": self._user,
+                    "text": text,
+                },
+            }
+        )
+        self.message_id = self.api.last_sent.get(self.user_id, self.message_id)
+
+    def screen(self) -> dict[str, Any]:
+        if self.message_id is None:
+            raise ButtonMissingError("no screen")
+        return self.api.messages[(self.user_id, self.message_id)]
+
+    async def press(self, data: str) -> None:
+        update_id = next(update_ids)
+        await self.feed(
+            {
+                "update_id": update_id,
+                "callback_query": {
+                    "id": str(update_id),
+                    "from": self._user,
+                    "chat_instance": str(self.user_id),
+                    "data": data,
+                    "message": self.screen(),
+                },
+            }
+        )
+
+    async def tap(self, pattern: str) -> None:
+        """Нажимает случайную кнопку экрана, чья callback_data подходит под `pattern`"""
+        keyboard = self.screen().get("reply_markup", {}).get("inline_keyboard", [])
+        buttons = [
+            button["callback_data"]
+            for row in keyboard
+            for button in row
+            if re.fullmatch(pattern, button.get("callback_data", ""))
+        ]
+        if not buttons:
+            raise ButtonMissingError(pattern)
+        await self.press(self.rnd.choice(buttons))
+
+    async def run(self, deadline: float) -> None:
+        await self.text("/start")
+        while time.perf_counter() < deadline:
+            name, script = self.rnd.choices(SCRIPTS, weights=WEIGHTS)[0]
+            self.script = name
+            try:
+                await script(self)
+            except ButtonMissingError:
+                self.stats.misses[name] += 1
+                self.script = "start"
+                await self.text("/start")
+
+
+async def open_balance(u: VirtualUser) -> None:
+    await u.press("main")
+    await u.tap("balance")
+    await u.tap("balance:detail:by_category")
+    await u.tap(r"balance:detail:category:\d+:0")
+
+
+async def add_wizard(u: VirtualUser) -> None:
+    await u.press("main")
+    await u.tap("balance")
+    await u.tap("balance:add")
+    await u.tap(r"balance:add:\d+")
+    await u.tap("balance:add:expense")
+    await u.text(u.rnd.choice(("обед", "такси", "продукты", "кофе")))
+    await u.text(str(u.rnd.randint(100, 5000)))
+    await u.text(u.rnd.choice(("-", "еда", "еда, друзья")))
+    await u.tap("balance:confirm")
+
+
+async def flip_series(u: VirtualUser) -> None:
+    await u.press("main")
+    await u.tap("series")
+    await u.tap(r"series:currently_watching:\d+")
+    for _ in range(3):
+        await u.tap(r"series:currently_watching:[1-9]\d*")
+
+
+async def mark_episodes(u: VirtualUser) -> None:
+    await u.press("main")
+    await u.tap("series")
+    await u.tap(r"series:currently_watching:\d+")
+    for _ in range(3):
+        # Упакованные кнопки карточки - «+1 эпизод» и «+1 сезон»
+        await u.tap(r"~.+")
+
+
+async def quick_entry(u: VirtualUser) -> None:
+    category = u.rnd.choice(CATEGORIES).lower()
+    await u.text(f"кофе {u.rnd.randint(100, 900)} #кофе @{category}")
+    await u.tap(r"balance:quick:[0-9a-f]+:\d+")
+
+
+Script = Callable[[VirtualUser], Awaitable[None]]
+SCRIPTS: list[tuple[str, Script]] = [
+    ("open_balance", open_balance),
+    ("add_wizard", add_wizard),
+    ("flip_series", flip_series),
+    ("mark_episodes", mark_episodes),
+    ("quick_entry", quick_entry),
+]
+WEIGHTS = [3, 1, 2, 2, 1]
+update_ids = itertools.count(1)
+
+
+async def prepare(url: str, users: list[int]) -> None:
+    from sqlalchemy.ext.asyncio import (  # noqa: PLC0415
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from db.models import Base  # noqa: PLC0415
+    from db.repository.category import CategoryRepo  # noqa: PLC0415
+    from db.repository.series import SeriesRepository  # noqa: PLC0415
+    from db.repository.user import UserModelRepo  # noqa: PLC0415
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine).begin() as session:
+        for user_id in users:
+            await UserModelRepo(session).add(user_id)
+            for name in CATEGORIES:
+                await CategoryRepo(session, user_id).create(name, 5_000_000, 0)
+            for i in range(SERIES_PER_USER):
+                await SeriesRepository(session, user_id).create(
+                    f"Сериал {i}", 2020, None, None, watch_status="watching"
+                )
+    await engine.dispose()
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def latency_summary(values: list[float]) -> dict[str, float]:
+    return {
+        "n": len(values),
+        "p50": percentile(values, 50) * 1000,
+        "p90": percentile(values, 90) * 1000,
+        "p99": percentile(values, 99) * 1000,
+        "max": max(values, default=0.0) * 1000,
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace, users: list[int]) -> dict[str, Any]:
+    # Импорт только после настройки окружения, которое читают settings и движок БД
+    from aiogram import Bot  # noqa: PLC0415
+    from aiogram.client.default import DefaultBotProperties  # noqa: PLC0415
+    from aiogram.client.session.aiohttp import AiohttpSession  # noqa: PLC0415
+    from aiogram.client.telegram import TelegramAPIServer  # noqa: PLC0415
+    from aiogram.enums import ParseMode  # noqa: PLC0415
+
+    from bot.dp import chat_ordering, dp  # noqa: PLC0415
+    from bot.tracing import BotApiTraceMiddleware  # noqa: PLC0415
+    from config.tracing import tracer  # noqa: PLC0415
+    from db.session import database  # noqa: PLC0415
+
+    api = FakeBotAPI(args.api_latency, args.rate_limit, args.seed)
+    await api.start()
+    bot = Bot(
+        "1:load",
+        session=AiohttpSession(api=TelegramAPIServer.from_base(api.url)),
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    # Так же, как в bot/bot.py: при TRACE_SAMPLE_RATE в трейсах
+    # видны запросы к Bot API
+    if tracer.enabled:
+        bot.session.middleware(BotApiTraceMiddleware())
+
+    started = time.perf_counter()
+    stats = Stats(measure_from=started + args.warmup)
+    deadline = started + args.warmup + args.duration
+    rnd = random.Random(args.seed)  # noqa: S311
+    virtual_users = [
+        VirtualUser(
+            user_id,
+            bot=bot,
+            dp=dp,
+            api=api,
+            rnd=random.Random(rnd.random()),  # noqa: S311
+            stats=stats,
+            think=args.think,
+        )
+        for user_id in users
+    ]
+    await asyncio.gather(*(u.run(deadline) for u in virtual_users))
+    elapsed = min(time.perf_counter() - stats.measure_from, args.duration)
+
+    writer = database.writer
+    await bot.session.close()
+    await api.stop()
+    await database.dispose()
+
+    all_latencies = [v for values in stats.latencies.values() for v in values]
+    seconds = [stats.per_second.get(s, 0) for s in range(int(elapsed))]
+    return {
+        "commit": git_commit(),
+        # Параметры прогона без путей вывода: по ним сверяются сравниваемые прогоны
+        "args": {k: v for k, v in vars(args).items() if k not in ("json", "compare")},
+        "updates": len(all_latencies),
+        "updates_per_s": len(all_latencies) / elapsed if elapsed > 0 else 0.0,
+        "updates_per_s_min": min(seconds, default=0),
+        "latency_ms": {
+            "all": latency_summary(all_latencies),
+            **{
+                name: latency_summary(values)
+                for name, values in sorted(stats.latencies.items())
+            },
+        },
+        "errors": dict(stats.errors),
+        "misses": dict(stats.misses),
+        "bot_api": {"calls": sum(api.calls.values()), "429": api.rate_limited},
+        "dispatch": chat_ordering.stats.snapshot(),
+        "db_writer": None
+        if writer is None
+        else {
+            "writes": writer.writes,
+            "batches": writer.batches,
+            "max_batch": writer.max_batch_seen,
+            "failed": writer.failed,
+            "wait_avg_ms": writer.wait_total / max(writer.writes, 1) * 1000,
+        },
+    }
+
+
+def report(result: dict[str, Any]) -> None:
+    args = result["args"]
+    print(
+        f"commit {result['commit']}, users {args['users']}, {args['duration']}s, "
+        f"api latency {args['api_latency'] * 1000:.0f} ms, "
+        f"429 rate {args['rate_limit']:.1%}"
+    )
+    print(
+        f"updates {result['updates']}: {result['updates_per_s']:.1f}/s sustained, "
+        f"worst second {result['updates_per_s_min']}"
+    )
+    print(f"{'':16}{'n':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  ms")
+    for name, s in result["latency_ms"].items():
+        print(
+            f"{name:16}{s['n']:7}{s['p50']:9.1f}{s['p90']:9.1f}"
+            f"{s['p99']:9.1f}{s['max']:9.1f}"
+        )
+    api = result["bot_api"]
+    print(f"bot api: {api['calls']} calls, {api['429']} answered 429")
+    dispatch = result["dispatch"]
+    print(
+        f"dispatch queue: wait avg {dispatch['wait_avg'] * 1000:.1f} ms, "
+        f"max {dispatch['wait_max'] * 1000:.1f} ms, "
+        f"max waiting {dispatch['max_waiting']}"
+    )
+    writer = result["db_writer"]
+    if writer is None:
+        print("db writer: n/a (PostgreSQL pool)")
+    else:
+        print(
+            f"db writer: {writer['writes']} writes in {writer['batches']} batches "
+            f"(max {writer['max_batch']}), failed {writer['failed']}, "
+            f"queue wait avg {writer['wait_avg_ms']:.1f} ms"
+        )
+    for title, counts in (("errors", result["errors"]), ("misses", result["misses"])):
+        if counts:
+            print(f"{title}: " + ", ".join(f"{k} {v}" for k, v in counts.items()))
+
+
+def compare(base: dict[str, Any], result: dict[str, Any]) -> None:
+    metrics: list[tuple[str, Callable[[dict[str, Any]], float]]] = [
+        ("updates/s", lambda r: r["updates_per_s"]),
+        ("p50 ms", lambda r: r["latency_ms"]["all"]["p50"]),
+        ("p99 ms", lambda r: r["latency_ms"]["all"]["p99"]),
+    ]
+    if base.get("db_writer") and result.get("db_writer"):
+        metrics.append(("writer wait ms", lambda r: r["db_writer"]["wait_avg_ms"]))
+    if base["args"] != result["args"]:
+        print("\nwarning: runs used different arguments")
+    print(f"\ncompared with {base['commit']}:")
+    for title, get in metrics:
+        old, new = get(base), get(result)
+        change = (new - old) / old * 100 if old else 0.0
+        print(f"  {title:16}{old:10.1f} -> {new:10.1f}  {change:+6.1f}%")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--warmup", type=float, default=3.0, help="seconds")
+    parser.add_argument(
+        "--think", type=float, default=0.5, help="mean pause between taps, seconds"
+    )
+    parser.add_argument("--api-latency", type=float, default=0.05, help="seconds")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="share of 429 answers"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, help="MAX_CONCURRENT_UPDATES, default: settings"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db-url", default="", help="default: temporary SQLite")
+    parser.add_argument("--json", type=Path, help="save the result")
+    parser.add_argument("--compare", type=Path, help="result saved by --json")
+    args = parser.parse_args()
+
+    # Ошибки обработки считаются в отчёте, трейсбек каждой не нужен
+    logging.getLogger("aiogram.event").setLevel(logging.CRITICAL)
+    users = [FIRST_USER_ID + i for i in range(args.users)]
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DB_URL"] = (
+            args.db_url or f"sqlite+aiosqlite:///{Path(tmp) / 'load.db'}"
+        )
+        os.environ["ALLOWED_IDS"] = json.dumps(users)
+        os.environ["HOUSEHOLD_OWNER_ID"] = "0"
+        if args.concurrency:
+            os.environ["MAX_CONCURRENT_UPDATES"] = str(args.concurrency)
+        asyncio.run(prepare(os.environ["DB_URL"], users))
+        result = asyncio.run(run(args, users))
+
+    report(result)
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), result)
+    if args.json:
+        args.json.write_text(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
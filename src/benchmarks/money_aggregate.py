@@ -0,0 +1,112 @@
+"""
+Скорость и точность агрегатов по суммам: REAL (рубли) против INTEGER (копейки).
+
+Запуск из src/:
+    python -m benchmarks.money_aggregate --rows 3000000
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from db.models import Base
+from db.repository.category import CategoryRepo
+
+CATEGORIES = 20
+BATCH = 100_000
+
+
+def populate(path: Path, rows: int, seed: int) -> list[int]:
+    """Заполняет balance/balance_category, возвращает суммы в копейках"""
+    rnd = random.Random(seed)  # noqa: S311
+    amounts = [rnd.randint(1, 5_000_000) for _ in range(rows)]
+
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=OFF")
+    con.execute("PRAGMA synchronous=OFF")
+    con.execute("INSERT INTO users (tg_id, created_at, updated_at) VALUES (1, 0, 0)")
+    con.executemany(
+        "INSERT INTO balance_category (id, name, max_limit, last_reset, "
+        "created_at, updated_at, reset_period, period_expense, alert_level, "
+        "owner_id) VALUES (?, ?, NULL, 0, 0, 0, 'manual', 0, 0, 1)",
+        [(i, f"category {i}") for i in range(1, CATEGORIES + 1)],
+    )
+    con.execute("CREATE TABLE balance_real (category_id INTEGER, amount REAL)")
+    for start in range(0, rows, BATCH):
+        chunk = amounts[start : start + BATCH]
+        con.executemany(
+            "INSERT INTO balance (type, name, amount, category_id, created_at, "
+            "updated_at, owner_id) VALUES ('expense', 'bench', ?, ?, 1, 1, 1)",
+            [(a, i % CATEGORIES + 1) for i, a in enumerate(chunk, start)],
+        )
+        con.executemany(
+            "INSERT INTO balance_real (category_id, amount) VALUES (?, ?)",
+            [(i % CATEGORIES + 1, a / 100) for i, a in enumerate(chunk, start)],
+        )
+    con.commit()
+    con.close()
+    return amounts
+
+
+def timed_sum(path: Path, table: str) -> tuple[float, float]:
+    con = sqlite3.connect(path)
+    started = time.perf_counter()
+    (total,) = con.execute(f"SELECT SUM(amount) FROM {table}").fetchone()  # noqa: S608
+    elapsed = time.perf_counter() - started
+    con.close()
+    return total, elapsed
+
+
+async def timed_repo_aggregate(path: Path) -> tuple[int, float]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        started = time.perf_counter()
+        categories = await CategoryRepo(session).get_with_cur_limit()
+        elapsed = time.perf_counter() - started
+    await engine.dispose()
+    return sum(c.limit for c in categories), elapsed
+
+
+async def prepare_schema(path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        asyncio.run(prepare_schema(path))
+
+        started = time.perf_counter()
+        amounts = populate(path, args.rows, args.seed)
+        print(f"populate: {args.rows} rows in {time.perf_counter() - started:.1f}s")
+
+        exact = sum(amounts)
+        real_total, real_time = timed_sum(path, "balance_real")
+        int_total, int_time = timed_sum(path, "balance")
+        repo_total, repo_time = asyncio.run(timed_repo_aggregate(path))
+
+        real_drift = Decimal(str(real_total)) * 100 - exact
+        print(f"exact total:   {exact} kop.")
+        print(f"REAL SUM:      {real_time * 1000:8.1f} ms, drift {real_drift}")
+        print(f"INTEGER SUM:   {int_time * 1000:8.1f} ms, drift {int_total - exact}")
+        print(f"repo query:    {repo_time * 1000:8.1f} ms, drift {repo_total - exact}")
+
+
+if __name__ == "__main__":
+    main()
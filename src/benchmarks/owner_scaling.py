@@ -0,0 +1,153 @@
+"""
+Стоимость запросов одного пользователя при росте числа пользователей.
+
+Объём данных каждого пользователя одинаков, база растёт ступенями;
+на каждой ступени замеряются запросы репозиториев, отфильтрованные по владельцу.
+Индексы, ведущие по owner_id, держат время запроса почти постоянным.
+
+Запуск из src/:
+    python -m benchmarks.owner_scaling --users 1 10 100 1000
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.models import Base
+from db.repository.balance import BalanceRepo
+from db.repository.category import CategoryRepo
+from db.repository.movies import MoviesRepository
+
+CATEGORIES_PER_USER = 5
+ROWS_PER_USER = 500
+MOVIES_PER_USER = 50
+PROBES = 50
+
+Query = Callable[[AsyncSession, int], Awaitable[object]]
+
+
+def populate(path: Path, first: int, last: int) -> None:
+    """Добавляет пользователей first..last: категории, записи баланса, фильмы"""
+    con = sqlite3.connect(path)
+    con.execute("PRAGMA journal_mode=OFF")
+    con.execute("PRAGMA synchronous=OFF")
+    for owner in range(first, last + 1):
+        con.execute(
+            "INSERT INTO users (tg_id, created_at, updated_at) VALUES (?, 0, 0)",
+            (owner,),
+        )
+        # id категорий однозначно выводятся из владельца: см. category_id()
+        con.executemany(
+            "INSERT INTO balance_category (id, name, max_limit, last_reset, "
+            "created_at, updated_at, reset_period, period_expense, alert_level, "
+            "owner_id) VALUES (?, ?, NULL, 0, 0, 0, 'manual', 0, 0, ?)",
+            [
+                (category_id(owner, i), f"category {i}", owner)
+                for i in range(CATEGORIES_PER_USER)
+            ],
+        )
+        con.executemany(
+            "INSERT INTO balance (type, name, amount, category_id, created_at, "
+            "updated_at, owner_id) VALUES ('expense', 'bench', 100, ?, ?, ?, ?)",
+            [
+                (category_id(owner, i % CATEGORIES_PER_USER), i + 1, i + 1, owner)
+                for i in range(ROWS_PER_USER)
+            ],
+        )
+        con.executemany(
+            "INSERT INTO movies (title, title_norm, year, watched, created_at, "
+            "updated_at, owner_id) VALUES (?, ?, 2000, ?, ?, ?, ?)",
+            [
+                (f"Movie {i}", f"movie {i}", i % 2 == 0, i + 1, i + 1, owner)
+                for i in range(MOVIES_PER_USER)
+            ],
+        )
+    con.commit()
+    con.close()
+
+
+def category_id(owner: int, index: int) -> int:
+    return (owner - 1) * CATEGORIES_PER_USER + index + 1
+
+
+async def categories_query(session: AsyncSession, owner: int) -> object:
+    return await CategoryRepo(session, owner).get_with_cur_limit()
+
+
+async def history_query(session: AsyncSession, owner: int) -> object:
+    return await BalanceRepo(session, owner).get_by_category_and_last_reset(
+        category_id(owner, 0)
+    )
+
+
+async def movies_query(session: AsyncSession, owner: int) -> object:
+    return await MoviesRepository(session, owner).get_by_is_watched(False)
+
+
+QUERIES: dict[str, Query] = {
+    "categories": categories_query,
+    "history": history_query,
+    "movies": movies_query,
+}
+
+
+async def measure(path: Path, users: int, rnd: random.Random) -> dict[str, float]:
+    """Медиана времени каждого запроса в мс по случайным владельцам"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    owners = [rnd.randint(1, users) for _ in range(PROBES)]
+    result: dict[str, float] = {}
+    async with session_maker() as session:
+        for name, query in QUERIES.items():
+            # Первый прогон прогревает кэш страниц и подготовку запроса
+            await query(session, owners[0])
+            timings = []
+            for owner in owners:
+                started = time.perf_counter()
+                await query(session, owner)
+                timings.append(time.perf_counter() - started)
+            result[name] = statistics.median(timings) * 1000
+    await engine.dispose()
+    return result
+
+
+async def prepare_schema(path: Path) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rnd = random.Random(args.seed)  # noqa: S311
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bench.db"
+        asyncio.run(prepare_schema(path))
+
+        print(f"{'users':>6} {'rows':>9}  " + "  ".join(f"{q:>12}" for q in QUERIES))
+        populated = 0
+        for users in sorted(args.users):
+            populate(path, populated + 1, users)
+            populated = users
+            timings = asyncio.run(measure(path, users, rnd))
+            print(
+                f"{users:>6} {users * ROWS_PER_USER:>9}  "
+                + "  ".join(f"{timings[q]:>9.2f} ms" for q in QUERIES)
+            )
+
+
+if __name__ == "__main__":
+    main()
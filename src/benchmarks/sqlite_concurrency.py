@@ -0,0 +1,163 @@
+"""
+Конкурентный доступ к SQLite: движок по умолчанию против очереди писателя
+и пула WAL-читателей.
+
+Каждый пользователь в цикле смотрит лимиты по категориям (чтение) и
+добавляет расход (запись), как в разделе баланса.
+
+Запуск из src/:
+    python -m benchmarks.sqlite_concurrency --users 60 --ops 40
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.models import Base
+from db.repository.balance import BalanceRepo
+from db.repository.category import CategoryRepo
+from db.repository.user import UserModelRepo
+from db.session import Database
+
+CATEGORIES = 10
+OWNER_ID = 1
+SessionFactory = Callable[[], AbstractAsyncContextManager[AsyncSession]]
+
+
+class Stats:
+    def __init__(self) -> None:
+        self.reads: list[float] = []
+        self.writes: list[float] = []
+        self.errors = 0
+        self.elapsed = 0.0
+
+
+async def prepare(url: str) -> None:
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine)
+    async with session_maker.begin() as session:
+        await UserModelRepo(session).add(OWNER_ID)
+        for i in range(CATEGORIES):
+            await CategoryRepo(session, OWNER_ID).create(f"category {i}", 1_000_000, 0)
+    await engine.dispose()
+
+
+async def user(
+    rnd: random.Random,
+    *,
+    ops: int,
+    write_ratio: float,
+    read: SessionFactory,
+    write: SessionFactory,
+    stats: Stats,
+) -> None:
+    for _ in range(ops):
+        started = time.perf_counter()
+        try:
+            if rnd.random() < write_ratio:
+                cid = rnd.randint(1, CATEGORIES)
+                amount = rnd.randint(100, 100_000)
+                async with write() as session:
+                    await BalanceRepo(session, OWNER_ID).create(
+                        "bench", amount, "expense", cid, []
+                    )
+                    await CategoryRepo(session, OWNER_ID).add_expense(cid, amount)
+                stats.writes.append(time.perf_counter() - started)
+            else:
+                async with read() as session:
+                    await CategoryRepo(session, OWNER_ID).get_with_cur_limit()
+                stats.reads.append(time.perf_counter() - started)
+        except OperationalError:
+            # "database is locked"
+            stats.errors += 1
+
+
+async def run(url: str, mode: str, args: argparse.Namespace) -> tuple[Stats, str]:
+    dispose: Callable[[], Awaitable[None]]
+    if mode == "default":
+        engine = create_async_engine(url)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+        read: SessionFactory = session_maker
+        write: SessionFactory = session_maker.begin
+        dispose = engine.dispose
+    else:
+        db = Database(url)
+        read, write, dispose = db.get_session, db.transaction, db.dispose
+
+    stats = Stats()
+    rnd = random.Random(args.seed)  # noqa: S311
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            user(
+                random.Random(rnd.random()),  # noqa: S311
+                ops=args.ops,
+                write_ratio=args.write_ratio,
+                read=read,
+                write=write,
+                stats=stats,
+            )
+            for _ in range(args.users)
+        )
+    )
+    stats.elapsed = time.perf_counter() - started
+
+    extra = ""
+    if mode == "queue" and db.writer is not None:
+        w = db.writer
+        extra = (
+            f", batches {w.batches} (avg {w.writes / max(w.batches, 1):.1f}, "
+            f"max {w.max_batch_seen}), queue wait "
+            f"{w.wait_total / max(w.writes, 1) * 1000:.1f} ms/write"
+        )
+    await dispose()
+    return stats, extra
+
+
+def percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+def report(mode: str, stats: Stats, extra: str) -> None:
+    done = len(stats.reads) + len(stats.writes)
+    print(f"{mode:8} {done / stats.elapsed:8.0f} ops/s, errors {stats.errors}{extra}")
+    for name, values in (("read", stats.reads), ("write", stats.writes)):
+        print(
+            f"         {name:5} n={len(values):5} "
+            f"p50 {percentile(values, 50) * 1000:7.1f} ms  "
+            f"p95 {percentile(values, 95) * 1000:7.1f} ms  "
+            f"p99 {percentile(values, 99) * 1000:7.1f} ms"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=60)
+    parser.add_argument("--ops", type=int, default=40)
+    parser.add_argument("--write-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for mode in ("default", "queue"):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+            asyncio.run(prepare(url))
+            stats, extra = asyncio.run(run(url, mode, args))
+            report(mode, stats, extra)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import logging
+from typing import NamedTuple, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.money import format_amount
+from config.settings import settings
+from db.repository.category import CategoryRepo, ExpenseTotals
+from db.repository.user import UserModelRepo
+from db.session import get_session
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetAlert(NamedTuple):
+    owner_id: int
+    category_name: str
+    threshold: int
+    spent: int
+    max_limit: int
+
+
+def parse_thresholds(raw: Optional[str]) -> list[int]:
+    """'80, 100' -> [80, 100]; мусор и неположительные значения отбрасываются"""
+    if not raw:
+        return []
+    thresholds = {int(p) for p in raw.replace(" ", "").split(",") if p.isdigit()}
+    return sorted(t for t in thresholds if t > 0)
+
+
+def check_budget_alert(totals: ExpenseTotals) -> Optional[BudgetAlert]:
+    """
+    Проверяет, пересёк ли расход новый порог.
+
+    Срабатывает только старший из пересечённых порогов и только если он выше
+    уже отправленного в этом периоде (`alert_level`), поэтому каждый порог
+    приходит не больше одного раза за период.
+    """
+    if not totals.max_limit or totals.max_limit <= 0:
+        return None
+
+    crossed = [
+        t
+        for t in parse_thresholds(totals.alert_thresholds)
+        if t > totals.alert_level
+        and totals.before * 100 < totals.max_limit * t <= totals.after * 100
+    ]
+    if not crossed:
+        return None
+
+    return BudgetAlert(
+        owner_id=totals.owner_id,
+        category_name=totals.name,
+        threshold=max(crossed),
+        spent=totals.after,
+        max_limit=totals.max_limit,
+    )
+
+
+async def add_expense(
+    session: AsyncSession, owner_id: int, category_id: int, amount: int
+) -> Optional[BudgetAlert]:
+    """Учитывает расход в лимите категории и запоминает сработавший порог"""
+    repo = CategoryRepo(session, owner_id)
+    totals = await repo.add_expense(category_id, amount)
+    alert = check_budget_alert(totals) if totals else None
+    if alert:
+        await repo.set_alert_level(category_id, alert.threshold)
+    return alert
+
+
+def build_alert_message(alert: BudgetAlert) -> str:
+    icon = "🚨" if alert.threshold >= 100 else "⚠️"
+    return (
+        f"{icon} <b>Бюджет:</b> <i>{alert.category_name}</i>\n\n"
+        f"Потрачено {alert.threshold}% лимита: "
+        f"{format_amount(alert.spent)} из {format_amount(alert.max_limit)}"
+    )
+
+
+async def send_budget_alert(bot: Bot, alert: BudgetAlert) -> None:
+    # Бюджет семьи видят все, личный - только владелец
+    user_ids: Sequence[int] = [alert.owner_id]
+    if settings.HOUSEHOLD_OWNER_ID:
+        async with get_session() as session:
+            user_ids = await UserModelRepo(session).get_all_ids()
+
+    text = build_alert_message(alert)
+    for user_id in user_ids:
+        try:
+            await bot.send_message(user_id, text)
+        except TelegramAPIError as e:
+            logger.warning("Budget alert to %s failed: %s", user_id, e)
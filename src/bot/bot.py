@@ -3,8 +3,13 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 
 from config.settings import settings
+from config.tracing import tracer
+
+from .tracing import BotApiTraceMiddleware
 
 bot = Bot(
     settings.BOT_TOKEN,
     default=DefaultBotProperties(parse_mode=ParseMode.HTML),
 )
+if tracer.enabled:
+    bot.session.middleware(BotApiTraceMiddleware())
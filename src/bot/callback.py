@@ -0,0 +1,224 @@
+"""
+Упакованная callback_data: вся навигация в самой кнопке.
+
+Telegram ограничивает callback_data 64 байтами, и текст вида
+`balance:detail:category:{id}:{skip}` быстро в них упирается. Упакованная
+кнопка - это `~` и base64url (без `=`) от байтов:
+
+    версия | id действия | поля действия по порядку
+
+Числа - varint (LEB128, отрицательные через zigzag), bool - один байт,
+строки и вложенные кнопки (путь возврата) - длина varint и байты.
+Кнопки старой версии не разбираются и отвечают «кнопка устарела».
+"""
+
+import base64
+from typing import Any, NamedTuple, Optional, Union
+
+from aiogram.filters import Filter
+from aiogram.types import CallbackQuery
+
+PACKED_PREFIX = "~"
+CODEC_VERSION = 1
+# Лимит Bot API на callback_data
+MAX_CALLBACK_BYTES = 64
+
+FieldType = Union[type[int], type[bool], type[str], type["Nav"]]
+
+
+class CallbackDecodeError(ValueError):
+    """Кнопка не из этого кодека, старой версии или повреждена"""
+
+
+class CallbackTooLongError(ValueError):
+    """Упакованная кнопка не помещается в 64 байта"""
+
+
+class Nav(NamedTuple):
+    """Разобранная кнопка: действие и значения полей"""
+
+    action: "Action"
+    values: dict[str, Any]
+
+    def pack(self) -> str:
+        return self.action.pack(**self.values)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    if value < 0:
+        raise ValueError("varint is unsigned")
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        if pos >= len(data):
+            raise CallbackDecodeError("truncated varint")
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value // 2 if not value & 1 else -(value + 1) // 2
+
+
+class Action:
+    """Действие кнопки: числовой id в реестре и упорядоченные поля"""
+
+    def __init__(
+        self,
+        registry: "ActionRegistry",
+        action_id: int,
+        name: str,
+        fields: dict[str, FieldType],
+    ) -> None:
+        self.registry = registry
+        self.id = action_id
+        self.name = name
+        self.fields = fields
+
+    def __repr__(self) -> str:
+        return f"Action({self.id}, {self.name!r})"
+
+    def encode(self, out: bytearray, values: dict[str, Any]) -> None:
+        _write_varint(out, self.id)
+        if values.keys() != self.fields.keys():
+            raise TypeError(f"{self.name} expects fields {list(self.fields)}")
+        for name, kind in self.fields.items():
+            value = values[name]
+            if kind is bool:
+                out.append(1 if value else 0)
+            elif kind is int:
+                _write_varint(out, _zigzag(value))
+            elif kind is str:
+                raw = value.encode()
+                _write_varint(out, len(raw))
+                out += raw
+            else:
+                nested = bytearray()
+                value.action.encode(nested, value.values)
+                _write_varint(out, len(nested))
+                out += nested
+
+    def decode(self, data: bytes, pos: int) -> tuple[dict[str, Any], int]:
+        values: dict[str, Any] = {}
+        for name, kind in self.fields.items():
+            if kind is bool:
+                if pos >= len(data) or data[pos] > 1:
+                    raise CallbackDecodeError("bad bool")
+                values[name] = data[pos] == 1
+                pos += 1
+            elif kind is int:
+                raw, pos = _read_varint(data, pos)
+                values[name] = _unzigzag(raw)
+            else:
+                size, pos = _read_varint(data, pos)
+                if pos + size > len(data):
+                    raise CallbackDecodeError("truncated field")
+                chunk = data[pos : pos + size]
+                pos += size
+                if kind is str:
+                    values[name] = chunk.decode()
+                else:
+                    nested, end = self.registry.decode_nav(chunk, 0)
+                    if end != len(chunk):
+                        raise CallbackDecodeError("trailing bytes in nested nav")
+                    values[name] = nested
+        return values, pos
+
+    def pack(self, **values: Any) -> str:
+        out = bytearray([CODEC_VERSION])
+        self.encode(out, values)
+        packed = PACKED_PREFIX + base64.urlsafe_b64encode(out).rstrip(b"=").decode()
+        if len(packed) > MAX_CALLBACK_BYTES:
+            raise CallbackTooLongError(f"{self.name}: {len(packed)} bytes")
+        return packed
+
+    def nav(self, **values: Any) -> Nav:
+        """Кнопка как значение поля другой кнопки (путь возврата)"""
+        return Nav(self, values)
+
+    def filter(self) -> "PackedFilter":
+        return PackedFilter(self)
+
+
+class ActionRegistry:
+    """
+    Реестр действий: id навсегда закреплён за действием.
+
+    Поменять поля действия - значит завести новый id (или поднять
+    CODEC_VERSION), иначе старые кнопки разберутся неверно.
+    """
+
+    def __init__(self) -> None:
+        self._actions: dict[int, Action] = {}
+
+    def register(self, action_id: int, name: str, **fields: FieldType) -> Action:
+        if action_id in self._actions:
+            raise ValueError(f"action id {action_id} is taken by {name!r}")
+        for field, kind in fields.items():
+            if kind not in (int, bool, str, Nav):
+                raise TypeError(f"{name}.{field}: unsupported type {kind!r}")
+        action = Action(self, action_id, name, fields)
+        self._actions[action_id] = action
+        return action
+
+    def decode_nav(self, data: bytes, pos: int) -> tuple[Nav, int]:
+        action_id, pos = _read_varint(data, pos)
+        action = self._actions.get(action_id)
+        if action is None:
+            raise CallbackDecodeError(f"unknown action {action_id}")
+        values, pos = action.decode(data, pos)
+        return Nav(action, values), pos
+
+    def unpack(self, packed: str) -> Nav:
+        if not packed.startswith(PACKED_PREFIX):
+            raise CallbackDecodeError("not a packed callback")
+        body = packed[len(PACKED_PREFIX) :]
+        try:
+            data = base64.urlsafe_b64decode(body + "=" * (-len(body) % 4))
+        except ValueError as e:
+            raise CallbackDecodeError("bad base64") from e
+        if not data or data[0] != CODEC_VERSION:
+            raise CallbackDecodeError("unsupported version")
+        try:
+            nav, end = self.decode_nav(data, 1)
+        except UnicodeDecodeError as e:
+            raise CallbackDecodeError("bad string") from e
+        if end != len(data):
+            raise CallbackDecodeError("trailing bytes")
+        return nav
+
+
+actions = ActionRegistry()
+
+
+class PackedFilter(Filter):
+    """Пропускает кнопки своего действия и передаёт обработчику `nav`"""
+
+    def __init__(self, action: Action) -> None:
+        self.action = action
+
+    async def __call__(self, clbq: CallbackQuery) -> Union[bool, dict[str, Any]]:
+        data: Optional[str] = clbq.data
+        if not data or not data.startswith(PACKED_PREFIX):
+            return False
+        try:
+            nav = self.action.registry.unpack(data)
+        except CallbackDecodeError:
+            return False
+        if nav.action is not self.action:
+            return False
+        return {"nav": nav}
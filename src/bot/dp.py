@@ -5,15 +5,32 @@ from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import Update
 
 from config.settings import settings
+from config.tracing import tracer
+from db.repository.user import UserModelRepo
+from db.session import transaction
 
+from .ordering import ChatOrderingMiddleware
 from .route import router
+from .tracing import TraceMiddleware, handler_span_middleware, traced
+from .update_log import UpdateLogMiddleware, route_middleware
 
 dp = Dispatcher(storage=MemoryStorage())
 
 dp.include_router(router)
 
+# Первыми: строка лога на апдейт, контекст для логов и трейс апдейта
+# оборачивают все следующие слои
+dp.update.outer_middleware(UpdateLogMiddleware())
+if tracer.enabled:
+    dp.update.outer_middleware(TraceMiddleware())
+for observer in (dp.message, dp.callback_query):
+    observer.middleware(route_middleware)
+    if tracer.enabled:
+        observer.middleware(handler_span_middleware)
+
 
 @dp.update.outer_middleware()  # type: ignore
+@traced
 async def allowed_users_middleware(
     handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
     event: Update,
@@ -29,3 +46,31 @@ async def allowed_users_middleware(
             return None
 
     return await handler(event, data)
+
+
+# Владельцы, чья строка в users уже точно есть (на ней FK owner_id)
+_known_owners: set[int] = set()
+
+
+@dp.update.outer_middleware()  # type: ignore
+@traced
+async def owner_middleware(
+    handler: Callable[[Update, Dict[str, Any]], Awaitable[Any]],
+    event: Update,
+    data: Dict[str, Any],
+) -> Any:
+    """Передаёт обработчикам `owner_id`: репозитории создаются под него"""
+    user = data.get("event_from_user")
+    if user is not None:
+        owner_id = settings.owner_for(user.id)
+        if owner_id not in _known_owners:
+            async with transaction() as session:
+                await UserModelRepo(session).add(owner_id)
+            _known_owners.add(owner_id)
+        data["owner_id"] = owner_id
+    return await handler(event, data)
+
+
+# Регистрируется после проверки доступа: чужие апдейты не занимают очередь
+chat_ordering = ChatOrderingMiddleware(settings.MAX_CONCURRENT_UPDATES)
+dp.update.outer_middleware(traced(chat_ordering))
@@ -0,0 +1,23 @@
+import re
+from typing import Optional
+
+# Суммы хранятся в копейках (целые числа), рубли нужны только при вводе/выводе
+MINOR_UNITS = 100
+
+AMOUNT_RE = re.compile(r"^\d{1,12}([.,]\d{1,2})?$")
+
+
+def parse_amount(text: str) -> Optional[int]:
+    """'350' -> 35000, '99,9' -> 9990, '1 234.56' -> 123456; иначе None"""
+    text = text.strip().replace(" ", "").replace(" ", "")
+    if not AMOUNT_RE.match(text):
+        return None
+    rubles, _, kopecks = text.replace(",", ".").partition(".")
+    return int(rubles) * MINOR_UNITS + int(kopecks.ljust(2, "0") or 0)
+
+
+def format_amount(amount: int) -> str:
+    """35000 -> '350.00'"""
+    sign = "-" if amount < 0 else ""
+    rubles, kopecks = divmod(abs(amount), MINOR_UNITS)
+    return f"{sign}{rubles}.{kopecks:02d}"
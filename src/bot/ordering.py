@@ -0,0 +1,116 @@
+import asyncio
+import contextlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import Chat, TelegramObject, User
+
+logger = logging.getLogger(__name__)
+
+# Дольше этого апдейт ждёт очереди - пишем в лог
+SLOW_WAIT = 1.0
+
+
+class DispatchStats:
+    """Метрики очереди апдейтов"""
+
+    def __init__(self) -> None:
+        self.waiting = 0
+        self.running = 0
+        self.processed = 0
+        self.max_waiting = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "waiting": self.waiting,
+            "running": self.running,
+            "processed": self.processed,
+            "max_waiting": self.max_waiting,
+            "wait_avg": self.wait_total / self.processed if self.processed else 0.0,
+            "wait_max": self.wait_max,
+        }
+
+
+class _ChatQueue:
+    __slots__ = ("lock", "pending")
+
+    def __init__(self) -> None:
+        # asyncio.Lock будит ожидающих по порядку (FIFO)
+        self.lock = asyncio.Lock()
+        self.pending = 0
+
+
+class ChatOrderingMiddleware(BaseMiddleware):
+    """
+    Параллельная обработка апдейтов, но по порядку внутри чата.
+
+    Апдейты разных чатов обрабатываются одновременно, но не больше
+    `max_concurrency` сразу. Апдейты одного чата идут строго по очереди,
+    в порядке поступления, поэтому два нажатия посреди мастера добавления
+    не перемешиваются. Очередь чата удаляется, как только она опустела.
+
+    Регистрируется в bot/dp.py внешним middleware на `dp.update` после
+    `allowed_users_middleware` и `owner_middleware`. `event_chat` и
+    `event_from_user` в data кладёт сам aiogram (встроенный
+    `aiogram.dispatcher.middlewares.user_context.UserContextMiddleware`).
+    """
+
+    def __init__(self, max_concurrency: int) -> None:
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._chats: dict[int, _ChatQueue] = {}
+        self.stats = DispatchStats()
+
+    @property
+    def active_chats(self) -> int:
+        return len(self._chats)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        chat: Optional[Chat] = data.get("event_chat")
+        user: Optional[User] = data.get("event_from_user")
+        key = chat.id if chat else user.id if user else None
+
+        queue = None
+        if key is not None:
+            queue = self._chats.get(key)
+            if queue is None:
+                queue = self._chats[key] = _ChatQueue()
+            queue.pending += 1
+
+        stats = self.stats
+        stats.waiting += 1
+        stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        queued_at = time.monotonic()
+        started = False
+        try:
+            async with queue.lock if queue else contextlib.nullcontext(), self._slots:
+                stats.waiting -= 1
+                started = True
+                wait = time.monotonic() - queued_at
+                stats.wait_total += wait
+                stats.wait_max = max(stats.wait_max, wait)
+                if wait > SLOW_WAIT:
+                    logger.warning("Update for chat %s waited %.1fs", key, wait)
+
+                stats.running += 1
+                try:
+                    return await handler(event, data)
+                finally:
+                    stats.running -= 1
+                    stats.processed += 1
+        finally:
+            if not started:
+                stats.waiting -= 1
+            if queue is not None:
+                queue.pending -= 1
+                if not queue.pending:
+                    del self._chats[key]  # type: ignore[arg-type]
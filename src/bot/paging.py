@@ -0,0 +1,63 @@
+import math
+from typing import Optional
+
+from aiogram.types import InlineKeyboardButton
+
+# Прыжок на столько страниц, когда список длинный
+JUMP_PAGES = 10
+
+
+def page_total(total: Optional[int], skip: int, shown: int, has_next: bool) -> int:
+    """
+    Длина списка по счётчику, но не меньше уже увиденного:
+    счётчик мог отстать до ближайшей сверки.
+    """
+    return max(total or 0, skip + shown + int(has_next))
+
+
+def build_page_rows(
+    prefix: str,
+    skip: int,
+    page_size: int,
+    has_next: bool,
+    total: Optional[int] = None,
+) -> list[list[InlineKeyboardButton]]:
+    """
+    Навигация «◀️ 3 / 41 ▶️» и переходы в начало и конец списка.
+
+    `prefix` - callback_data без смещения: кнопки ведут на `{prefix}:{skip}`.
+    Без `total` показывается только номер страницы.
+    """
+    page = skip // page_size + 1
+    placeholder = InlineKeyboardButton(text="...", callback_data="...")
+
+    def to(page_skip: int, text: str) -> InlineKeyboardButton:
+        return InlineKeyboardButton(text=text, callback_data=f"{prefix}:{page_skip}")
+
+    if total is None:
+        pages = None
+        label = f"{page}"
+    else:
+        pages = max(math.ceil(total / page_size), 1)
+        label = f"{page} / {pages}"
+
+    row = [to(0, "⏮"), to(max(skip - page_size, 0), "◀️")] if skip > 0 else []
+    row = row or [placeholder]
+    row.append(InlineKeyboardButton(text=label, callback_data="..."))
+    if has_next:
+        row.append(to(skip + page_size, "▶️"))
+        if pages is not None:
+            row.append(to((pages - 1) * page_size, "⏭"))
+    else:
+        row.append(placeholder)
+
+    rows = [row]
+    if pages is not None and pages > JUMP_PAGES:
+        jumps = []
+        if page > JUMP_PAGES:
+            jumps.append(to(skip - JUMP_PAGES * page_size, f"⏪ {JUMP_PAGES}"))
+        if page + JUMP_PAGES <= pages:
+            jumps.append(to(skip + JUMP_PAGES * page_size, f"{JUMP_PAGES} ⏩"))
+        if jumps:
+            rows.append(jumps)
+    return rows
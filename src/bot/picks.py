@@ -0,0 +1,70 @@
+from collections import deque
+from typing import Awaitable, Callable, Collection, Optional, TypeVar
+
+from aiogram.types import InlineKeyboardButton
+
+T = TypeVar("T")
+
+# Диапазоны годов для 🎲: ключ в callback_data -> (подпись, от, до)
+YEAR_RANGES: dict[str, tuple[str, Optional[int], Optional[int]]] = {
+    "any": ("Любой год", None, None),
+    "old": ("до 2000", None, 1999),
+    "2000": ("2000-е", 2000, 2009),
+    "2010": ("2010-е", 2010, 2019),
+    "2020": ("2020+", 2020, None),
+}
+
+
+class RecentPicks:
+    """
+    Последние случайные выборы каждого чата, чтобы 🎲 не повторялся подряд.
+
+    Апдейты одного чата всегда обрабатывает один процесс, поэтому памяти
+    процесса достаточно и в режиме `WORKERS=N`.
+    """
+
+    def __init__(self, size: int = 10) -> None:
+        self.size = size
+        self._recent: dict[tuple[int, str], deque[int]] = {}
+
+    def get(self, chat_id: int, kind: str) -> deque[int]:
+        key = (chat_id, kind)
+        if key not in self._recent:
+            self._recent[key] = deque(maxlen=self.size)
+        return self._recent[key]
+
+
+recent_picks = RecentPicks()
+
+
+async def pick_fresh(
+    recent: deque[int],
+    pick: Callable[[Collection[int]], Awaitable[Optional[T]]],
+    get_id: Callable[[T], int],
+) -> Optional[T]:
+    """Выбирает запись не из `recent`; когда выпало уже всё, круг начинается заново"""
+    item = await pick(tuple(recent))
+    if item is None and recent:
+        recent.clear()
+        item = await pick(())
+    if item is not None:
+        recent.append(get_id(item))
+    return item
+
+
+def build_year_range_rows(
+    prefix: str, current: str
+) -> list[list[InlineKeyboardButton]]:
+    """Кнопка «Ещё» и выбор диапазона годов; `prefix` - начало callback_data"""
+    chips = [
+        InlineKeyboardButton(
+            text=f"• {label}" if key == current else label,
+            callback_data=f"{prefix}:{key}",
+        )
+        for key, (label, _, _) in YEAR_RANGES.items()
+    ]
+    return [
+        [InlineKeyboardButton(text="🎲 Ещё", callback_data=f"{prefix}:{current}")],
+        chips[:3],
+        chips[3:],
+    ]
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import io
+import logging
+from pathlib import Path
+from typing import Any, Awaitable, Callable, NamedTuple, Optional, Sequence
+
+from aiogram import Bot
+from aiogram.types import FSInputFile, PhotoSize
+
+from config.consts import MEDIA_DIR
+from db.repository.movies import MoviesRepository
+from db.repository.series import SeriesRepository
+from db.session import get_session
+
+try:
+    from PIL import Image, ImageDraw, ImageFont, ImageOps
+except ImportError:  # pragma: no cover - Pillow ставится extra "images"
+    Image = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Telegram присылает фото в нескольких размерах (до 2560 px по большей
+# стороне). Для карточки берём самый крупный из тех, что не больше этого
+CARD_MAX_SIDE = 1280
+
+# Превью постера: максимальная сторона в пикселях
+THUMB_SIDE = 320
+JPEG_QUALITY = 85
+
+# Сводная картинка страницы списка: ячейки 2:3 по SHEET_COLUMNS в ряд,
+# при десяти строках страницы выходит 1000x600 - размер карточки
+SHEET_COLUMNS = 5
+SHEET_CELL = (200, 300)
+
+
+class Poster(NamedTuple):
+    file_id: str
+    unique_id: str
+
+
+def pick_card_photo(
+    sizes: Sequence[PhotoSize], max_side: int = CARD_MAX_SIDE
+) -> PhotoSize:
+    """Лучший размер фото для карточки: самый крупный, влезающий в max_side"""
+    fitting = [s for s in sizes if max(s.width, s.height) <= max_side]
+    if fitting:
+        return max(fitting, key=lambda s: s.width * s.height)
+    return min(sizes, key=lambda s: s.width * s.height)
+
+
+def poster_from_photo(sizes: Optional[Sequence[PhotoSize]]) -> Optional[Poster]:
+    if not sizes:
+        return None
+    size = pick_card_photo(sizes)
+    return Poster(size.file_id, size.file_unique_id)
+
+
+def stored_poster(file_id: Optional[str], unique_id: Optional[str]) -> Optional[Poster]:
+    """
+    Постер записи из базы. Для постеров, сохранённых до появления
+    poster_unique_id, ключом кэша служит хэш file_id
+    """
+    if not file_id:
+        return None
+    return Poster(file_id, unique_id or _digest(file_id))
+
+
+async def dedupe_poster(owner_id: int, poster: Poster) -> Poster:
+    """
+    Тот же постер, но file_id берётся из сохранённой ранее копии, если
+    картинку уже загружали (совпал file_unique_id). Одинаковые постеры
+    получают один file_id, и рендерер не перезагружает картинку при
+    переходе между такими карточками.
+    """
+    async with get_session() as session:
+        file_id = await MoviesRepository(session, owner_id).find_poster(
+            poster.unique_id
+        ) or await SeriesRepository(session, owner_id).find_poster(poster.unique_id)
+    return Poster(file_id, poster.unique_id) if file_id else poster
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()
+
+
+def _save_jpeg(image: Any, path: Path) -> None:
+    # Пишем во временный файл и переименовываем: читатель не увидит
+    # недописанный jpg
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    image.save(tmp, "JPEG", quality=JPEG_QUALITY, optimize=True)
+    tmp.replace(path)
+
+
+def _render_thumb(data: bytes, path: Path) -> None:
+    """Режет превью из оригинала. Вызывается в пуле потоков"""
+    with Image.open(io.BytesIO(data)) as original:
+        image = original.convert("RGB")
+    image.thumbnail((THUMB_SIDE, THUMB_SIDE), Image.Resampling.LANCZOS)
+    _save_jpeg(image, path)
+
+
+def _render_sheet(thumbs: Sequence[Optional[Path]], first: int, path: Path) -> None:
+    """Склеивает превью страницы в одну картинку. Вызывается в пуле потоков"""
+    width, height = SHEET_CELL
+    rows = -(-len(thumbs) // SHEET_COLUMNS)
+    sheet = Image.new("RGB", (width * SHEET_COLUMNS, height * rows), "#202020")
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default(size=28)
+    for index, thumb in enumerate(thumbs):
+        x, y = index % SHEET_COLUMNS * width, index // SHEET_COLUMNS * height
+        if thumb is not None:
+            with Image.open(thumb) as image:
+                cell = ImageOps.fit(image.convert("RGB"), SHEET_CELL)
+            sheet.paste(cell, (x, y))
+        # Номер ячейки равен номеру строки в подписи
+        draw.rectangle((x, y, x + 48, y + 40), fill="#000000")
+        draw.text((x + 8, y + 4), str(first + index), fill="#ffffff", font=font)
+    _save_jpeg(sheet, path)
+
+
+class PosterCache:
+    """
+    Локальный кэш превью постеров для сводных экранов.
+
+    Оригинал скачивается один раз, превью режутся Pillow в пуле потоков и
+    лежат на диске под file_unique_id. Из превью страницы списка собирается
+    одна картинка, тоже на диске; рендерер загружает её один раз, дальше
+    отправляет file_id. Без Pillow превью не строятся, и экраны показывают
+    обычную картинку.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        # Путь -> задача, которая строит файл. Пока задача идёт, все ждут
+        # именно её, поэтому один файл не строится дважды
+        self._pending: dict[str, asyncio.Future[Path]] = {}
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return Image is not None
+
+    def thumb_path(self, poster: Poster) -> Path:
+        return self.root / f"{poster.unique_id}_thumb.jpg"
+
+    async def thumb(self, bot: Bot, poster: Poster) -> Optional[Path]:
+        """Превью постера, при необходимости скачивает и режет оригинал"""
+        if not self.enabled:
+            return None
+        path = self.thumb_path(poster)
+
+        async def build() -> Path:
+            buffer = io.BytesIO()
+            await bot.download(poster.file_id, destination=buffer)
+            await asyncio.to_thread(_render_thumb, buffer.getvalue(), path)
+            return path
+
+        return await self._once(path, build)
+
+    async def sheet(
+        self, bot: Bot, posters: Sequence[Optional[Poster]], first: int
+    ) -> Optional[FSInputFile]:
+        """
+        Сводная картинка страницы списка: превью постеров, пронумерованные
+        от `first`. None, если показывать нечего или превью ещё не
+        готовы - недостающие готовятся в фоне к следующему показу.
+        """
+        if not self.enabled or not any(posters):
+            return None
+        thumbs = [self.thumb_path(p) if p else None for p in posters]
+        ready = await asyncio.to_thread(
+            lambda: [t is None or t.exists() for t in thumbs]
+        )
+        missing = [p for p, ok in zip(posters, ready, strict=True) if p and not ok]
+        if missing:
+            for poster in missing:
+                self.warm(bot, poster)
+            return None
+
+        key = ":".join(p.unique_id if p else "" for p in posters)
+        digest = _digest(f"{first}:{key}")
+        path = self.root / "sheets" / f"{digest}.jpg"
+
+        async def build() -> Path:
+            await asyncio.to_thread(_render_sheet, thumbs, first, path)
+            return path
+
+        return FSInputFile(await self._once(path, build))
+
+    def warm(self, bot: Bot, poster: Poster) -> None:
+        """Готовит превью в фоне сразу после получения постера"""
+        if not self.enabled:
+            return
+        task = asyncio.create_task(self._warm(bot, poster))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _warm(self, bot: Bot, poster: Poster) -> None:
+        try:
+            await self.thumb(bot, poster)
+        except Exception:
+            logger.exception("Failed to build poster thumbnail %s", poster.unique_id)
+
+    async def _once(self, path: Path, build: Callable[[], Awaitable[Path]]) -> Path:
+        """Готовый файл либо результат единственной задачи, строящей файл"""
+        key = str(path)
+        future = self._pending.get(key)
+        if future is None:
+            if await asyncio.to_thread(path.exists):
+                return path
+            # Пока файл проверялся в потоке, задачу мог запустить другой
+            future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(build())
+            self._pending[key] = future
+            future.add_done_callback(lambda _: self._pending.pop(key, None))
+        # Отмена одного ожидающего не отменяет общую задачу
+        return await asyncio.shield(future)
+
+
+poster_cache = PosterCache(MEDIA_DIR)
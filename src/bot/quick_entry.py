@@ -0,0 +1,208 @@
+"""
+Быстрый ввод записи баланса одним сообщением.
+
+    кафе 350 #еда #друзья @Продукты   -> расход 350 в категории «Продукты»
+    +5000 зарплата                    -> доход 5000
+
+Сумма - первое число (`+` - доход, `-` или без знака - расход; разряды
+можно отделять пробелом: `1 234,50`), `#тег` - тег, `@категория` -
+категория (начало названия, `_` вместо пробела), остальные слова - название.
+Несколько строк в одном сообщении - пакет записей, по одной на строку.
+"""
+
+import re
+import time
+from typing import NamedTuple, Optional
+
+from bot.money import parse_amount
+from db.models import normalize_title
+from db.repository.category import CategoryRepo
+from db.session import get_session
+
+NAME_MAX_LEN = 128
+TAG_MAX_LEN = 64
+# Сколько секунд индекс категорий владельца живёт без перечитывания
+CATEGORY_INDEX_TTL = 60
+# Строк в одном пакете: предпросмотр должен поместиться в подпись к фото
+BATCH_MAX_LINES = 30
+CURRENCY_SUFFIXES = ("₽", "р", "руб")
+# Число, за которым могут идти разряды через пробел: `1 234 567`
+GROUP_HEAD_RE = re.compile(r"^[+-]?\d{1,3}$")
+GROUP_RE = re.compile(r"^\d{3}$")
+# Последний разряд может нести копейки и валюту: `234,50₽`
+GROUP_TAIL_RE = re.compile(r"^\d{3}(?!\d)")
+
+
+class QuickEntryError(ValueError):
+    """Сообщение не разбирается; текст ошибки показывается пользователю"""
+
+
+class QuickEntry(NamedTuple):
+    name: str
+    amount: int
+    balance_type: str
+    tags: list[str]
+    # Как категория написана после `@`, без сопоставления
+    category: Optional[str]
+
+
+def _parse_signed_amount(token: str) -> Optional[tuple[int, str]]:
+    sign = token[0] if token[0] in "+-" else ""
+    body = token[len(sign) :]
+    for suffix in CURRENCY_SUFFIXES:
+        if body.endswith(suffix):
+            body = body[: -len(suffix)]
+            break
+    amount = parse_amount(body) if body else None
+    if amount is None:
+        return None
+    return amount, "income" if sign == "+" else "expense"
+
+
+def _take_amount(tokens: list[str], i: int) -> Optional[tuple[tuple[int, str], int]]:
+    """Сумма от `tokens[i]` и число занятых ею слов"""
+    parsed = _parse_signed_amount(tokens[i])
+    if parsed is None:
+        return None
+    taken = 1
+    if GROUP_HEAD_RE.match(tokens[i]):
+        joined = tokens[i]
+        for token in tokens[i + 1 :]:
+            if not GROUP_TAIL_RE.match(token):
+                break
+            grouped = _parse_signed_amount(joined + token)
+            if grouped is None:
+                break
+            joined += token
+            parsed, taken = grouped, taken + 1
+            if not GROUP_RE.match(token):
+                break
+    return parsed, taken
+
+
+def _parse_tag(token: str) -> str:
+    tag = token[1:].replace("_", " ")
+    if len(tag) > TAG_MAX_LEN:
+        raise QuickEntryError(f"Слишком длинный тег: #{tag[:16]}…")
+    return tag
+
+
+def _check_name(words: list[str]) -> str:
+    name = " ".join(words)
+    if not name:
+        raise QuickEntryError("Нет названия")
+    if len(name) > NAME_MAX_LEN:
+        raise QuickEntryError(f"Название длиннее {NAME_MAX_LEN} символов")
+    return name
+
+
+def parse_quick_entry(text: str) -> QuickEntry:
+    words: list[str] = []
+    tags: list[str] = []
+    category: Optional[str] = None
+    amount: Optional[tuple[int, str]] = None
+
+    tokens = text.split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        i += 1
+        if token.startswith("#") and len(token) > 1:
+            tag = _parse_tag(token)
+            if tag not in tags:
+                tags.append(tag)
+        elif token.startswith("@") and len(token) > 1:
+            if category is not None:
+                raise QuickEntryError("Укажи одну категорию")
+            category = token[1:].replace("_", " ")
+        elif amount is None and (taken := _take_amount(tokens, i - 1)):
+            amount, count = taken
+            i += count - 1
+        else:
+            words.append(token)
+
+    if amount is None:
+        raise QuickEntryError("Нет суммы")
+    if not amount[0]:
+        raise QuickEntryError("Сумма должна быть больше нуля")
+    return QuickEntry(_check_name(words), amount[0], amount[1], tags, category)
+
+
+class BatchLine(NamedTuple):
+    # Номер строки в сообщении, считая от единицы
+    line_no: int
+    text: str
+    entry: Optional[QuickEntry]
+    error: Optional[str]
+
+
+def parse_batch(text: str) -> list[BatchLine]:
+    """Разбирает каждую непустую строку отдельно, ошибка строки - в `error`"""
+    lines: list[BatchLine] = []
+    for line_no, raw in enumerate(text.splitlines(), start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            lines.append(BatchLine(line_no, line, parse_quick_entry(line), None))
+        except QuickEntryError as e:
+            lines.append(BatchLine(line_no, line, None, str(e)))
+    return lines
+
+
+class CategoryRef(NamedTuple):
+    id: int
+    name: str
+
+
+class CategoryIndex:
+    """
+    Категории владельцев в памяти для сопоставления `@категория`.
+
+    Категорий на владельца немного, поэтому индекс - список нормализованных
+    названий. Админка сбрасывает индекс сразу после правки; правки из других
+    процессов (`WORKERS=N`) видны не позже чем через `ttl` секунд.
+    """
+
+    def __init__(self, ttl: int = CATEGORY_INDEX_TTL) -> None:
+        self.ttl = ttl
+        self._index: dict[int, tuple[float, list[tuple[str, CategoryRef]]]] = {}
+
+    def invalidate(self, owner_id: int) -> None:
+        self._index.pop(owner_id, None)
+
+    async def get(self, owner_id: int) -> list[tuple[str, CategoryRef]]:
+        cached = self._index.get(owner_id)
+        if cached is not None and time.monotonic() - cached[0] < self.ttl:
+            return cached[1]
+        async with get_session() as session:
+            categories = await CategoryRepo(session, owner_id).get()
+        entries = [
+            (normalize_title(c.name), CategoryRef(c.id, c.name)) for c in categories
+        ]
+        self._index[owner_id] = (time.monotonic(), entries)
+        return entries
+
+    async def refs(self, owner_id: int) -> list[CategoryRef]:
+        return [ref for _, ref in await self.get(owner_id)]
+
+    async def match(self, owner_id: int, query: str) -> list[CategoryRef]:
+        """
+        Категории под запрос: точное совпадение, иначе по началу названия,
+        иначе по вхождению. Одна категория в ответе - выбор однозначен.
+        """
+        key = normalize_title(query)
+        entries = await self.get(owner_id)
+        if not key:
+            return []
+        for matches in (
+            [ref for norm, ref in entries if norm == key],
+            [ref for norm, ref in entries if norm.startswith(key)],
+            [ref for norm, ref in entries if key in norm],
+        ):
+            if matches:
+                return matches
+        return []
+
+
+category_index = CategoryIndex()
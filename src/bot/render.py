@@ -0,0 +1,160 @@
+from collections import Counter, OrderedDict
+from typing import NamedTuple, Optional, Union
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import (
+    FSInputFile,
+    InlineKeyboardMarkup,
+    InputFile,
+    InputMediaPhoto,
+    Message,
+)
+
+Media = Union[str, InputFile]
+
+# Сколько последних сообщений помним
+RENDER_CACHE_SIZE = 10_000
+
+
+class _Rendered(NamedTuple):
+    media: Optional[str]
+    caption: int
+    markup: int
+    # Отпечаток сообщения в ответе Telegram после отрисовки
+    seen: int
+
+
+def _media_key(media: Optional[Media]) -> Optional[str]:
+    if media is None or isinstance(media, str):
+        return media
+    if isinstance(media, FSInputFile):
+        return f"file:{media.path}"
+    # Файл из памяти каждый раз считаем новым
+    return f"object:{id(media)}"
+
+
+def _markup_hash(markup: Optional[InlineKeyboardMarkup]) -> int:
+    return hash(markup.model_dump_json(exclude_none=True)) if markup else 0
+
+
+def _fingerprint(message: Message) -> int:
+    photo = message.photo[-1].file_unique_id if message.photo else None
+    return hash((photo, message.caption, _markup_hash(message.reply_markup)))
+
+
+class MessageRenderer:
+    """
+    Отрисовка экранов-фото за минимум запросов к Bot API.
+
+    Для каждого сообщения помнит, что в нём показано (медиа, хэши подписи и
+    клавиатуры), и при следующей отрисовке отправляет самый дешёвый запрос:
+    `edit_message_media` только при смене картинки, иначе `edit_message_caption`
+    или `edit_message_reply_markup`, если же ничего не поменялось - ничего.
+    Картинки из файлов загружаются один раз, дальше отправляется их file_id.
+
+    Если сообщение правили в обход рендерера (вид отличается от
+    запомненного), экран перерисовывается целиком.
+    """
+
+    def __init__(self, max_messages: int = RENDER_CACHE_SIZE) -> None:
+        self.max_messages = max_messages
+        self._messages: OrderedDict[tuple[int, int], _Rendered] = OrderedDict()
+        self._uploads: dict[str, str] = {}
+        self.stats: Counter[str] = Counter()
+
+    async def render(
+        self,
+        message: Message,
+        media: Optional[Media] = None,
+        caption: str = "",
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ) -> Message:
+        """
+        Показывает экран в существующем сообщении.
+        Без `media` картинка остаётся прежней.
+        """
+        key = (message.chat.id, message.message_id)
+        old = self._messages.get(key)
+        if old is not None and old.seen != _fingerprint(message):
+            old = None
+
+        media_key = _media_key(media)
+        caption_hash = hash(caption)
+        markup_hash = _markup_hash(reply_markup)
+
+        result: Message | bool
+        try:
+            if media is not None and (old is None or old.media != media_key):
+                self.stats["media"] += 1
+                result = await message.edit_media(
+                    InputMediaPhoto(media=self._resolve(media), caption=caption),
+                    reply_markup=reply_markup,
+                )
+            elif old is None or old.caption != caption_hash:
+                self.stats["caption"] += 1
+                result = await message.edit_caption(
+                    caption=caption, reply_markup=reply_markup
+                )
+            elif old.markup != markup_hash:
+                self.stats["markup"] += 1
+                result = await message.edit_reply_markup(reply_markup=reply_markup)
+            else:
+                self.stats["skipped"] += 1
+                self._messages.move_to_end(key)
+                return message
+        except TelegramBadRequest as e:
+            if "message is not modified" not in e.message:
+                raise
+            self.stats["not_modified"] += 1
+            result = message
+
+        sent = result if isinstance(result, Message) else message
+        if media_key is None and old is not None:
+            media_key = old.media
+        self._remember(sent, media_key, caption_hash, markup_hash)
+        return sent
+
+    async def answer(
+        self,
+        message: Message,
+        media: Media,
+        caption: str,
+        reply_markup: Optional[InlineKeyboardMarkup] = None,
+    ) -> Message:
+        """Отправляет экран новым сообщением в чат `message`"""
+        self.stats["sent"] += 1
+        sent = await message.answer_photo(
+            photo=self._resolve(media), caption=caption, reply_markup=reply_markup
+        )
+        self._remember(
+            sent, _media_key(media), hash(caption), _markup_hash(reply_markup)
+        )
+        return sent
+
+    def forget(self, message: Message) -> None:
+        self._messages.pop((message.chat.id, message.message_id), None)
+
+    def _resolve(self, media: Media) -> Media:
+        key = _media_key(media)
+        return self._uploads.get(key, media) if key else media
+
+    def _remember(
+        self,
+        message: Message,
+        media_key: Optional[str],
+        caption_hash: int,
+        markup_hash: int,
+    ) -> None:
+        if media_key and media_key.startswith("file:") and message.photo:
+            self._uploads.setdefault(media_key, message.photo[-1].file_id)
+
+        key = (message.chat.id, message.message_id)
+        self._messages[key] = _Rendered(
+            media_key, caption_hash, markup_hash, _fingerprint(message)
+        )
+        self._messages.move_to_end(key)
+        while len(self._messages) > self.max_messages:
+            self._messages.popitem(last=False)
+
+
+renderer = MessageRenderer()
@@ -1,8 +1,10 @@
 import aiogram
 
+from .backup import router as backup_router
 from .balance import router as balance_router
+from .logs import router as logs_router
 from .preview import router as preview_router
 
 router = aiogram.Router()
-router.include_routers(balance_router, preview_router)
+router.include_routers(balance_router, backup_router, logs_router, preview_router)
 __all__ = ["router"]
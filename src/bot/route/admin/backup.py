@@ -0,0 +1,51 @@
+from typing import cast
+
+from aiogram import F, Router
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+
+from bot.render import renderer
+from config.settings import settings
+from db.backup import BackupError, sqlite_backup
+
+router = Router()
+
+
+def can_backup(user_id: int) -> bool:
+    # Снимок - вся база целиком, не данные одного владельца
+    return sqlite_backup.available and user_id in settings.ADMIN_IDS
+
+
+def build_backup_msg(path: str, size: int, seconds: float) -> str:
+    return (
+        "💾 <b>Бэкап готов</b>\n\n"
+        f"Файл: <code>{path}</code>\n"
+        f"Размер: {size / 1024:.1f} КБ\n"
+        f"Время: {seconds:.1f} с"
+    )
+
+
+@router.callback_query(F.data == "admin:backup")
+async def handle_backup(clbq: CallbackQuery) -> None:
+    if not can_backup(clbq.from_user.id):
+        await clbq.answer("Недоступно", show_alert=True)
+        return
+    await clbq.answer("Снимаю бэкап…")
+    try:
+        result = await sqlite_backup.run()
+        caption = build_backup_msg(str(result.path), result.size, result.seconds)
+    except (BackupError, OSError) as e:
+        caption = f"❌ Бэкап не удался: {e}"
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=caption,
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="<- Назад", callback_data="admin")]
+            ]
+        ),
+    )
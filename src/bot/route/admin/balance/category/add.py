@@ -12,6 +12,9 @@ from aiogram.types import (
     Message,
 )
 
+from bot.money import parse_amount
+from bot.quick_entry import category_index
+from bot.render import renderer
 from config.consts import IMG_DIR
 from db.repository.category import CategoryRepo
 from db.session import transaction
@@ -27,7 +30,8 @@ class AddCategoryStates(StatesGroup):
 @router.callback_query(F.data == "admin:balance:add_category")
 async def handle_add_category(clbq: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(AddCategoryStates.waiting_for_name)
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Введите название новой категории:",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -41,40 +45,45 @@ async def handle_add_category(clbq: CallbackQuery, state: FSMContext) -> None:
 async def process_category_name(msg: Message, state: FSMContext) -> None:
     await state.update_data(name=msg.text)
     await state.set_state(AddCategoryStates.waiting_for_limit)
-    await msg.answer_photo(
-        photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
         caption="Введите лимит (число) или напишите `-`, если без лимита:",
     )
 
 
 @router.message(F.text, AddCategoryStates.waiting_for_limit)
-async def process_category_limit(msg: Message, state: FSMContext) -> None:
+async def process_category_limit(
+    msg: Message, state: FSMContext, owner_id: int
+) -> None:
     data = await state.get_data()
     name = data["name"]
 
     if not msg.text or msg.text.strip() == "-":
         max_limit = None
     else:
-        try:
-            max_limit = float(msg.text)
-        except ValueError:
-            await msg.answer_photo(
-                photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        max_limit = parse_amount(msg.text)
+        if max_limit is None:
+            await renderer.answer(
+                msg,
+                media=FSInputFile(IMG_DIR / "startImg.jpeg"),
                 caption="Введите корректное число или `-`",
             )
             return
 
     async with transaction() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         await cr.create(
             name=name,
             max_limit=max_limit,
             last_reset=int(time.time()),
         )
+    category_index.invalidate(owner_id)
 
     await state.clear()
-    await msg.answer_photo(
-        photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
         caption=f"✅ Категория <b>{name}</b> успешно добавлена.",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
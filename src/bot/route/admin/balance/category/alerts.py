@@ -0,0 +1,97 @@
+from typing import cast
+
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from bot.alerts import parse_thresholds
+from bot.render import renderer
+from config.consts import IMG_DIR
+from db.repository.category import CategoryRepo
+from db.session import get_session, transaction
+
+router = Router()
+
+
+class AlertStates(StatesGroup):
+    waiting_for_thresholds = State()
+
+
+@router.callback_query(F.data == "admin:balance:alerts")
+async def handle_alerts_category(clbq: CallbackQuery, owner_id: int) -> None:
+    async with get_session() as session:
+        cr = CategoryRepo(session, owner_id)
+        categories = await cr.get()
+
+    builder = InlineKeyboardBuilder()
+    for c in categories:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"{c.name} ({c.alert_thresholds or '-'})",
+                callback_data=f"admin:balance:alerts:{c.id}",
+            )
+        )
+    builder.row(InlineKeyboardButton(text="Cancel", callback_data="admin:balance"))
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Выберите категорию для настройки уведомлений:",
+        reply_markup=builder.as_markup(),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^admin:balance:alerts:\d+$"))
+async def handle_alerts_start(clbq: CallbackQuery, state: FSMContext) -> None:
+    cat_id = int(cast(str, clbq.data).split(":")[-1])
+    await state.update_data(cat_id=cat_id)
+    await state.set_state(AlertStates.waiting_for_thresholds)
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Введите пороги в процентах от лимита через запятую "
+        "(например, <code>80, 100</code>) или `-`, чтобы отключить:",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="Cancel", callback_data="admin:balance")]
+            ]
+        ),
+    )
+
+
+@router.message(F.text, AlertStates.waiting_for_thresholds)
+async def process_thresholds(msg: Message, state: FSMContext, owner_id: int) -> None:
+    text = cast(str, msg.text).strip()
+    thresholds = parse_thresholds(text)
+    if text != "-" and not thresholds:
+        await renderer.answer(
+            msg,
+            media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+            caption="Введите числа через запятую или `-`",
+        )
+        return
+
+    data = await state.get_data()
+    raw = ",".join(map(str, thresholds)) or None
+    async with transaction() as session:
+        cr = CategoryRepo(session, owner_id)
+        await cr.update(data["cat_id"], alert_thresholds=raw)
+
+    await state.clear()
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        caption=f"🔔 Пороги уведомлений: {raw or 'отключены'}",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="Main", callback_data="admin:balance")]
+            ]
+        ),
+    )
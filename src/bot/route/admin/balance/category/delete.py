@@ -9,6 +9,8 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.quick_entry import category_index
+from bot.render import renderer
 from db.models import BalanceCategoryModel
 from db.repository.category import CategoryRepo
 from db.session import get_session, transaction
@@ -31,11 +33,12 @@ def build_delete_category_kb(
 
 
 @router.callback_query(F.data == "admin:balance:delete_category")
-async def handle_delete_category(clbq: CallbackQuery) -> None:
+async def handle_delete_category(clbq: CallbackQuery, owner_id: int) -> None:
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         categories = await cr.get()
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Choose category you want to detele",
         reply_markup=build_delete_category_kb(categories),
     )
@@ -44,7 +47,8 @@ async def handle_delete_category(clbq: CallbackQuery) -> None:
 @router.callback_query(F.data.regexp(r"^admin:balance:delete_category:\d+$"))
 async def handle_delete_category_confirm(clbq: CallbackQuery) -> None:
     cat_id = cast(int, int(clbq.data.split(":")[-1]))  # type: ignore
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Confirm pls",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -61,12 +65,14 @@ async def handle_delete_category_confirm(clbq: CallbackQuery) -> None:
 
 
 @router.callback_query(F.data.regexp(r"^admin:balance:delete_category:\d+:confirm$"))
-async def handle_delete_category_success(clbq: CallbackQuery) -> None:
+async def handle_delete_category_success(clbq: CallbackQuery, owner_id: int) -> None:
     cat_id = cast(int, int(clbq.data.split(":")[-2]))  # type: ignore
     async with transaction() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         await cr.delete(cat_id)
-    await cast(Message, clbq.message).edit_caption(
+    category_index.invalidate(owner_id)
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Success",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -11,6 +11,9 @@ from aiogram.types import (
     Message,
 )
 
+from bot.money import parse_amount
+from bot.quick_entry import category_index
+from bot.render import renderer
 from config.consts import IMG_DIR
 from db.repository.category import CategoryRepo
 from db.session import get_session, transaction
@@ -24,9 +27,9 @@ class EditCategoryStates(StatesGroup):
 
 
 @router.callback_query(F.data == "admin:balance:edit_category")
-async def handle_edit_category(clbq: CallbackQuery) -> None:
+async def handle_edit_category(clbq: CallbackQuery, owner_id: int) -> None:
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         categories = await cr.get()
 
     kb = InlineKeyboardMarkup(
@@ -42,7 +45,8 @@ async def handle_edit_category(clbq: CallbackQuery) -> None:
         + [[InlineKeyboardButton(text="Cancel", callback_data="admin:balance")]]
     )
 
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Выберите категорию для изменения:",
         reply_markup=kb,
     )
@@ -54,7 +58,8 @@ async def handle_edit_category_start(clbq: CallbackQuery, state: FSMContext) ->
     await state.update_data(cat_id=cat_id)
 
     await state.set_state(EditCategoryStates.waiting_for_name)
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Введите новое название категории:",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -68,14 +73,15 @@ async def handle_edit_category_start(clbq: CallbackQuery, state: FSMContext) ->
 async def process_edit_name(msg: Message, state: FSMContext) -> None:
     await state.update_data(name=msg.text)
     await state.set_state(EditCategoryStates.waiting_for_limit)
-    await msg.answer_photo(
-        photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
         caption="Введите новый лимит (число) или `-`, если без лимита:",
     )
 
 
 @router.message(F.text, EditCategoryStates.waiting_for_limit)
-async def process_edit_limit(msg: Message, state: FSMContext) -> None:
+async def process_edit_limit(msg: Message, state: FSMContext, owner_id: int) -> None:
     data = await state.get_data()
     cat_id = data["cat_id"]
     name = data["name"]
@@ -83,22 +89,24 @@ async def process_edit_limit(msg: Message, state: FSMContext) -> None:
     if not msg.text or msg.text.strip() == "-":
         max_limit = None
     else:
-        try:
-            max_limit = float(msg.text)
-        except ValueError:
-            await msg.answer_photo(
-                photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        max_limit = parse_amount(msg.text)
+        if max_limit is None:
+            await renderer.answer(
+                msg,
+                media=FSInputFile(IMG_DIR / "startImg.jpeg"),
                 caption="Введите корректное число или `-`",
             )
             return
 
     async with transaction() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         await cr.update(cat_id, name=name, max_limit=max_limit)
+    category_index.invalidate(owner_id)
 
     await state.clear()
-    await msg.answer_photo(
-        photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
         caption=f"✏ Категория <b>{name}</b> успешно изменена.",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -9,6 +9,7 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.render import renderer
 from db.repository.category import CategoryRepo
 from db.session import transaction
 
@@ -28,17 +29,20 @@ def build_reset_limits_kb() -> InlineKeyboardMarkup:
 
 @router.callback_query(F.data == "admin:balance:reset_limits")
 async def handle_reset_limit(clbq: CallbackQuery) -> None:
-    await cast(Message, clbq.message).edit_caption(
-        caption="Reset?", reply_markup=build_reset_limits_kb()
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Reset?",
+        reply_markup=build_reset_limits_kb(),
     )
 
 
 @router.callback_query(F.data == "admin:balance:reset_limits:confirm")
-async def handle_reset_limit_confirm(clbq: CallbackQuery) -> None:
+async def handle_reset_limit_confirm(clbq: CallbackQuery, owner_id: int) -> None:
     async with transaction() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         await cr.reset_all_limits()
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Success",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
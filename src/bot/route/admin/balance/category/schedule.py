@@ -0,0 +1,226 @@
+import re
+import time
+from typing import cast
+
+from aiogram import F, Router
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from bot.render import renderer
+from config.consts import IMG_DIR
+from db.repository.category import CategoryRepo
+from db.session import get_session, transaction
+from scheduler.limits import limit_reset_scheduler
+from scheduler.schedule import Schedule, next_boundary
+
+router = Router()
+
+WEEKDAYS = ["Пн", "Вт", "Ср", "Чт", "Пт", "Сб", "Вс"]
+
+
+class ScheduleStates(StatesGroup):
+    waiting_for_month_day = State()
+    waiting_for_interval = State()
+
+
+def build_done_kb() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text="Main", callback_data="admin:balance")]
+        ]
+    )
+
+
+async def save_schedule(cat_id: int, schedule: Schedule, owner_id: int) -> str:
+    next_reset = next_boundary(schedule, int(time.time()))
+    async with transaction() as session:
+        cr = CategoryRepo(session, owner_id)
+        await cr.update(
+            cat_id,
+            reset_period=schedule.period,
+            reset_day=schedule.day,
+            reset_interval_days=schedule.interval_days,
+            next_reset=next_reset,
+        )
+        category = await cr.get(id=cat_id)
+    limit_reset_scheduler.reload()
+
+    if not category:
+        return "Категория не найдена"
+    return (
+        f"🔁 Расписание категории <b>{category.name}</b>: "
+        f"{category.reset_schedule_readable}\n"
+        f"⏭ Следующий сброс: {category.next_reset_readable}"
+    )
+
+
+@router.callback_query(F.data == "admin:balance:schedule")
+async def handle_schedule_category(clbq: CallbackQuery, owner_id: int) -> None:
+    async with get_session() as session:
+        cr = CategoryRepo(session, owner_id)
+        categories = await cr.get()
+
+    builder = InlineKeyboardBuilder()
+    for c in categories:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"{c.name} ({c.reset_schedule_readable})",
+                callback_data=f"admin:balance:schedule:{c.id}",
+            )
+        )
+    builder.row(InlineKeyboardButton(text="Cancel", callback_data="admin:balance"))
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Выберите категорию для настройки автосброса:",
+        reply_markup=builder.as_markup(),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^admin:balance:schedule:\d+$"))
+async def handle_schedule_period(clbq: CallbackQuery) -> None:
+    cat_id = int(cast(str, clbq.data).split(":")[-1])
+    prefix = f"admin:balance:schedule:{cat_id}"
+
+    builder = InlineKeyboardBuilder()
+    builder.row(InlineKeyboardButton(text="Вручную", callback_data=f"{prefix}:manual"))
+    builder.row(
+        InlineKeyboardButton(text="Ежемесячно", callback_data=f"{prefix}:monthly")
+    )
+    builder.row(
+        InlineKeyboardButton(text="Еженедельно", callback_data=f"{prefix}:weekly")
+    )
+    builder.row(
+        InlineKeyboardButton(text="Каждые N дней", callback_data=f"{prefix}:interval")
+    )
+    builder.row(InlineKeyboardButton(text="Cancel", callback_data="admin:balance"))
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Как часто сбрасывать лимит?",
+        reply_markup=builder.as_markup(),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^admin:balance:schedule:\d+:manual$"))
+async def handle_schedule_manual(clbq: CallbackQuery, owner_id: int) -> None:
+    cat_id = int(cast(str, clbq.data).split(":")[-2])
+    caption = await save_schedule(cat_id, Schedule("manual"), owner_id)
+    await renderer.render(
+        cast(Message, clbq.message), caption=caption, reply_markup=build_done_kb()
+    )
+
+
+@router.callback_query(F.data.regexp(r"^admin:balance:schedule:\d+:weekly$"))
+async def handle_schedule_weekly(clbq: CallbackQuery) -> None:
+    cat_id = int(cast(str, clbq.data).split(":")[-2])
+    builder = InlineKeyboardBuilder()
+    for day, name in enumerate(WEEKDAYS):
+        builder.add(
+            InlineKeyboardButton(
+                text=name, callback_data=f"admin:balance:schedule:{cat_id}:weekly:{day}"
+            )
+        )
+    builder.adjust(7)
+    builder.row(InlineKeyboardButton(text="Cancel", callback_data="admin:balance"))
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="В какой день недели сбрасывать?",
+        reply_markup=builder.as_markup(),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^admin:balance:schedule:\d+:weekly:[0-6]$"))
+async def handle_schedule_weekly_day(clbq: CallbackQuery, owner_id: int) -> None:
+    match = re.match(
+        r"^admin:balance:schedule:(\d+):weekly:([0-6])$", cast(str, clbq.data)
+    )
+    if not match:
+        raise Exception("Invalid schedule callback")
+    cat_id, day = int(match.group(1)), int(match.group(2))
+    caption = await save_schedule(cat_id, Schedule("weekly", day=day), owner_id)
+    await renderer.render(
+        cast(Message, clbq.message), caption=caption, reply_markup=build_done_kb()
+    )
+
+
+@router.callback_query(
+    F.data.regexp(r"^admin:balance:schedule:\d+:(monthly|interval)$")
+)
+async def handle_schedule_ask_number(clbq: CallbackQuery, state: FSMContext) -> None:
+    _, _, _, cat_id, period = cast(str, clbq.data).split(":")
+    await state.update_data(cat_id=int(cat_id))
+
+    if period == "monthly":
+        await state.set_state(ScheduleStates.waiting_for_month_day)
+        caption = "Введите число месяца для сброса (1-31):"
+    else:
+        await state.set_state(ScheduleStates.waiting_for_interval)
+        caption = "Введите интервал в днях:"
+
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=caption,
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="Cancel", callback_data="admin:balance")]
+            ]
+        ),
+    )
+
+
+@router.message(F.text, ScheduleStates.waiting_for_month_day)
+async def process_month_day(msg: Message, state: FSMContext, owner_id: int) -> None:
+    text = cast(str, msg.text).strip()
+    if not text.isdigit() or not 1 <= int(text) <= 31:
+        await renderer.answer(
+            msg,
+            media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+            caption="Введите число от 1 до 31",
+        )
+        return
+
+    data = await state.get_data()
+    caption = await save_schedule(
+        data["cat_id"], Schedule("monthly", day=int(text)), owner_id
+    )
+    await state.clear()
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        caption=caption,
+        reply_markup=build_done_kb(),
+    )
+
+
+@router.message(F.text, ScheduleStates.waiting_for_interval)
+async def process_interval(msg: Message, state: FSMContext, owner_id: int) -> None:
+    text = cast(str, msg.text).strip()
+    if not text.isdigit() or int(text) <= 0:
+        await renderer.answer(
+            msg,
+            media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+            caption="Введите целое число дней больше 0",
+        )
+        return
+
+    data = await state.get_data()
+    caption = await save_schedule(
+        data["cat_id"], Schedule("interval", interval_days=int(text)), owner_id
+    )
+    await state.clear()
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        caption=caption,
+        reply_markup=build_done_kb(),
+    )
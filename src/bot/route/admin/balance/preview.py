@@ -10,6 +10,8 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.render import renderer
+
 router = Router()
 
 
@@ -20,6 +22,14 @@ def build_admin_preview_kb() -> InlineKeyboardMarkup:
             text="Reset limits", callback_data="admin:balance:reset_limits"
         )
     )
+    builder.row(
+        InlineKeyboardButton(
+            text="Reset schedule", callback_data="admin:balance:schedule"
+        )
+    )
+    builder.row(
+        InlineKeyboardButton(text="Budget alerts", callback_data="admin:balance:alerts")
+    )
     builder.row(
         InlineKeyboardButton(
             text="Add category", callback_data="admin:balance:add_category"
@@ -42,6 +52,8 @@ def build_admin_preview_kb() -> InlineKeyboardMarkup:
 @router.callback_query(F.data == "admin:balance")
 async def handle_admin_balance_preview(clbq: CallbackQuery, state: FSMContext) -> None:
     await state.set_state(None)
-    await cast(Message, clbq.message).edit_caption(
-        caption="Choose action", reply_markup=build_admin_preview_kb()
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Choose action",
+        reply_markup=build_admin_preview_kb(),
     )
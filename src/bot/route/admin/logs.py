@@ -0,0 +1,53 @@
+import html
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from config.log import log_pipeline
+from config.settings import settings
+
+router = Router()
+
+LOG_LEVEL_USAGE = (
+    "<code>/loglevel</code> - текущие уровни\n"
+    "<code>/loglevel DEBUG</code> - уровень корневого логгера\n"
+    "<code>/loglevel sqlalchemy.engine INFO</code> - уровень логгера"
+)
+
+
+def build_log_levels_msg() -> str:
+    levels = "\n".join(
+        f"{html.escape(name)}: {level}" for name, level in log_pipeline.levels().items()
+    )
+    sampling = log_pipeline.sampling
+    lines = [f"📝 <b>Логи</b>\n\n<pre>{levels}</pre>"]
+    if sampling is not None and sampling.rate < 1:
+        lines.append(
+            f"Ниже WARNING от {html.escape(', '.join(sampling.prefixes))} "
+            f"пишется {sampling.rate:.0%} записей"
+        )
+    lines.append(f"Отброшено при полной очереди: {log_pipeline.dropped}")
+    if settings.WORKERS:
+        lines.append("Уровни меняются только в процессе, обработавшем команду")
+    return "\n".join(lines)
+
+
+@router.message(Command("loglevel"))
+async def handle_log_level(message: Message, command: CommandObject) -> None:
+    # Уровни общие для всего процесса, не для владельца данных
+    if not message.from_user or message.from_user.id not in settings.ADMIN_IDS:
+        await message.answer("Недоступно")
+        return
+    args = (command.args or "").split()
+    if len(args) > 2:
+        await message.answer(LOG_LEVEL_USAGE)
+        return
+    if args:
+        name, level = ("root", args[0]) if len(args) == 1 else (args[0], args[1])
+        try:
+            log_pipeline.set_level(name, level)
+        except ValueError:
+            await message.answer(f"❌ Неизвестный уровень\n\n{LOG_LEVEL_USAGE}")
+            return
+    await message.answer(build_log_levels_msg())
@@ -9,18 +9,26 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.render import renderer
+
+from .backup import can_backup
+
 router = Router()
 
 
-def build_admin_preview_kb() -> InlineKeyboardMarkup:
+def build_admin_preview_kb(user_id: int) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
     builder.row(InlineKeyboardButton(text="Balance", callback_data="admin:balance"))
+    if can_backup(user_id):
+        builder.row(InlineKeyboardButton(text="Backup", callback_data="admin:backup"))
     builder.row(InlineKeyboardButton(text="<- Назад", callback_data="main"))
     return builder.as_markup()
 
 
 @router.callback_query(F.data == "admin")
 async def handle_admin_preview(clbq: CallbackQuery) -> None:
-    await cast(Message, clbq.message).edit_caption(
-        caption="Choose module", reply_markup=build_admin_preview_kb()
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Choose module",
+        reply_markup=build_admin_preview_kb(clbq.from_user.id),
     )
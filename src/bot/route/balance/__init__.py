@@ -1,9 +1,19 @@
 import aiogram
 
 from .add import router as add_router
+from .batch import router as batch_router
 from .by_category import router as by_category_router
 from .preview import router as preview_router
+from .quick import router as quick_router
+from .recurring import router as recurring_router
 
 router = aiogram.Router()
-router.include_routers(preview_router, add_router, by_category_router)
+router.include_routers(
+    preview_router,
+    add_router,
+    by_category_router,
+    recurring_router,
+    quick_router,
+    batch_router,
+)
 __all__ = ["router"]
@@ -1,7 +1,9 @@
+import datetime
 import re
+import time
 from typing import Sequence, cast
 
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import (
@@ -13,12 +15,18 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.alerts import add_expense, send_budget_alert
+from bot.money import format_amount, parse_amount
+from bot.render import renderer
 from config.consts import IMG_DIR
 from db.models import BalanceCategoryModel
 from db.repository.balance import BalanceRepo
 from db.repository.category import CategoryRepo
+from db.repository.recurring import RecurringRepo
 from db.repository.tags import TagRepo
 from db.session import get_session, transaction
+from scheduler.recurring import recurring_scheduler
+from scheduler.schedule import Schedule, next_boundary
 
 router = Router()
 
@@ -44,12 +52,15 @@ def build_enter_category_kb(
 
 
 @router.callback_query(F.data == "balance:add")
-async def handle_enter_balance_category(clbq: CallbackQuery, state: FSMContext) -> None:
+async def handle_enter_balance_category(
+    clbq: CallbackQuery, state: FSMContext, owner_id: int
+) -> None:
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         categories = await cr.get()
 
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Выбери категорию ниже 👇",
         reply_markup=build_enter_category_kb(categories),
     )
@@ -69,8 +80,10 @@ async def handle_enter_balance_type(clbq: CallbackQuery, state: FSMContext) -> N
         ]
     )
 
-    await cast(Message, clbq.message).edit_caption(
-        caption="<b>Выбери тип ниже</b> 👇", reply_markup=kb
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="<b>Выбери тип ниже</b> 👇",
+        reply_markup=kb,
     )
 
 
@@ -80,31 +93,40 @@ async def handle_enter_balance_name(clbq: CallbackQuery, state: FSMContext) -> N
     balance_type = match.group(1) if match else None
     await state.update_data(balance_type=balance_type)
     await state.set_state(AddBalace.enter_name)
-    await cast(Message, clbq.message).edit_caption(caption="<b>Введи название</b>")
+    await renderer.render(cast(Message, clbq.message), caption="<b>Введи название</b>")
 
 
 @router.message(F.text, AddBalace.enter_name)
 async def hanle_enter_amount(message: Message, state: FSMContext) -> None:
     await state.update_data(name=message.text)
     await state.set_state(AddBalace.enter_amount)
-    await message.answer_photo(
-        photo=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+    await renderer.answer(
+        message,
+        media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
         caption="<b>Введи сумму в рублях</b>",
     )
 
 
-@router.message(F.text.regexp(r"^\d+$"), AddBalace.enter_amount)
+@router.message(F.text, AddBalace.enter_amount)
 async def hanle_enter_tags(message: Message, state: FSMContext) -> None:
-    await state.update_data(amount=int(message.text))  # type: ignore
+    amount = parse_amount(cast(str, message.text))
+    if amount is None:
+        await renderer.answer(
+            message,
+            media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+            caption="<b>Введи сумму числом</b>\n\n<b>Пример:</b> 350 или 99,90",
+        )
+        return
+    await state.update_data(amount=amount)
     await state.set_state(AddBalace.enter_tags)
     msg = "Введи произвольные теги через зяпятую или '-'\n\n<b>Пример:</b> Ресторан, Прогулка, Отдых"  # noqa: E501
-    await message.answer_photo(
-        photo=FSInputFile(IMG_DIR / "balanceImg.jpeg"), caption=msg
+    await renderer.answer(
+        message, media=FSInputFile(IMG_DIR / "balanceImg.jpeg"), caption=msg
     )
 
 
 @router.message(F.text, AddBalace.enter_tags)
-async def handle_enter_tags(message: Message, state: FSMContext) -> None:
+async def handle_enter_tags(message: Message, state: FSMContext, owner_id: int) -> None:
     raw_tags = message.text or ""
     tags = [tag.strip() for tag in raw_tags.split(",") if tag]
 
@@ -117,7 +139,7 @@ async def handle_enter_tags(message: Message, state: FSMContext) -> None:
     tags_str = ", ".join(tags) if tags else "-"
 
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         category_name = await cr.get(BalanceCategoryModel.name, id=category_id)
 
     # итоговое сообщение
@@ -125,7 +147,7 @@ async def handle_enter_tags(message: Message, state: FSMContext) -> None:
         "<b>Подтверди запись</b>\n\n"
         f"📂 Категория: {category_name[0] if category_name else '-'}\n"
         f"📑 Название: {name}\n"
-        f"💵 Сумма: {amount}\n"
+        f"💵 Сумма: {format_amount(amount or 0)}\n"
         f"📊 Тип: {BTYPE2MESSAGE.get(balance_type, '-')}\n"  # type: ignore
         f"🏷 Теги: {tags_str}\n\n"
         "Добавить запись?"
@@ -139,18 +161,32 @@ async def handle_enter_tags(message: Message, state: FSMContext) -> None:
                 InlineKeyboardButton(
                     text="❌ Отменить", callback_data="balance:cancel"
                 ),
-            ]
+            ],
+            [
+                InlineKeyboardButton(
+                    text="🔁 Ежемесячно", callback_data="balance:confirm:monthly"
+                ),
+                InlineKeyboardButton(
+                    text="🔁 Еженедельно", callback_data="balance:confirm:weekly"
+                ),
+            ],
         ]
     )
-    await message.answer_photo(
-        photo=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+    await renderer.answer(
+        message,
+        media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
         caption=msg,
         reply_markup=kb,
     )
 
 
-@router.callback_query(F.data == "balance:confirm")
-async def handle_confirm_add_balance(clbq: CallbackQuery, state: FSMContext) -> None:
+@router.callback_query(F.data.regexp(r"^balance:confirm(:monthly|:weekly)?$"))
+async def handle_confirm_add_balance(
+    clbq: CallbackQuery, state: FSMContext, owner_id: int
+) -> None:
+    # balance:confirm:<period> - запись повторяется по расписанию
+    parts = cast(str, clbq.data).split(":")
+    period = parts[2] if len(parts) == 3 else None
     data = await state.get_data()
     category_id = data.get("category_id")
     balance_type = data.get("balance_type", "unknown")
@@ -159,10 +195,27 @@ async def handle_confirm_add_balance(clbq: CallbackQuery, state: FSMContext) ->
     tags = cast(list[str], data.get("tags", []))
     async with transaction() as trx:
         tag_repo = TagRepo(trx)
-        balance_repo = BalanceRepo(trx)
-
-        tag_objs = [await tag_repo.get_or_create(tag_name) for tag_name in tags]
-        await trx.flush(tag_objs)
+        balance_repo = BalanceRepo(trx, owner_id)
+
+        tag_objs = await tag_repo.get_or_create_many(tags)
+
+        recurring = None
+        if period:
+            # Повторяем в тот же день месяца или недели, что и сегодня
+            now = int(time.time())
+            today = datetime.datetime.fromtimestamp(now)
+            day = today.day if period == "monthly" else today.weekday()
+            recurring = await RecurringRepo(trx, owner_id).create(
+                name=name,
+                amount=amount,
+                balance_type=balance_type,
+                period=period,
+                day=day,
+                next_run=next_boundary(Schedule(period, day=day), now),
+                category_id=category_id,
+                tags=tag_objs,
+            )
+            await trx.flush([recurring])
 
         await balance_repo.create(
             name=name,
@@ -170,10 +223,23 @@ async def handle_confirm_add_balance(clbq: CallbackQuery, state: FSMContext) ->
             balance_type=balance_type,
             category_id=category_id,
             tags=tag_objs,
+            recurring_id=recurring.id if recurring else None,
         )
+
+        alert = None
+        if balance_type == "expense" and category_id is not None:
+            alert = await add_expense(trx, owner_id, category_id, amount)
     await state.clear()
-    await cast(Message, clbq.message).edit_caption(
-        caption="✅ Запись успешно добавлена!",
+    caption = "✅ Запись успешно добавлена!"
+    if recurring:
+        recurring_scheduler.reload()
+        caption += (
+            f"\n\n🔁 Повтор: {recurring.schedule_readable}\n"
+            f"⏭ Следующая запись: {recurring.next_run_readable}"
+        )
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=caption,
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
                 [
@@ -185,12 +251,15 @@ async def handle_confirm_add_balance(clbq: CallbackQuery, state: FSMContext) ->
             ]
         ),
     )
+    if alert:
+        await send_budget_alert(cast(Bot, clbq.bot), alert)
 
 
 @router.callback_query(F.data == "balance:cancel")
 async def handle_cancel_add_balance(clbq: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="❌ Добавление отменено",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -0,0 +1,283 @@
+import html
+import secrets
+from collections import defaultdict
+from typing import Any, Optional, Sequence, cast
+
+from aiogram import Bot, F, Router
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from magic_filter import RegexpMode
+
+from bot.alerts import BudgetAlert, add_expense, send_budget_alert
+from bot.money import format_amount
+from bot.quick_entry import (
+    BATCH_MAX_LINES,
+    BatchLine,
+    CategoryRef,
+    QuickEntry,
+    category_index,
+    parse_batch,
+)
+from bot.render import renderer
+from config.consts import IMG_DIR
+from db.repository.balance import BalanceRepo, NewBalance
+from db.repository.category import CategoryRepo
+from db.repository.tags import TagRepo
+from db.session import transaction
+
+from .quick import QUICK_ENTRY_HINT
+
+router = Router()
+
+# Подпись к фото ограничена 1024 символами
+CAPTION_MAX_LEN = 1024
+CATEGORY_COL = 10
+NAME_COL = 16
+
+# Строка отклонена: (номер строки, причина)
+Rejected = tuple[int, str]
+
+
+def _cell(text: str, width: int) -> str:
+    if len(text) > width:
+        text = text[: width - 1] + "…"
+    return html.escape(text.ljust(width))
+
+
+def _signed_amount(entry: QuickEntry) -> str:
+    sign = "+" if entry.balance_type == "income" else "-"
+    return sign + format_amount(entry.amount)
+
+
+def _rejected_lines(rejected: Sequence[Rejected]) -> list[str]:
+    return [f"❌ {line_no}: {html.escape(error)}" for line_no, error in rejected]
+
+
+def _trimmed(lines: list[str], keep: int) -> list[str]:
+    return [*lines[:keep], "…"] if keep < len(lines) else lines
+
+
+def _fit_caption(head: str, rows: list[str], tail: list[str]) -> str:
+    """
+    Подпись из заголовка, таблицы `rows` и строк `tail`. Если не помещается,
+    сначала укорачивается таблица, потом `tail`.
+    """
+    keep_rows, keep_tail = len(rows), len(tail)
+    while True:
+        caption = head
+        if rows:
+            caption += "\n<pre>" + "\n".join(_trimmed(rows, keep_rows)) + "</pre>"
+        if tail:
+            caption += "\n" + "\n".join(_trimmed(tail, keep_tail))
+        if len(caption) <= CAPTION_MAX_LEN or (not keep_rows and not keep_tail):
+            return caption
+        if keep_rows:
+            keep_rows -= 1
+        else:
+            keep_tail -= 1
+
+
+async def resolve_batch_category(
+    owner_id: int, query: Optional[str]
+) -> tuple[Optional[CategoryRef], Optional[str]]:
+    """
+    Категория строки пакета без вопросов: выбирать её по кнопке для каждой
+    строки неудобно, поэтому неоднозначная или ненайденная - ошибка строки.
+    """
+    categories = await category_index.refs(owner_id)
+    if not query:
+        if len(categories) > 1:
+            return None, "Не указана @категория"
+        return (categories[0] if categories else None), None
+    matches = await category_index.match(owner_id, query)
+    if not matches:
+        return None, f"Нет категории «{query}»"
+    if len(matches) > 1:
+        return None, f"Под «{query}» подходит несколько категорий"
+    return matches[0], None
+
+
+async def prepare_batch(
+    owner_id: int, lines: Sequence[BatchLine]
+) -> tuple[list[dict[str, Any]], list[Rejected]]:
+    """Строки пакета, готовые к записи (уже при category_id), и отклонённые"""
+    accepted: list[dict[str, Any]] = []
+    rejected: list[Rejected] = []
+    for line in lines:
+        if line.entry is None:
+            rejected.append((line.line_no, cast(str, line.error)))
+            continue
+        category, error = await resolve_batch_category(owner_id, line.entry.category)
+        if error:
+            rejected.append((line.line_no, error))
+            continue
+        accepted.append(
+            {
+                **line.entry._asdict(),
+                "line_no": line.line_no,
+                "category_id": category.id if category else None,
+                "category_name": category.name if category else "-",
+            }
+        )
+    return accepted, rejected
+
+
+def _entry_fields(row: dict[str, Any]) -> dict[str, Any]:
+    return {field: row[field] for field in QuickEntry._fields}
+
+
+def build_batch_msg(
+    accepted: Sequence[dict[str, Any]], rejected: Sequence[Rejected]
+) -> str:
+    total = len(accepted) + len(rejected)
+    head = f"<b>Пакетный ввод: {len(accepted)} из {total} строк</b>\n"
+    rows = [
+        f"{r['line_no']:>2} "
+        f"{_signed_amount(QuickEntry(**_entry_fields(r))):>10} "
+        f"{_cell(r['category_name'], CATEGORY_COL)} "
+        f"{_cell(r['name'], NAME_COL)}"
+        for r in accepted
+    ]
+    return _fit_caption(head, rows, _rejected_lines(rejected))
+
+
+def build_batch_kb(nonce: str, accepted_count: int) -> InlineKeyboardMarkup:
+    """`nonce` привязывает кнопку к этому превью, как в быстром вводе"""
+    rows = []
+    if accepted_count:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text=f"✅ Добавить {accepted_count}",
+                    callback_data=f"balance:batch:confirm:{nonce}",
+                )
+            ]
+        )
+    rows.append(
+        [InlineKeyboardButton(text="❌ Отменить", callback_data="balance:cancel")]
+    )
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+async def save_batch(
+    owner_id: int, accepted: Sequence[dict[str, Any]]
+) -> tuple[list[int], list[Rejected], list[BudgetAlert]]:
+    """
+    Записывает пакет одной транзакцией: теги, записи и привязки тегов -
+    по одному запросу на пакет, лимит - по одному UPDATE на категорию.
+    """
+    rejected: list[Rejected] = []
+    alerts: list[BudgetAlert] = []
+    async with transaction() as trx:
+        # Категорию могли удалить, пока пакет ждал подтверждения
+        category_ids = {r["category_id"] for r in accepted if r["category_id"]}
+        categories = await CategoryRepo(trx, owner_id).get_many(list(category_ids))
+        existing = {c.id for c in categories}
+        if existing != category_ids:
+            category_index.invalidate(owner_id)
+        rows = []
+        for r in accepted:
+            if r["category_id"] and r["category_id"] not in existing:
+                rejected.append((r["line_no"], "Категория удалена"))
+            else:
+                rows.append(r)
+
+        tags = await TagRepo(trx).get_or_create_many(
+            [tag for r in rows for tag in r["tags"]]
+        )
+        tag_ids = {tag.name: tag.id for tag in tags}
+        ids = await BalanceRepo(trx, owner_id).create_many(
+            [
+                NewBalance(
+                    name=r["name"],
+                    amount=r["amount"],
+                    balance_type=r["balance_type"],
+                    category_id=r["category_id"],
+                    tag_ids=[tag_ids[tag] for tag in r["tags"]],
+                )
+                for r in rows
+            ]
+        )
+
+        spent: dict[int, int] = defaultdict(int)
+        for r in rows:
+            if r["balance_type"] == "expense" and r["category_id"]:
+                spent[r["category_id"]] += r["amount"]
+        for category_id, amount in spent.items():
+            alert = await add_expense(trx, owner_id, category_id, amount)
+            if alert:
+                alerts.append(alert)
+    return ids, rejected, alerts
+
+
+@router.message(
+    StateFilter(None),
+    F.text.contains("\n"),
+    F.text.regexp(r"\d", mode=RegexpMode.SEARCH),
+    ~F.text.startswith("/"),
+)
+async def handle_batch_entry(
+    message: Message, state: FSMContext, owner_id: int
+) -> None:
+    lines = parse_batch(cast(str, message.text))
+    if len(lines) > BATCH_MAX_LINES:
+        await renderer.answer(
+            message,
+            media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+            caption=f"❌ Не больше {BATCH_MAX_LINES} строк за раз",
+        )
+        return
+
+    accepted, rejected = await prepare_batch(owner_id, lines)
+    caption = build_batch_msg(accepted, rejected)
+    # Новое превью заменяет прежнее, даже пустое: кнопка старого превью
+    # не должна сохранить пакет, которого уже не видно
+    nonce = secrets.token_hex(4)
+    await state.update_data(batch=accepted, batch_rejected=rejected, batch_nonce=nonce)
+    if not accepted:
+        caption += f"\n\n{QUICK_ENTRY_HINT}"
+    await renderer.answer(
+        message,
+        media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+        caption=caption,
+        reply_markup=build_batch_kb(nonce, len(accepted)),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^balance:batch:confirm:[0-9a-f]+$"))
+async def handle_batch_confirm(
+    clbq: CallbackQuery, state: FSMContext, owner_id: int
+) -> None:
+    nonce = cast(str, clbq.data).split(":")[-1]
+    data = await state.get_data()
+    accepted: list[dict[str, Any]] = data.get("batch") or []
+    if not accepted or data.get("batch_nonce") != nonce:
+        await clbq.answer("Пакет устарел, отправь его ещё раз", show_alert=True)
+        return
+
+    rejected = [(line_no, error) for line_no, error in data.get("batch_rejected", [])]
+    ids, deleted, alerts = await save_batch(owner_id, accepted)
+    await state.clear()
+    rejected = sorted(rejected + deleted)
+    head = f"✅ Добавлено записей: {len(ids)}\n"
+    if ids:
+        head += "id: " + ", ".join(map(str, ids)) + "\n"
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=_fit_caption(head, [], _rejected_lines(rejected)),
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="💰 Баланс", callback_data="balance")],
+                [InlineKeyboardButton(text="🏠 Домой", callback_data="main")],
+            ]
+        ),
+    )
+    for alert in alerts:
+        await send_budget_alert(cast(Bot, clbq.bot), alert)
@@ -1,5 +1,5 @@
 import re
-from typing import Sequence, cast
+from typing import Optional, Sequence, cast
 
 from aiogram import F, Router
 from aiogram.types import (
@@ -10,10 +10,19 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.money import format_amount
+from bot.paging import build_page_rows, page_total
+from bot.render import renderer
 from config.consts import DEFAULT_PAGE_LIMIT
-from db.models import BalanceCategoryModel, BalanceModel
+from db.models import (
+    BalanceCategoryModel,
+    BalanceModel,
+    CategoryPeriodSnapshotModel,
+)
 from db.repository.balance import BalanceRepo
 from db.repository.category import CategoryRepo
+from db.repository.counter import CounterRepo, balance_list
+from db.repository.snapshot import SnapshotRepo
 from db.session import get_session
 
 router = Router()
@@ -35,24 +44,36 @@ def build_enter_category_kb(
 
 
 @router.callback_query(F.data == "balance:detail:by_category")
-async def handle_choose_category_for_detail_view(clbq: CallbackQuery) -> None:
+async def handle_choose_category_for_detail_view(
+    clbq: CallbackQuery, owner_id: int
+) -> None:
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         categories = await cr.get()
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="Выбери категорию ниже 👇",
         reply_markup=build_enter_category_kb(categories),
     )
 
 
 def build_detail_message(
-    category: BalanceCategoryModel, balances: Sequence[BalanceModel]
+    category: BalanceCategoryModel,
+    balances: Sequence[BalanceModel],
+    full_history: bool = False,
 ) -> str:
-    msg = [
-        f"📒 <b>История категории:</b> <i>{category.name}</i>",
-        f"🗓 <b>Дата последнего сброса:</b> {category.last_reset_readable}",
-        "───────────────",
-    ]
+    if full_history:
+        msg = [
+            f"📜 <b>Вся история категории:</b> <i>{category.name}</i>",
+            "───────────────",
+        ]
+    else:
+        msg = [
+            f"📒 <b>История категории:</b> <i>{category.name}</i>",
+            f"🗓 <b>Дата последнего сброса:</b> {category.last_reset_readable}",
+            f"🔁 <b>Автосброс:</b> {category.reset_schedule_readable}",
+            "───────────────",
+        ]
 
     if not balances:
         msg.append("💤 Нет записей для отображения.")
@@ -60,7 +81,7 @@ def build_detail_message(
         for b in balances:
             msg.append(
                 f"💡 <b>{b.name}</b>\n"
-                f"💰 <b>Сумма:</b> {b.amount}\n"
+                f"💰 <b>Сумма:</b> {format_amount(b.amount)}\n"
                 f"📊 <b>Тип:</b> {b.type_readable}\n"
                 f"🕒 <b>Дата:</b> {b.created_at_readable}"
             )
@@ -71,57 +92,125 @@ def build_detail_message(
 
 
 def build_detail_kb(
-    category_id: int, cur_skip: int, has_next: bool
+    category_id: int,
+    cur_skip: int,
+    has_next: bool,
+    prefix: str = "balance:detail:category",
+    total: Optional[int] = None,
 ) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
+    for row in build_page_rows(
+        f"{prefix}:{category_id}", cur_skip, DEFAULT_PAGE_LIMIT, has_next, total
+    ):
+        builder.row(*row)
 
-    current_page = (cur_skip // DEFAULT_PAGE_LIMIT) + 1
-
-    if cur_skip > 0:
-        builder.add(
+    if prefix == "balance:detail:category":
+        builder.row(
             InlineKeyboardButton(
-                text="◀️",
-                callback_data=f"balance:detail:category:{category_id}:{max(cur_skip - DEFAULT_PAGE_LIMIT, 0)}",  # noqa: E501
-            )
-        )
-    else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
-
-    builder.add(InlineKeyboardButton(text=f"{current_page}", callback_data="..."))
-
-    if has_next:
-        builder.add(
+                text="📜 Вся история",
+                callback_data=f"balance:history:{category_id}:0",
+            ),
             InlineKeyboardButton(
-                text="▶️",
-                callback_data=f"balance:detail:category:{category_id}:{cur_skip + DEFAULT_PAGE_LIMIT}",  # noqa: E501
-            )
+                text="🗂 Прошлые периоды",
+                callback_data=f"balance:periods:{category_id}:0",
+            ),
         )
+        back = "balance:detail:by_category"
     else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
-    builder.row(
-        InlineKeyboardButton(
-            text="<- Назад", callback_data="balance:detail:by_category"
-        )
-    )
+        back = f"balance:detail:category:{category_id}:0"
+    builder.row(InlineKeyboardButton(text="<- Назад", callback_data=back))
 
     return builder.as_markup()
 
 
 @router.callback_query(F.data.regexp(r"^balance:detail:category:\d+:\d+$"))
-async def handle_view_detail_by_category(clbq: CallbackQuery) -> None:
+async def handle_view_detail_by_category(clbq: CallbackQuery, owner_id: int) -> None:
     match = re.match(r"^balance:detail:category:(\d+):(\d+)$", cast(str, clbq.data))
     category_id = int(match.group(1)) if match else None
     if category_id is None:
         raise Exception("Not category id")
     skip = int(match.group(2)) if match else 0
     async with get_session() as session:
-        cr = CategoryRepo(session)
-        br = BalanceRepo(session)
+        cr = CategoryRepo(session, owner_id)
+        br = BalanceRepo(session, owner_id)
         category = await cr.get(id=category_id)
         if not category:
             raise Exception("TODO:")
         balances, has_next = await br.get_by_category_and_last_reset(category_id, skip)
-    await cast(Message, clbq.message).edit_caption(
+        total = await CounterRepo(session, owner_id).get(balance_list(category_id))
+    await renderer.render(
+        cast(Message, clbq.message),
         caption=build_detail_message(category, balances),
-        reply_markup=build_detail_kb(category_id, skip, has_next),
+        reply_markup=build_detail_kb(
+            category_id,
+            skip,
+            has_next,
+            total=page_total(total, skip, len(balances), has_next),
+        ),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^balance:history:\d+:\d+$"))
+async def handle_view_full_history(clbq: CallbackQuery, owner_id: int) -> None:
+    _, _, category_id, skip = cast(str, clbq.data).split(":")
+    async with get_session() as session:
+        category = await CategoryRepo(session, owner_id).get(id=int(category_id))
+        if not category:
+            await clbq.answer("Категория не найдена", show_alert=True)
+            return
+        balances, has_next = await BalanceRepo(session, owner_id).get_history(
+            int(category_id), int(skip)
+        )
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=build_detail_message(category, balances, full_history=True),
+        reply_markup=build_detail_kb(
+            int(category_id), int(skip), has_next, prefix="balance:history"
+        ),
+    )
+
+
+def build_periods_message(
+    category: BalanceCategoryModel, snapshots: Sequence[CategoryPeriodSnapshotModel]
+) -> str:
+    msg = [
+        f"🗂 <b>Прошлые периоды:</b> <i>{category.name}</i>",
+        "───────────────",
+    ]
+
+    if not snapshots:
+        msg.append("💤 Лимит ещё ни разу не сбрасывался.")
+    for s in snapshots:
+        limit = f" из {format_amount(s.max_limit)}" if s.max_limit else ""
+        lines = [
+            f"🗓 <b>{s.period_readable}</b>",
+            f"💸 <b>Расход:</b> {format_amount(s.spent)}{limit}",
+            f"💰 <b>Доход:</b> {format_amount(s.income)}",
+            f"🧾 <b>Записей:</b> {s.items}",
+        ]
+        if s.top_tags:
+            lines.append(f"🏷 <b>Теги:</b> {s.top_tags}")
+        msg.append("\n".join(lines))
+        msg.append("───────────────")
+
+    return "\n\n".join(msg)
+
+
+@router.callback_query(F.data.regexp(r"^balance:periods:\d+:\d+$"))
+async def handle_view_periods(clbq: CallbackQuery, owner_id: int) -> None:
+    _, _, category_id, skip = cast(str, clbq.data).split(":")
+    async with get_session() as session:
+        category = await CategoryRepo(session, owner_id).get(id=int(category_id))
+        if not category:
+            await clbq.answer("Категория не найдена", show_alert=True)
+            return
+        snapshots, has_next = await SnapshotRepo(session).get_by_category(
+            int(category_id), int(skip)
+        )
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=build_periods_message(category, snapshots),
+        reply_markup=build_detail_kb(
+            int(category_id), int(skip), has_next, prefix="balance:periods"
+        ),
     )
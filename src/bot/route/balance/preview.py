@@ -6,10 +6,11 @@ from aiogram.types import (
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
 )
 
+from bot.money import format_amount
+from bot.render import renderer
 from config.consts import IMG_DIR
 from db.repository.category import CategoryRepo, CategoryWithLimit
 from db.session import get_session
@@ -31,30 +32,30 @@ def build_balance_message(categories_with_limit: list[CategoryWithLimit]) -> str
 
     lines = []
     # Общая статистика
-    lines.append(f"💰 <b>Всего потрачено:</b> {total_spent:.2f}")
-    lines.append(f"📊 <b>Максимальная сумма для трат:</b> {total_max:.2f}")
-    lines.append(f"💵 <b>Остаток:</b> {total_remaining:.2f}\n")
+    lines.append(f"💰 <b>Всего потрачено:</b> {format_amount(total_spent)}")
+    lines.append(f"📊 <b>Максимальная сумма для трат:</b> {format_amount(total_max)}")
+    lines.append(f"💵 <b>Остаток:</b> {format_amount(total_remaining)}\n")
 
     # По категориям
     for cwl in categories_with_limit:
         name = cwl.category.name
         spent = cwl.limit
         max_limit = cwl.category.max_limit
-        remaining = max_limit - spent if max_limit else None
+        remaining = max_limit - spent if max_limit else 0
 
         lines.append(f"📂 <b>{name}</b>")
 
         if max_limit and max_limit > 0:
             percent = min(spent / max_limit * 100, 100)
-            lines.append(f"<b>Потрачено:</b> {percent:.0f}% ({spent:.2f})")
-            lines.append(f"<b>Максимум:</b> {max_limit:.2f}")
-            lines.append(f"<b>Остаток:</b> {remaining:.2f}")
+            lines.append(f"<b>Потрачено:</b> {percent:.0f}% ({format_amount(spent)})")
+            lines.append(f"<b>Максимум:</b> {format_amount(max_limit)}")
+            lines.append(f"<b>Остаток:</b> {format_amount(remaining)}")
 
             filled = min(int(percent // 10), 10)
             bar = "🟩" * filled + "⬜" * (10 - filled)
             lines.append(bar + "\n")
         else:
-            lines.append(f"<b>Потрачено:</b> {spent:.2f}")
+            lines.append(f"<b>Потрачено:</b> {format_amount(spent)}")
             lines.append("<b>Максимум:</b> ∞")
             lines.append("<b>Остаток:</b> ∞\n")
 
@@ -70,25 +71,28 @@ def build_balance_keyboard() -> InlineKeyboardMarkup:
                     text="👀 Подробно", callback_data="balance:detail:by_category"
                 )
             ],
+            [
+                InlineKeyboardButton(
+                    text="🔁 Регулярные", callback_data="balance:recurring"
+                )
+            ],
             [InlineKeyboardButton(text="<- Назад", callback_data="main")],
         ]
     )
 
 
 @router.callback_query(F.data == "balance")
-async def handle_balance_preview(clbq: CallbackQuery) -> None:
+async def handle_balance_preview(clbq: CallbackQuery, owner_id: int) -> None:
     async with get_session() as session:
-        cr = CategoryRepo(session)
+        cr = CategoryRepo(session, owner_id)
         categories_with_limit = await cr.get_with_cur_limit()
 
     msg = build_balance_message(categories_with_limit)
     kb = build_balance_keyboard()
 
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
-            caption=msg,
-            parse_mode="HTML",
-        ),
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+        caption=msg,
         reply_markup=kb,
     )
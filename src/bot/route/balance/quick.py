@@ -0,0 +1,194 @@
+import html
+import secrets
+from typing import Optional, Sequence, cast
+
+from aiogram import Bot, F, Router
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from magic_filter import RegexpMode
+
+from bot.alerts import add_expense, send_budget_alert
+from bot.money import format_amount
+from bot.quick_entry import (
+    CategoryRef,
+    QuickEntry,
+    QuickEntryError,
+    category_index,
+    parse_quick_entry,
+)
+from bot.render import renderer
+from config.consts import IMG_DIR
+from db.repository.balance import BalanceRepo
+from db.repository.category import CategoryRepo
+from db.repository.tags import TagRepo
+from db.session import transaction
+
+from .add import BTYPE2MESSAGE
+
+router = Router()
+
+QUICK_ENTRY_HINT = (
+    "<b>Быстрый ввод:</b> <code>кафе 350 #еда @Продукты</code>\n"
+    "Доход - со знаком плюс: <code>+5000 зарплата</code>"
+)
+
+
+def build_quick_msg(
+    entry: QuickEntry,
+    category: Optional[CategoryRef],
+    candidates: Sequence[CategoryRef],
+) -> str:
+    if category:
+        category_line = html.escape(category.name)
+    elif candidates:
+        category_line = "выбери ниже 👇"
+        if entry.category:
+            category_line = f"«{html.escape(entry.category)}» - {category_line}"
+    else:
+        category_line = "-"
+    tags = html.escape(", ".join(entry.tags)) if entry.tags else "-"
+    return (
+        "<b>Подтверди запись</b>\n\n"
+        f"📂 Категория: {category_line}\n"
+        f"📑 Название: {html.escape(entry.name)}\n"
+        f"💵 Сумма: {format_amount(entry.amount)}\n"
+        f"📊 Тип: {BTYPE2MESSAGE[entry.balance_type]}\n"
+        f"🏷 Теги: {tags}"
+    )
+
+
+def build_quick_kb(
+    nonce: str, category: Optional[CategoryRef], candidates: Sequence[CategoryRef]
+) -> InlineKeyboardMarkup:
+    """
+    Одно нажатие: подтверждение или выбор категории, который и сохраняет.
+    `nonce` привязывает кнопки к этому превью
+    """
+    builder = InlineKeyboardBuilder()
+    if category or not candidates:
+        builder.row(
+            InlineKeyboardButton(
+                text="✅ Добавить",
+                callback_data=f"balance:quick:{nonce}:{category.id if category else 0}",
+            )
+        )
+    else:
+        for c in candidates:
+            builder.row(
+                InlineKeyboardButton(
+                    text=f"📂 {c.name}", callback_data=f"balance:quick:{nonce}:{c.id}"
+                )
+            )
+    builder.row(
+        InlineKeyboardButton(text="❌ Отменить", callback_data="balance:cancel")
+    )
+    return builder.as_markup()
+
+
+async def resolve_category(
+    owner_id: int, query: Optional[str]
+) -> tuple[Optional[CategoryRef], list[CategoryRef]]:
+    """
+    Категория записи и варианты для выбора. Без `@` подставляется
+    единственная категория владельца; не найденная - выбирается из всех.
+    """
+    categories = await category_index.refs(owner_id)
+    candidates = await category_index.match(owner_id, query) if query else []
+    candidates = candidates or categories
+    if len(candidates) == 1:
+        return candidates[0], candidates
+    return None, candidates
+
+
+@router.message(
+    StateFilter(None),
+    F.text.regexp(r"\d", mode=RegexpMode.SEARCH),
+    ~F.text.startswith("/"),
+    ~F.text.contains("\n"),
+)
+async def handle_quick_entry(
+    message: Message, state: FSMContext, owner_id: int
+) -> None:
+    try:
+        entry = parse_quick_entry(cast(str, message.text))
+    except QuickEntryError as e:
+        await renderer.answer(
+            message,
+            media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+            caption=f"❌ {e}\n\n{QUICK_ENTRY_HINT}",
+        )
+        return
+
+    category, candidates = await resolve_category(owner_id, entry.category)
+    # Новое превью заменяет прежнее: кнопки старых превью больше не сохраняют
+    nonce = secrets.token_hex(4)
+    await state.update_data(quick=entry._asdict(), quick_nonce=nonce)
+    await renderer.answer(
+        message,
+        media=FSInputFile(IMG_DIR / "balanceImg.jpeg"),
+        caption=build_quick_msg(entry, category, candidates),
+        reply_markup=build_quick_kb(nonce, category, candidates),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^balance:quick:[0-9a-f]+:\d+$"))
+async def handle_quick_confirm(
+    clbq: CallbackQuery, state: FSMContext, owner_id: int
+) -> None:
+    _, _, nonce, raw_category_id = cast(str, clbq.data).split(":")
+    data = await state.get_data()
+    raw = data.get("quick")
+    if not raw or data.get("quick_nonce") != nonce:
+        await clbq.answer("Запись устарела, отправь её ещё раз", show_alert=True)
+        return
+    entry = QuickEntry(**raw)
+    category_id = int(raw_category_id) or None
+
+    alert = None
+    # Ответ Telegram - только после выхода из транзакции: писатель SQLite
+    # один на все чаты, и сетевой запрос не должен держать пачку открытой
+    async with transaction() as trx:
+        found = (
+            category_id is None
+            or await CategoryRepo(trx, owner_id).get(id=category_id) is not None
+        )
+        if found:
+            tags = await TagRepo(trx).get_or_create_many(entry.tags)
+            await BalanceRepo(trx, owner_id).create(
+                name=entry.name,
+                amount=entry.amount,
+                balance_type=entry.balance_type,
+                category_id=category_id,
+                tags=tags,
+            )
+            if entry.balance_type == "expense" and category_id:
+                alert = await add_expense(trx, owner_id, category_id, entry.amount)
+    if not found:
+        category_index.invalidate(owner_id)
+        await clbq.answer("❌ Категория не найдена", show_alert=True)
+        return
+
+    await state.clear()
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption=(
+            f"✅ {BTYPE2MESSAGE[entry.balance_type]}: {html.escape(entry.name)} "
+            f"{format_amount(entry.amount)}"
+        ),
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="💰 Баланс", callback_data="balance")],
+                [InlineKeyboardButton(text="🏠 Домой", callback_data="main")],
+            ]
+        ),
+    )
+    if alert:
+        await send_budget_alert(cast(Bot, clbq.bot), alert)
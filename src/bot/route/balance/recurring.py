@@ -0,0 +1,75 @@
+from typing import Sequence, cast
+
+from aiogram import F, Router
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+
+from bot.money import format_amount
+from bot.render import renderer
+from db.models import RecurringModel
+from db.repository.recurring import RecurringRepo
+from db.session import get_session, transaction
+from scheduler.recurring import recurring_scheduler
+
+router = Router()
+
+
+def build_recurring_message(templates: Sequence[RecurringModel]) -> str:
+    msg = ["🔁 <b>Регулярные записи</b>", "───────────────"]
+    if not templates:
+        msg.append(
+            "💤 Пока пусто. Запись становится регулярной кнопкой 🔁 при подтверждении."
+        )
+    for t in templates:
+        category = t.category.name if t.category else "-"
+        msg.append(
+            f"💡 <b>{t.name}</b>\n"
+            f"💰 <b>Сумма:</b> {format_amount(t.amount)}\n"
+            f"📂 <b>Категория:</b> {category}\n"
+            f"🔁 <b>Повтор:</b> {t.schedule_readable}\n"
+            f"⏭ <b>Следующая:</b> {t.next_run_readable}"
+        )
+        msg.append("───────────────")
+    return "\n\n".join(msg)
+
+
+def build_recurring_kb(templates: Sequence[RecurringModel]) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for t in templates:
+        builder.row(
+            InlineKeyboardButton(
+                text=f"🗑 {t.name}", callback_data=f"balance:recurring:delete:{t.id}"
+            )
+        )
+    builder.row(InlineKeyboardButton(text="<- Назад", callback_data="balance"))
+    return builder.as_markup()
+
+
+async def render_recurring(message: Message, owner_id: int) -> None:
+    async with get_session() as session:
+        templates = await RecurringRepo(session, owner_id).get_all()
+    await renderer.render(
+        message,
+        caption=build_recurring_message(templates),
+        reply_markup=build_recurring_kb(templates),
+    )
+
+
+@router.callback_query(F.data == "balance:recurring")
+async def handle_view_recurring(clbq: CallbackQuery, owner_id: int) -> None:
+    await render_recurring(cast(Message, clbq.message), owner_id)
+
+
+@router.callback_query(F.data.regexp(r"^balance:recurring:delete:\d+$"))
+async def handle_delete_recurring(clbq: CallbackQuery, owner_id: int) -> None:
+    rid = int(cast(str, clbq.data).split(":")[-1])
+    async with transaction() as session:
+        await RecurringRepo(session, owner_id).delete(rid)
+    recurring_scheduler.reload()
+    await clbq.answer("Повтор отключён, созданные записи остались")
+    await render_recurring(cast(Message, clbq.message), owner_id)
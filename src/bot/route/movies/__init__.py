@@ -1,10 +1,11 @@
 import aiogram
 
 from .preview import router as pr
+from .random import router as rndr
 from .want import router as wr
 from .watched import router as wtcr
 
 router = aiogram.Router()
-router.include_routers(wr, pr, wtcr)
+router.include_routers(wr, pr, rndr, wtcr)
 
 __all__ = ["router"]
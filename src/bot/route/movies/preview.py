@@ -6,10 +6,11 @@ from aiogram.types import (
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
 )
 
+from bot.render import renderer
+from bot.views import CARD, build_view_toggle_row, view_modes
 from config.consts import IMG_DIR
 
 router = Router()
@@ -26,7 +27,7 @@ def build_movie_preview_msg() -> str:
     )
 
 
-def build_movie_preview_kb() -> InlineKeyboardMarkup:
+def build_movie_preview_kb(view_mode: str = CARD) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -39,6 +40,12 @@ def build_movie_preview_kb() -> InlineKeyboardMarkup:
                     text="✅ Просмотренные", callback_data="movies:watched:0"
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    text="🎲 Выбрать за меня", callback_data="movies:random"
+                ),
+            ],
+            build_view_toggle_row("movies", view_mode),
             [InlineKeyboardButton(text="<- Назад", callback_data="main")],
         ]
     )
@@ -46,11 +53,22 @@ def build_movie_preview_kb() -> InlineKeyboardMarkup:
 
 @router.callback_query(F.data == "movies")
 async def handle_movies_preview(clbq: CallbackQuery) -> None:
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-            caption=build_movie_preview_msg(),
-            parse_mode="HTML",
-        ),
-        reply_markup=build_movie_preview_kb(),
+    view_mode = await view_modes.get(clbq.from_user.id)
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_movie_preview_msg(),
+        reply_markup=build_movie_preview_kb(view_mode),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^movies:view:(card|list)$"))
+async def handle_movies_view_mode(clbq: CallbackQuery) -> None:
+    view_mode = cast(str, clbq.data).split(":")[-1]
+    await view_modes.set(clbq.from_user.id, view_mode)
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_movie_preview_msg(),
+        reply_markup=build_movie_preview_kb(view_mode),
     )
@@ -0,0 +1,72 @@
+from typing import Collection, Optional, cast
+
+from aiogram import F, Router
+from aiogram.types import (
+    CallbackQuery,
+    FSInputFile,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+)
+
+from bot.picks import YEAR_RANGES, build_year_range_rows, pick_fresh, recent_picks
+from bot.render import renderer
+from config.consts import IMG_DIR
+from db.models import MovieModel
+from db.repository.movies import MoviesRepository
+from db.session import get_session
+
+from .want.preview import build_movie_msg
+
+router = Router()
+
+
+def build_random_movie_kb(
+    movie_id: Optional[int], year_range: str
+) -> InlineKeyboardMarkup:
+    rows = build_year_range_rows("movies:random", year_range)
+    if movie_id:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text="✅ Просмотренно",
+                    callback_data=f"movies:want:watched:{movie_id}",
+                )
+            ]
+        )
+    rows.append([InlineKeyboardButton(text="<- Назад", callback_data="movies")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+@router.callback_query(F.data.regexp(r"^movies:random(:\w+)?$"))
+async def handle_random_movie(clbq: CallbackQuery, owner_id: int) -> None:
+    data = cast(str, clbq.data).split(":")
+    year_range = data[2] if len(data) == 3 and data[2] in YEAR_RANGES else "any"
+    label, year_from, year_to = YEAR_RANGES[year_range]
+    message = cast(Message, clbq.message)
+
+    async with get_session() as session:
+        repo = MoviesRepository(session, owner_id)
+
+        async def pick(exclude: Collection[int]) -> Optional[MovieModel]:
+            return await repo.pick_unwatched(year_from, year_to, exclude)
+
+        movie = await pick_fresh(
+            recent_picks.get(message.chat.id, "movies"), pick, lambda m: m.id
+        )
+
+    if movie is None:
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption=f"Нет фильмов в списке 📭 ({label.lower()})",
+            reply_markup=build_random_movie_kb(None, year_range),
+        )
+        return
+
+    await renderer.render(
+        message,
+        media=movie.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=f"🎲 Случайный выбор\n\n{build_movie_msg(movie)}",
+        reply_markup=build_random_movie_kb(movie.id, year_range),
+    )
@@ -1,6 +1,6 @@
 from typing import cast
 
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import (
@@ -8,14 +8,15 @@ from aiogram.types import (
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
-    PhotoSize,
 )
 
+from bot.posters import Poster, dedupe_poster, poster_cache, poster_from_photo
+from bot.render import renderer
 from config.consts import IMG_DIR
+from db.models import MovieModel
 from db.repository.movies import MoviesRepository
-from db.session import transaction
+from db.session import get_session, transaction
 
 router = Router()
 
@@ -29,32 +30,83 @@ class AddMovieFSM(StatesGroup):
 
 @router.callback_query(F.data == "movies:want:add")
 async def start_add_movie(clbq: CallbackQuery, state: FSMContext) -> None:
-    await cast(Message, clbq.message).edit_media(
-        media=InputMediaPhoto(
-            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-            caption="🎬 Введите название фильма:",
-            parse_mode="HTML",
-        )
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption="🎬 Введите название фильма:",
     )
     await state.set_state(AddMovieFSM.waiting_title)
 
 
+def build_duplicate_kb() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="❌ Не добавлять", callback_data="movies:want:add:cancel"
+                )
+            ]
+        ]
+    )
+
+
+def build_duplicate_msg(movie: MovieModel, exact: bool) -> str:
+    head = "Этот фильм уже в списке" if exact else "Похожий фильм уже в списке"
+    return f"⚠️ {head}: <b>{movie.title}</b> ({movie.year}, {movie.status.lower()})"
+
+
+async def find_duplicate(
+    owner_id: int, title: str, year: int | None = None
+) -> MovieModel | None:
+    async with get_session() as session:
+        return await MoviesRepository(session, owner_id).find_duplicate(title, year)
+
+
+@router.callback_query(F.data == "movies:want:add:cancel")
+async def cancel_add_movie(clbq: CallbackQuery, state: FSMContext) -> None:
+    await state.clear()
+    await cast(Message, clbq.message).edit_text(
+        "❌ Добавление фильма отменено.",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text="<- Назад", callback_data="movies")]
+            ]
+        ),
+    )
+
+
 @router.message(F.text, AddMovieFSM.waiting_title)
-async def process_title(msg: Message, state: FSMContext) -> None:
+async def process_title(msg: Message, state: FSMContext, owner_id: int) -> None:
     title = cast(str, msg.text).strip()
-    await state.update_data(title=title)
+    duplicate = await find_duplicate(owner_id, title)
+    # Без совпадения по названию год проверять незачем
+    await state.update_data(title=title, maybe_duplicate=duplicate is not None)
+    if duplicate:
+        await msg.answer(
+            build_duplicate_msg(duplicate, exact=False),
+            reply_markup=build_duplicate_kb(),
+        )
     await msg.answer("📅 Введите год выпуска фильма (например, 2023):")
     await state.set_state(AddMovieFSM.waiting_year)
 
 
 @router.message(F.text, AddMovieFSM.waiting_year)
-async def process_year(msg: Message, state: FSMContext) -> None:
+async def process_year(msg: Message, state: FSMContext, owner_id: int) -> None:
     text = cast(str, msg.text).strip()
     if not text.isdigit() or len(text) != 4:
         await msg.answer("❌ Год должен быть числом из 4 цифр. Попробуйте снова:")
         return
     await state.update_data(year=int(text))
 
+    data = await state.get_data()
+    if data.get("maybe_duplicate"):
+        duplicate = await find_duplicate(owner_id, data["title"], int(text))
+        if duplicate:
+            await msg.answer(
+                build_duplicate_msg(duplicate, exact=True),
+                reply_markup=build_duplicate_kb(),
+            )
+
     keyboard = InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -107,19 +159,26 @@ async def process_description(msg: Message, state: FSMContext) -> None:
 
 
 @router.callback_query(F.data == "add_movie_skip_poster", AddMovieFSM.waiting_poster)
-async def skip_poster(clbq: CallbackQuery, state: FSMContext) -> None:
-    await add_movie_finalize(cast(Message, clbq.message), state, poster=None)
+async def skip_poster(clbq: CallbackQuery, state: FSMContext, owner_id: int) -> None:
+    await add_movie_finalize(
+        cast(Message, clbq.message), state, poster=None, owner_id=owner_id
+    )
     await clbq.answer()
 
 
 @router.message(AddMovieFSM.waiting_poster, F.content_type == "photo")
-async def process_poster(msg: Message, state: FSMContext) -> None:
-    poster_id = cast(list[PhotoSize], msg.photo)[-1].file_id
-    await add_movie_finalize(msg, state, poster=poster_id)
+async def process_poster(
+    msg: Message, state: FSMContext, bot: Bot, owner_id: int
+) -> None:
+    poster = poster_from_photo(msg.photo)
+    if poster:
+        poster = await dedupe_poster(owner_id, poster)
+        poster_cache.warm(bot, poster)
+    await add_movie_finalize(msg, state, poster=poster, owner_id=owner_id)
 
 
 async def add_movie_finalize(
-    msg: Message, state: FSMContext, poster: str | None
+    msg: Message, state: FSMContext, poster: Poster | None, owner_id: int
 ) -> None:
     data = await state.get_data()
     title = data["title"]
@@ -127,22 +186,23 @@ async def add_movie_finalize(
     description = data.get("description")
 
     async with transaction() as session:
-        repo = MoviesRepository(session)
+        repo = MoviesRepository(session, owner_id)
         await repo.create(
             title=title,
             year=year,
             description=description,
-            poster=poster,
+            poster=poster.file_id if poster else None,
+            poster_unique_id=poster.unique_id if poster else None,
         )
 
-    await msg.answer_photo(
-        photo=FSInputFile(IMG_DIR / "movieImg.jpg"),
+    await renderer.answer(
+        msg,
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
         caption=f"✅ Фильм <b>{title}</b> успешно добавлен!",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
                 [InlineKeyboardButton(text="<- Назад", callback_data="movies")]
             ]
         ),
-        parse_mode="HTML",
     )
     await state.clear()
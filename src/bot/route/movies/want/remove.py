@@ -9,6 +9,7 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.render import renderer
 from db.repository.movies import MoviesRepository
 from db.session import transaction
 
@@ -28,20 +29,23 @@ async def handle_request_remove(clbq: CallbackQuery) -> None:
         InlineKeyboardButton(text="❌ Отмена", callback_data="movies"),
     )
 
-    await cast(Message, clbq.message).edit_caption(
-        caption="Подтвердите удаление фильма", reply_markup=builder.as_markup()
+    await renderer.render(
+        cast(Message, clbq.message),
+        caption="Подтвердите удаление фильма",
+        reply_markup=builder.as_markup(),
     )
 
 
 @router.callback_query(F.data.regexp(r"^movies:want:confirm_remove:\d+$"))
-async def handle_confirm_remove(clbq: CallbackQuery) -> None:
+async def handle_confirm_remove(clbq: CallbackQuery, owner_id: int) -> None:
     movie_id = int(cast(str, clbq.data).split(":")[-1])
 
     async with transaction() as session:
-        repo = MoviesRepository(session)
+        repo = MoviesRepository(session, owner_id)
         await repo.delete(movie_id)
 
-    await cast(Message, clbq.message).edit_caption(
+    await renderer.render(
+        cast(Message, clbq.message),
         caption="✅ Фильм удален",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
@@ -1,21 +1,35 @@
-from typing import cast
+from typing import Optional, cast
 
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.types import (
     CallbackQuery,
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.paging import build_page_rows, page_total
+from bot.posters import poster_cache, stored_poster
+from bot.render import renderer
+from bot.views import (
+    LIST,
+    LIST_PAGE_LIMIT,
+    build_back_to_list_row,
+    build_list_msg,
+    build_list_rows,
+    list_page_skip,
+    view_modes,
+)
 from config.consts import IMG_DIR
 from db.models import MovieModel
+from db.repository.counter import CounterRepo, movies_list
 from db.repository.movies import MoviesRepository
 from db.session import get_session
 
+from .want.preview import build_movie_list_line
+
 router = Router()
 PAGE_LIMIT = 1
 
@@ -30,34 +44,19 @@ def build_movie_msg(movie: MovieModel) -> str:
     )
 
 
-def build_movie_kb(skip: int, has_next: bool) -> InlineKeyboardMarkup:
+def build_movie_kb(
+    skip: int,
+    has_next: bool,
+    total: Optional[int] = None,
+    *,
+    from_list: bool = False,
+) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-
-    current_page = (skip // PAGE_LIMIT) + 1
-
-    # Кнопка "назад"
-    if skip > 0:
-        builder.add(
-            InlineKeyboardButton(
-                text="◀️",
-                callback_data=f"movies:watched:{max(skip - PAGE_LIMIT, 0)}",
-            )
-        )
+    if from_list:
+        builder.row(*build_back_to_list_row("movies:watched", skip))
     else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
-
-    builder.add(InlineKeyboardButton(text=f"{current_page}", callback_data="..."))
-
-    # Кнопка "вперёд"
-    if has_next:
-        builder.add(
-            InlineKeyboardButton(
-                text="▶️",
-                callback_data=f"movies:watched:{skip + PAGE_LIMIT}",
-            )
-        )
-    else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
+        for row in build_page_rows("movies:watched", skip, PAGE_LIMIT, has_next, total):
+            builder.row(*row)
 
     # Ряд ниже — возврат
     builder.row(InlineKeyboardButton(text="<- Назад", callback_data="movies"))
@@ -65,20 +64,77 @@ def build_movie_kb(skip: int, has_next: bool) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+def build_movie_list_kb(
+    skip: int, shown: int, has_next: bool, total: Optional[int]
+) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for row in build_list_rows("movies:watched", skip, shown, has_next, total):
+        builder.row(*row)
+    builder.row(InlineKeyboardButton(text="<- Назад", callback_data="movies"))
+    return builder.as_markup()
+
+
 @router.callback_query(F.data.regexp(r"^movies:watched:\d+$"))
-async def handle_watched(clbq: CallbackQuery) -> None:
+async def handle_watched(clbq: CallbackQuery, owner_id: int) -> None:
+    skip = int(cast(str, clbq.data).split(":")[-1])
+    if await view_modes.get(clbq.from_user.id) == LIST:
+        await show_watched_list(cast(Message, clbq.message), owner_id, skip)
+    else:
+        await show_watched_card(cast(Message, clbq.message), owner_id, skip)
+
+
+@router.callback_query(F.data.regexp(r"^movies:watched:card:\d+$"))
+async def handle_watched_card(clbq: CallbackQuery, owner_id: int) -> None:
     skip = int(cast(str, clbq.data).split(":")[-1])
+    await show_watched_card(cast(Message, clbq.message), owner_id, skip, from_list=True)
+
+
+async def show_watched_list(message: Message, owner_id: int, skip: int) -> None:
+    skip = list_page_skip(skip)
+    async with get_session() as session:
+        mv = MoviesRepository(session, owner_id)
+        movies, has_next = await mv.get_by_is_watched(True, skip, LIST_PAGE_LIMIT)
+        total = await CounterRepo(session, owner_id).get(movies_list(True))
+
+    if not movies:
+        await show_watched_card(message, owner_id, skip)
+        return
+
+    sheet = await poster_cache.sheet(
+        cast(Bot, message.bot),
+        [stored_poster(movie.poster, movie.poster_unique_id) for movie in movies],
+        skip + 1,
+    )
+    await renderer.render(
+        message,
+        media=sheet or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_list_msg(
+            "✅ <b>Просмотренные</b>",
+            [build_movie_list_line(movie) for movie in movies],
+            skip,
+        ),
+        reply_markup=build_movie_list_kb(
+            skip,
+            len(movies),
+            has_next,
+            page_total(total, skip, len(movies), has_next),
+        ),
+    )
+
+
+async def show_watched_card(
+    message: Message, owner_id: int, skip: int, from_list: bool = False
+) -> None:
     async with get_session() as session:
-        mv = MoviesRepository(session)
+        mv = MoviesRepository(session, owner_id)
         movies, has_next = await mv.get_by_is_watched(True, skip, PAGE_LIMIT)
+        total = await CounterRepo(session, owner_id).get(movies_list(True))
 
     if len(movies) != 1:
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption="Нет просмотренных фильмов 📭",
-                parse_mode="HTML",
-            ),
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption="Нет просмотренных фильмов 📭",
             reply_markup=build_movie_kb(skip, False),
         )
         return
@@ -86,11 +142,14 @@ async def handle_watched(clbq: CallbackQuery) -> None:
     movie: MovieModel = movies[-1]
 
     poster = movie.poster if movie.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=poster,
-            caption=build_movie_msg(movie),
-            parse_mode="HTML",
+    await renderer.render(
+        message,
+        media=poster,
+        caption=build_movie_msg(movie),
+        reply_markup=build_movie_kb(
+            skip,
+            has_next,
+            page_total(total, skip, len(movies), has_next),
+            from_list=from_list,
         ),
-        reply_markup=build_movie_kb(skip, has_next),
     )
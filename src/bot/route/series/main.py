@@ -1,6 +1,6 @@
-from typing import Optional, cast
+from typing import Awaitable, Callable, Collection, NamedTuple, Optional, cast
 
-from aiogram import F, Router
+from aiogram import Bot, F, Router
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import (
@@ -8,19 +8,41 @@ from aiogram.types import (
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.callback import Nav, actions
+from bot.paging import build_page_rows, page_total
+from bot.picks import YEAR_RANGES, build_year_range_rows, pick_fresh, recent_picks
+from bot.posters import dedupe_poster, poster_cache, poster_from_photo, stored_poster
+from bot.render import renderer
+from bot.views import (
+    CARD,
+    LIST,
+    LIST_PAGE_LIMIT,
+    build_back_to_list_row,
+    build_list_msg,
+    build_list_rows,
+    build_view_toggle_row,
+    list_page_skip,
+    short_title,
+    view_modes,
+)
 from config.consts import IMG_DIR
 from db.models import SeriesModel
+from db.repository.counter import CounterRepo
 from db.repository.series import SeriesRepository
-from db.session import get_session
+from db.session import get_session, transaction
 
 router = Router()
 PAGE_LIMIT = 1
 
+# +1 эпизод/сезон: кнопка помнит позицию карточки, чтобы не сбрасывать навигацию
+SERIES_PROGRESS = actions.register(
+    1, "series:progress", series_id=int, season=bool, skip=int, from_list=bool
+)
+
 
 class AddSeries(StatesGroup):
     title = State()
@@ -57,7 +79,7 @@ def format_series_message(series: SeriesModel, status_text: str) -> str:
     )
 
 
-def build_series_preview_kb() -> InlineKeyboardMarkup:
+def build_series_preview_kb(view_mode: str = CARD) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
         inline_keyboard=[
             [
@@ -75,11 +97,17 @@ def build_series_preview_kb() -> InlineKeyboardMarkup:
                     text="✅ Просмотренные", callback_data="series:watched:0"
                 ),
             ],
+            [
+                InlineKeyboardButton(
+                    text="🎲 Выбрать за меня", callback_data="series:random"
+                ),
+            ],
             [
                 InlineKeyboardButton(
                     text="➕ Добавить сериал", callback_data="series:want:add"
                 )
             ],
+            build_view_toggle_row("series", view_mode),
             [InlineKeyboardButton(text="<- Назад", callback_data="main")],
         ]
     )
@@ -104,44 +132,39 @@ def build_series_kb_with_actions(
     series_id: Optional[int] = None,
     series_watch_status: Optional[str] = None,
     include_back: bool = True,
+    *,
+    total: Optional[int] = None,
+    from_list: bool = False,
 ) -> InlineKeyboardMarkup:
     builder = InlineKeyboardBuilder()
-    current_page = (skip // PAGE_LIMIT) + 1
-
-    if skip > 0:
-        builder.add(
-            InlineKeyboardButton(
-                text="◀️",
-                callback_data=f"{callback_prefix}:{max(skip - PAGE_LIMIT, 0)}",
-            )
-        )
+    if from_list:
+        builder.row(*build_back_to_list_row(callback_prefix, skip))
     else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
-
-    builder.add(InlineKeyboardButton(text=f"{current_page}", callback_data="..."))
-
-    if has_next:
-        builder.add(
-            InlineKeyboardButton(
-                text="▶️",
-                callback_data=f"{callback_prefix}:{skip + PAGE_LIMIT}",
-            )
-        )
-    else:
-        builder.add(InlineKeyboardButton(text="...", callback_data="..."))
+        for row in build_page_rows(callback_prefix, skip, PAGE_LIMIT, has_next, total):
+            builder.row(*row)
 
     if series_id:
         if series_watch_status == "watching":
             builder.row(
                 InlineKeyboardButton(
                     text="➕ +1 эпизод",
-                    callback_data=f"series:watching:next_episode:{series_id}",
+                    callback_data=SERIES_PROGRESS.pack(
+                        series_id=series_id,
+                        season=False,
+                        skip=skip,
+                        from_list=from_list,
+                    ),
                 )
             )
             builder.row(
                 InlineKeyboardButton(
                     text="➕ +1 сезон",
-                    callback_data=f"series:watching:next_season:{series_id}",
+                    callback_data=SERIES_PROGRESS.pack(
+                        series_id=series_id,
+                        season=True,
+                        skip=skip,
+                        from_list=from_list,
+                    ),
                 )
             )
             builder.row(
@@ -203,24 +226,42 @@ def build_add_series_msg(field: str) -> str:
 
 @router.callback_query(F.data == "series")
 async def handle_series_preview(clbq: CallbackQuery) -> None:
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-            caption=build_series_preview_msg(),
-            parse_mode="HTML",
-        ),
-        reply_markup=build_series_preview_kb(),
+    view_mode = await view_modes.get(clbq.from_user.id)
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_series_preview_msg(),
+        reply_markup=build_series_preview_kb(view_mode),
+    )
+
+
+@router.callback_query(F.data.regexp(r"^series:view:(card|list)$"))
+async def handle_series_view_mode(clbq: CallbackQuery) -> None:
+    view_mode = cast(str, clbq.data).split(":")[-1]
+    await view_modes.set(clbq.from_user.id, view_mode)
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_series_preview_msg(),
+        reply_markup=build_series_preview_kb(view_mode),
     )
 
 
 @router.callback_query(F.data.regexp(r"^series:want:\d+$"))
-async def handle_wanted_series(clbq: CallbackQuery) -> None:
+async def handle_wanted_series(clbq: CallbackQuery, owner_id: int) -> None:
     skip = int(cast(str, clbq.data).split(":")[-1])
+    await show_series(clbq, owner_id, "series:want", skip)
+
+
+async def show_wanted_series(
+    message: Message, owner_id: int, skip: int, from_list: bool = False
+) -> None:
     async with get_session() as session:
-        sr = SeriesRepository(session)
+        sr = SeriesRepository(session, owner_id)
         series_list, has_next = await sr.get_by_watch_status(
             "planned", skip, PAGE_LIMIT
         )
+        total = await CounterRepo(session, owner_id).get("series:planned")
 
     if len(series_list) == 0:
         builder = InlineKeyboardBuilder()
@@ -231,15 +272,11 @@ async def handle_wanted_series(clbq: CallbackQuery) -> None:
         )
         builder.add(InlineKeyboardButton(text="<- Назад", callback_data="series"))
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption=(
-                    "📭 В списке 'Хочу посмотреть' пока пусто\n\n"
-                    "Хочешь добавить первый сериал?"
-                ),
-                parse_mode="HTML",
-            ),
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption="📭 В списке 'Хочу посмотреть' пока пусто\n\n"
+            "Хочешь добавить первый сериал?",
             reply_markup=builder.as_markup(),
         )
         return
@@ -247,12 +284,10 @@ async def handle_wanted_series(clbq: CallbackQuery) -> None:
     series: SeriesModel = series_list[0]
     poster = series.poster if series.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
 
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=poster,
-            caption=build_series_list_msg(series),
-            parse_mode="HTML",
-        ),
+    await renderer.render(
+        message,
+        media=poster,
+        caption=build_series_list_msg(series),
         reply_markup=build_series_kb_with_actions(
             "series:want",
             skip,
@@ -260,26 +295,84 @@ async def handle_wanted_series(clbq: CallbackQuery) -> None:
             series.id,
             series.watch_status,
             include_back=True,
+            total=page_total(total, skip, len(series_list), has_next),
+            from_list=from_list,
         ),
     )
 
 
+def build_random_series_kb(
+    series_id: Optional[int], year_range: str
+) -> InlineKeyboardMarkup:
+    rows = build_year_range_rows("series:random", year_range)
+    if series_id:
+        rows.append(
+            [
+                InlineKeyboardButton(
+                    text="📺 Начать просмотр",
+                    callback_data=f"series:want:watching:{series_id}",
+                )
+            ]
+        )
+    rows.append([InlineKeyboardButton(text="<- Назад", callback_data="series")])
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+@router.callback_query(F.data.regexp(r"^series:random(:\w+)?$"))
+async def handle_random_series(clbq: CallbackQuery, owner_id: int) -> None:
+    data = cast(str, clbq.data).split(":")
+    year_range = data[2] if len(data) == 3 and data[2] in YEAR_RANGES else "any"
+    label, year_from, year_to = YEAR_RANGES[year_range]
+    message = cast(Message, clbq.message)
+
+    async with get_session() as session:
+        sr = SeriesRepository(session, owner_id)
+
+        async def pick(exclude: Collection[int]) -> Optional[SeriesModel]:
+            return await sr.pick_planned(year_from, year_to, exclude)
+
+        series = await pick_fresh(
+            recent_picks.get(message.chat.id, "series"), pick, lambda s: s.id
+        )
+
+    if series is None:
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption=f"📭 В списке 'Хочу посмотреть' пусто ({label.lower()})",
+            reply_markup=build_random_series_kb(None, year_range),
+        )
+        return
+
+    await renderer.render(
+        message,
+        media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=f"🎲 Случайный выбор\n\n{build_series_list_msg(series)}",
+        reply_markup=build_random_series_kb(series.id, year_range),
+    )
+
+
 @router.callback_query(F.data.regexp(r"^series:currently_watching:\d+$"))
-async def handle_currently_watching_series(clbq: CallbackQuery) -> None:
+async def handle_currently_watching_series(clbq: CallbackQuery, owner_id: int) -> None:
     skip = int(cast(str, clbq.data).split(":")[-1])
+    await show_series(clbq, owner_id, "series:currently_watching", skip)
+
+
+async def show_currently_watching_series(
+    message: Message, owner_id: int, skip: int, from_list: bool = False
+) -> None:
     async with get_session() as session:
-        sr = SeriesRepository(session)
+        sr = SeriesRepository(session, owner_id)
         series_list, has_next = await sr.get_by_watch_status(
             "watching", skip, PAGE_LIMIT
         )
+        total = await CounterRepo(session, owner_id).get("series:watching")
 
     if len(series_list) == 0:
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption="Нет сериалов в статусе 'Смотрю' 📭",
-                parse_mode="HTML",
-            ),
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption="Нет сериалов в статусе 'Смотрю' 📭",
             reply_markup=build_series_kb_with_actions(
                 "series:currently_watching", skip, False, include_back=True
             ),
@@ -289,12 +382,10 @@ async def handle_currently_watching_series(clbq: CallbackQuery) -> None:
     series: SeriesModel = series_list[0]
     poster = series.poster if series.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
 
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=poster,
-            caption=build_currently_watching_msg(series),
-            parse_mode="HTML",
-        ),
+    await renderer.render(
+        message,
+        media=poster,
+        caption=build_currently_watching_msg(series),
         reply_markup=build_series_kb_with_actions(
             "series:currently_watching",
             skip,
@@ -302,24 +393,31 @@ async def handle_currently_watching_series(clbq: CallbackQuery) -> None:
             series.id,
             series.watch_status,
             include_back=True,
+            total=page_total(total, skip, len(series_list), has_next),
+            from_list=from_list,
         ),
     )
 
 
 @router.callback_query(F.data.regexp(r"^series:watched:\d+$"))
-async def handle_watched_series(clbq: CallbackQuery) -> None:
+async def handle_watched_series(clbq: CallbackQuery, owner_id: int) -> None:
     skip = int(cast(str, clbq.data).split(":")[-1])
+    await show_series(clbq, owner_id, "series:watched", skip)
+
+
+async def show_watched_series(
+    message: Message, owner_id: int, skip: int, from_list: bool = False
+) -> None:
     async with get_session() as session:
-        sr = SeriesRepository(session)
+        sr = SeriesRepository(session, owner_id)
         series_list, has_next = await sr.get_by_is_watched(True, skip, PAGE_LIMIT)
+        total = await CounterRepo(session, owner_id).get("series:watched")
 
     if len(series_list) == 0:
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption="Нет просмотренных сериалов 📭",
-                parse_mode="HTML",
-            ),
+        await renderer.render(
+            message,
+            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+            caption="Нет просмотренных сериалов 📭",
             reply_markup=build_series_kb_with_actions(
                 "series:watched", skip, False, include_back=True
             ),
@@ -329,12 +427,10 @@ async def handle_watched_series(clbq: CallbackQuery) -> None:
     series: SeriesModel = series_list[0]
     poster = series.poster if series.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
 
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=poster,
-            caption=build_watched_msg(series),
-            parse_mode="HTML",
-        ),
+    await renderer.render(
+        message,
+        media=poster,
+        caption=build_watched_msg(series),
         reply_markup=build_series_kb_with_actions(
             "series:watched",
             skip,
@@ -342,7 +438,113 @@ async def handle_watched_series(clbq: CallbackQuery) -> None:
             series.id,
             series.watch_status,
             include_back=True,
+            total=page_total(total, skip, len(series_list), has_next),
+            from_list=from_list,
+        ),
+    )
+
+
+class SeriesList(NamedTuple):
+    header: str
+    # Список по статусу; без статуса - все просмотренные
+    watch_status: Optional[str]
+    counter: str
+    show_card: Callable[[Message, int, int, bool], Awaitable[None]]
+
+
+SERIES_LISTS: dict[str, SeriesList] = {
+    "series:want": SeriesList(
+        "📌 <b>Хочу посмотреть</b>", "planned", "series:planned", show_wanted_series
+    ),
+    "series:currently_watching": SeriesList(
+        "📺 <b>Смотрю</b>",
+        "watching",
+        "series:watching",
+        show_currently_watching_series,
+    ),
+    "series:watched": SeriesList(
+        "✅ <b>Просмотренные</b>", None, "series:watched", show_watched_series
+    ),
+}
+
+
+def build_series_list_line(series: SeriesModel) -> str:
+    line = f"{short_title(series.title)} <i>({series.year})</i>"
+    if series.watch_status == "watching":
+        line += f" · S{series.season_current or 1}E{series.episode_current or 1}"
+    return line
+
+
+def build_series_list_kb(
+    prefix: str, skip: int, shown: int, has_next: bool, total: Optional[int]
+) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    for row in build_list_rows(prefix, skip, shown, has_next, total):
+        builder.row(*row)
+    builder.row(InlineKeyboardButton(text="<- Назад", callback_data="series"))
+    return builder.as_markup()
+
+
+async def show_series(
+    clbq: CallbackQuery, owner_id: int, prefix: str, skip: int
+) -> None:
+    """Список сериалов в режиме пользователя: карточкой или страницей списка"""
+    view = SERIES_LISTS[prefix]
+    message = cast(Message, clbq.message)
+    if await view_modes.get(clbq.from_user.id) != LIST:
+        await view.show_card(message, owner_id, skip, False)
+        return
+
+    skip = list_page_skip(skip)
+    async with get_session() as session:
+        sr = SeriesRepository(session, owner_id)
+        if view.watch_status:
+            series_list, has_next = await sr.get_by_watch_status(
+                view.watch_status, skip, LIST_PAGE_LIMIT
+            )
+        else:
+            series_list, has_next = await sr.get_by_is_watched(
+                True, skip, LIST_PAGE_LIMIT
+            )
+        total = await CounterRepo(session, owner_id).get(view.counter)
+
+    if not series_list:
+        await view.show_card(message, owner_id, skip, False)
+        return
+
+    sheet = await poster_cache.sheet(
+        cast(Bot, message.bot),
+        [
+            stored_poster(series.poster, series.poster_unique_id)
+            for series in series_list
+        ],
+        skip + 1,
+    )
+    await renderer.render(
+        message,
+        media=sheet or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_list_msg(
+            view.header,
+            [build_series_list_line(series) for series in series_list],
+            skip,
         ),
+        reply_markup=build_series_list_kb(
+            prefix,
+            skip,
+            len(series_list),
+            has_next,
+            page_total(total, skip, len(series_list), has_next),
+        ),
+    )
+
+
+@router.callback_query(
+    F.data.regexp(r"^series:(want|currently_watching|watched):card:\d+$")
+)
+async def handle_series_card(clbq: CallbackQuery, owner_id: int) -> None:
+    prefix, skip = cast(str, clbq.data).split(":card:")
+    await SERIES_LISTS[prefix].show_card(
+        cast(Message, clbq.message), owner_id, int(skip), True
     )
 
 
@@ -351,12 +553,10 @@ async def handle_series_add(clbq: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
     await state.set_state(AddSeries.title)
 
-    await cast(Message, clbq.message).edit_media(
-        InputMediaPhoto(
-            media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-            caption=build_add_series_msg("title"),
-            parse_mode="HTML",
-        ),
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=build_add_series_msg("title"),
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
                 [InlineKeyboardButton(text="❌ Отмена", callback_data="series:want:0")]
@@ -386,22 +586,74 @@ async def handle_cancel_command(message: Message, state: FSMContext) -> None:
     )
 
 
+def build_duplicate_kb() -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text="❌ Не добавлять", callback_data="series:want:add:cancel"
+                )
+            ]
+        ]
+    )
+
+
+def build_duplicate_msg(series: SeriesModel, exact: bool) -> str:
+    head = "Этот сериал уже в списке" if exact else "Похожий сериал уже в списке"
+    return f"⚠️ {head}: <b>{series.title}</b> ({series.year}, {series.status.lower()})"
+
+
+async def find_duplicate(
+    owner_id: int, title: str, year: Optional[int] = None
+) -> Optional[SeriesModel]:
+    async with get_session() as session:
+        return await SeriesRepository(session, owner_id).find_duplicate(title, year)
+
+
+@router.callback_query(F.data == "series:want:add:cancel")
+async def handle_series_add_cancel(clbq: CallbackQuery, state: FSMContext) -> None:
+    await state.clear()
+    await cast(Message, clbq.message).edit_text(
+        "❌ Добавление сериала отменено.",
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="К списку сериалов", callback_data="series:want:0"
+                    )
+                ]
+            ]
+        ),
+    )
+
+
 @router.message(AddSeries.title)
-async def handle_series_title(message: Message, state: FSMContext) -> None:
+async def handle_series_title(
+    message: Message, state: FSMContext, owner_id: int
+) -> None:
     if not message.text:
         await message.answer(
             "❌ Название не может быть пустым. Введи название сериала:"
         )
         return
 
-    await state.update_data(title=message.text)
+    duplicate = await find_duplicate(owner_id, message.text)
+    # Без совпадения по названию год проверять незачем
+    await state.update_data(title=message.text, maybe_duplicate=duplicate is not None)
     await state.set_state(AddSeries.year)
 
+    if duplicate:
+        await message.answer(
+            build_duplicate_msg(duplicate, exact=False),
+            reply_markup=build_duplicate_kb(),
+        )
     await message.answer(build_add_series_msg("year"))
 
 
 @router.message(AddSeries.year)
-async def handle_series_year(message: Message, state: FSMContext) -> None:
+async def handle_series_year(
+    message: Message, state: FSMContext, owner_id: int
+) -> None:
     if not message.text or not message.text.isdigit():
         await message.answer("❌ Год должен быть числом. Введи год выпуска сериала:")
         return
@@ -412,15 +664,31 @@ async def handle_series_year(message: Message, state: FSMContext) -> None:
         return
 
     await state.update_data(year=year)
+    data = await state.get_data()
+    if data.get("maybe_duplicate"):
+        duplicate = await find_duplicate(owner_id, data["title"], year)
+        if duplicate:
+            await message.answer(
+                build_duplicate_msg(duplicate, exact=True),
+                reply_markup=build_duplicate_kb(),
+            )
     await state.set_state(AddSeries.photo)
 
     await message.answer(build_add_series_msg("photo"))
 
 
 @router.message(AddSeries.photo, F.content_type == "photo")
-async def handle_add_series_img(message: Message, state: FSMContext) -> None:
-    photo = message.photo[0].file_id if message.photo else ""
-    await state.update_data(photo=photo)
+async def handle_add_series_img(
+    message: Message, state: FSMContext, bot: Bot, owner_id: int
+) -> None:
+    poster = poster_from_photo(message.photo)
+    if poster:
+        poster = await dedupe_poster(owner_id, poster)
+        poster_cache.warm(bot, poster)
+    await state.update_data(
+        photo=poster.file_id if poster else "",
+        photo_unique_id=poster.unique_id if poster else None,
+    )
     await state.set_state(AddSeries.description)
 
     await message.answer(build_add_series_msg("description"))
@@ -436,7 +704,9 @@ async def handle_series_description(message: Message, state: FSMContext) -> None
 
 
 @router.message(AddSeries.season_number)
-async def handle_series_seasons(message: Message, state: FSMContext) -> None:
+async def handle_series_seasons(
+    message: Message, state: FSMContext, owner_id: int
+) -> None:
     if not message.text or not message.text.isdigit():
         await message.answer(
             "❌ Количество сезонов должно быть числом. Введи количество сезонов:"
@@ -456,8 +726,8 @@ async def handle_series_seasons(message: Message, state: FSMContext) -> None:
     year = data["year"]
     description = data["description"]
 
-    async with get_session() as session:
-        sr = SeriesRepository(session)
+    async with transaction() as session:
+        sr = SeriesRepository(session, owner_id)
         series = await sr.create(
             title=title,
             year=year,
@@ -465,8 +735,8 @@ async def handle_series_seasons(message: Message, state: FSMContext) -> None:
             poster=photo,
             season_number=season_number,
             watch_status="planned",
+            poster_unique_id=data.get("photo_unique_id"),
         )
-        await session.commit()
 
     await state.clear()
 
@@ -474,10 +744,10 @@ async def handle_series_seasons(message: Message, state: FSMContext) -> None:
 
     poster = photo if photo else FSInputFile(IMG_DIR / "movieImg.jpg")
 
-    await message.answer_photo(
-        photo=poster,
+    await renderer.answer(
+        message,
+        media=poster,
         caption=success_msg,
-        parse_mode="HTML",
         reply_markup=InlineKeyboardMarkup(
             inline_keyboard=[
                 [
@@ -504,189 +774,159 @@ async def handle_series_seasons(message: Message, state: FSMContext) -> None:
 
 
 @router.callback_query(F.data.regexp(r"^series:want:watching:\d+$"))
-async def handle_series_make_watching(clbq: CallbackQuery) -> None:
+async def handle_series_make_watching(clbq: CallbackQuery, owner_id: int) -> None:
     sid = int(cast(str, clbq.data).split(":")[-1])
 
-    async with get_session() as session:
-        sr = SeriesRepository(session)
-        series = await sr.get(sid=sid)
-
-        if not series:
-            await clbq.answer("❌ Сериал не найден", show_alert=True)
-            return
+    async with transaction() as session:
+        sr = SeriesRepository(session, owner_id)
+        series = await sr.set_watch_status(sid, "watching", watched=False)
 
-        series.watch_status = "watching"
-        series.watched = False
-        await session.commit()
+    if not series:
+        await clbq.answer("❌ Сериал не найден", show_alert=True)
+        return
 
-        success_msg = format_series_message(series, "📺 Смотрю")
+    success_msg = format_series_message(series, "📺 Смотрю")
 
-        poster = (
-            series.poster if series.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
-        )
+    poster = series.poster if series.poster else FSInputFile(IMG_DIR / "movieImg.jpg")
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=poster,
-                caption=success_msg,
-                parse_mode="HTML",
-            ),
-            reply_markup=InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [
-                        InlineKeyboardButton(
-                            text="← Назад к списку",
-                            callback_data="series:currently_watching:0",
-                        )
-                    ]
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=poster,
+        caption=success_msg,
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="← Назад к списку",
+                        callback_data="series:currently_watching:0",
+                    )
                 ]
-            ),
-        )
+            ]
+        ),
+    )
 
 
 @router.callback_query(F.data.regexp(r"^series:want:completed:\d+$"))
-async def handle_series_make_completed(clbq: CallbackQuery) -> None:
+async def handle_series_make_completed(clbq: CallbackQuery, owner_id: int) -> None:
     sid = int(cast(str, clbq.data).split(":")[-1])
 
-    async with get_session() as session:
-        sr = SeriesRepository(session)
-        series = await sr.get(sid=sid)
-
-        if not series:
-            await clbq.answer("❌ Сериал не найден", show_alert=True)
-            return
+    async with transaction() as session:
+        sr = SeriesRepository(session, owner_id)
+        series = await sr.set_watch_status(sid, "completed", watched=True)
 
-        series.watch_status = "completed"
-        series.watched = True
-        await session.commit()
+    if not series:
+        await clbq.answer("❌ Сериал не найден", show_alert=True)
+        return
 
-        caption = format_series_message(series, "✅ Просмотрено")
+    caption = format_series_message(series, "✅ Просмотрено")
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption=caption,
-                parse_mode="HTML",
-            ),
-            reply_markup=InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [
-                        InlineKeyboardButton(
-                            text="← Назад к списку", callback_data="series:watched:0"
-                        )
-                    ]
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=caption,
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="← Назад к списку", callback_data="series:watched:0"
+                    )
                 ]
-            ),
-        )
+            ]
+        ),
+    )
 
 
 @router.callback_query(F.data.regexp(r"^series:want:remove:\d+$"))
-async def handle_series_remove(clbq: CallbackQuery) -> None:
+async def handle_series_remove(clbq: CallbackQuery, owner_id: int) -> None:
     sid = int(cast(str, clbq.data).split(":")[-1])
 
-    async with get_session() as session:
-        sr = SeriesRepository(session)
+    async with transaction() as session:
+        sr = SeriesRepository(session, owner_id)
         series = await sr.get(sid=sid)
+        if series:
+            await sr.delete(sid)
 
-        if not series:
-            await clbq.answer("❌ Сериал не найден", show_alert=True)
-            return
-
-        await sr.delete(sid)
-        await session.commit()
+    if not series:
+        await clbq.answer("❌ Сериал не найден", show_alert=True)
+        return
 
-        success_msg = f"✅ Сериал <b>{series.title}</b> успешно удалён из списка!"
+    success_msg = f"✅ Сериал <b>{series.title}</b> успешно удалён из списка!"
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption=success_msg,
-                parse_mode="HTML",
-            ),
-            reply_markup=InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [
-                        InlineKeyboardButton(
-                            text="← Назад к списку", callback_data="series:want:0"
-                        )
-                    ]
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=success_msg,
+        reply_markup=InlineKeyboardMarkup(
+            inline_keyboard=[
+                [
+                    InlineKeyboardButton(
+                        text="← Назад к списку", callback_data="series:want:0"
+                    )
                 ]
-            ),
-        )
-
-
-@router.callback_query(F.data.regexp(r"^series:watching:next_episode:\d+$"))
-async def handle_series_next_episode(clbq: CallbackQuery) -> None:
-    sid = int(cast(str, clbq.data).split(":")[-1])
-
-    async with get_session() as session:
-        sr = SeriesRepository(session)
-        series = await sr.get(sid=sid)
-
-        if not series:
-            await clbq.answer("❌ Сериал не найден", show_alert=True)
-            return
-
-        series.episode_current = (series.episode_current or 0) + 1
-        await session.commit()
-
-        caption = format_series_message(
-            series,
-            (
-                f"📺 Смотрю (эпизод {series.episode_current} / "
-                f"сезон {series.season_current or 1})"
-            ),
-        )
+            ]
+        ),
+    )
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption=caption,
-                parse_mode="HTML",
-            ),
-            reply_markup=build_series_kb_with_actions(
-                "series:currently_watching",
-                0,
-                False,
-                series.id,
-                series.watch_status,
-                include_back=True,
-            ),
-        )
 
+@router.callback_query(SERIES_PROGRESS.filter())
+async def handle_series_progress(clbq: CallbackQuery, owner_id: int, nav: Nav) -> None:
+    await advance_series(clbq, owner_id, **nav.values)
 
-@router.callback_query(F.data.regexp(r"^series:watching:next_season:\d+$"))
-async def handle_series_next_season(clbq: CallbackQuery) -> None:
-    sid = int(cast(str, clbq.data).split(":")[-1])
 
-    async with get_session() as session:
-        sr = SeriesRepository(session)
-        series = await sr.get(sid=sid)
+@router.callback_query(F.data.regexp(r"^series:watching:next_(episode|season):\d+$"))
+async def handle_series_progress_legacy(clbq: CallbackQuery, owner_id: int) -> None:
+    """Кнопки из сообщений, отправленных до упакованной навигации"""
+    _, _, step, sid = cast(str, clbq.data).split(":")
+    await advance_series(
+        clbq, owner_id, int(sid), step == "next_season", skip=0, from_list=False
+    )
 
-        if not series:
-            await clbq.answer("❌ Сериал не найден", show_alert=True)
-            return
 
-        series.season_current = (series.season_current or 0) + 1
-        series.episode_current = 1
-        await session.commit()
+async def advance_series(
+    clbq: CallbackQuery,
+    owner_id: int,
+    series_id: int,
+    season: bool,
+    *,
+    skip: int,
+    from_list: bool,
+) -> None:
+    """+1 эпизод или сезон; карточка остаётся на своей позиции в списке"""
+    async with transaction() as session:
+        sr = SeriesRepository(session, owner_id)
+        series = await sr.get(sid=series_id)
+        if series and season:
+            series.season_current = (series.season_current or 0) + 1
+            series.episode_current = 1
+        elif series:
+            series.episode_current = (series.episode_current or 0) + 1
+        total = await CounterRepo(session, owner_id).get("series:watching")
+
+    if not series:
+        await clbq.answer("❌ Сериал не найден", show_alert=True)
+        return
 
-        caption = format_series_message(
-            series, f"📺 Смотрю (сезон {series.season_current})"
+    if season:
+        status_text = f"📺 Смотрю (сезон {series.season_current})"
+    else:
+        status_text = (
+            f"📺 Смотрю (эпизод {series.episode_current} / "
+            f"сезон {series.season_current or 1})"
         )
+    has_next = skip + PAGE_LIMIT < total
 
-        await cast(Message, clbq.message).edit_media(
-            InputMediaPhoto(
-                media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
-                caption=caption,
-                parse_mode="HTML",
-            ),
-            reply_markup=build_series_kb_with_actions(
-                "series:currently_watching",
-                0,
-                False,
-                series.id,
-                series.watch_status,
-                include_back=True,
-            ),
-        )
+    await renderer.render(
+        cast(Message, clbq.message),
+        media=series.poster or FSInputFile(IMG_DIR / "movieImg.jpg"),
+        caption=format_series_message(series, status_text),
+        reply_markup=build_series_kb_with_actions(
+            "series:currently_watching",
+            skip,
+            has_next,
+            series.id,
+            series.watch_status,
+            include_back=True,
+            total=page_total(total, skip, 1, has_next),
+            from_list=from_list,
+        ),
+    )
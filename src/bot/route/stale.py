@@ -0,0 +1,13 @@
+from aiogram import F, Router
+from aiogram.types import CallbackQuery
+
+from bot.callback import PACKED_PREFIX
+
+router = Router()
+
+
+# Подключается последним: сюда доходят упакованные кнопки, которые не
+# разобрал ни один обработчик (старая версия кодека или удалённое действие)
+@router.callback_query(F.data.startswith(PACKED_PREFIX))
+async def handle_stale_button(clbq: CallbackQuery) -> None:
+    await clbq.answer("Кнопка устарела, открой раздел заново", show_alert=True)
@@ -8,11 +8,11 @@ from aiogram.types import (
     FSInputFile,
     InlineKeyboardButton,
     InlineKeyboardMarkup,
-    InputMediaPhoto,
     Message,
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from bot.render import renderer
 from config.consts import IMG_DIR
 from config.settings import settings
 from db.repository.user import UserModelRepo
@@ -26,7 +26,8 @@ def get_start_kb(cur_user_id: int = -1) -> InlineKeyboardMarkup:
     builder.row(InlineKeyboardButton(text="💰 Баланс", callback_data="balance"))
     builder.row(InlineKeyboardButton(text="🎬 Фильмы", callback_data="movies"))
     builder.row(InlineKeyboardButton(text="🎥 Сериалы", callback_data="series"))
-    if cur_user_id in settings.ADMIN_IDS:
+    # Без общего владельца каждый сам настраивает свои категории
+    if cur_user_id in settings.ADMIN_IDS or not settings.HOUSEHOLD_OWNER_ID:
         builder.row(InlineKeyboardButton(text="Admin", callback_data="admin"))
     return builder.as_markup()
 
@@ -48,14 +49,17 @@ async def handle_start(msg_or_clbq: Message | CallbackQuery, state: FSMContext)
         await user_repo.add(user.id, user.username, user.first_name, user.last_name)
 
     if isinstance(msg_or_clbq, Message):
-        await msg_or_clbq.answer_photo(
-            photo=FSInputFile(IMG_DIR / "startImg.jpeg"),
+        await renderer.answer(
+            msg_or_clbq,
+            media=FSInputFile(IMG_DIR / "startImg.jpeg"),
             caption=msg,
             reply_markup=kb,
         )
     else:
-        await cast(Message, msg_or_clbq.message).edit_media(
-            InputMediaPhoto(media=FSInputFile(IMG_DIR / "startImg.jpeg"), caption=msg),
+        await renderer.render(
+            cast(Message, msg_or_clbq.message),
+            media=FSInputFile(IMG_DIR / "startImg.jpeg"),
+            caption=msg,
             reply_markup=kb,
         )
 
@@ -0,0 +1,100 @@
+import time
+from typing import Any, Awaitable, Callable, Dict, TypeVar, cast
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from config.log import current_update
+from config.tracing import current_trace, span, tracer
+
+from .update_log import route_name
+
+Middleware = TypeVar("Middleware", bound=Callable[..., Awaitable[Any]])
+
+
+class TraceMiddleware(BaseMiddleware):
+    """
+    Открывает трейс для отобранного апдейта; по окончании добавляет
+    интервал `update` на всё время обработки и отдаёт трейс на запись.
+    Регистрируется внешним middleware на `dp.update` сразу после
+    UpdateLogMiddleware.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        update_id = event.update_id if isinstance(event, Update) else 0
+        trace = tracer.begin(update_id)
+        if trace is None:
+            return await handler(event, data)
+
+        token = current_trace.set(trace)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            current_trace.reset(token)
+            ctx = current_update.get()
+            route = ctx.route if ctx and ctx.route else "unhandled"
+            trace.add(
+                "update",
+                "update",
+                started,
+                time.perf_counter(),
+                update_id=update_id,
+                user_id=ctx.user_id if ctx else None,
+                route=route,
+            )
+            tracer.finish(trace, f"update {update_id} {route}")
+
+
+def traced(middleware: Middleware) -> Middleware:
+    """
+    Оборачивает middleware апдейта в интервал под именем middleware. Когда
+    трассировка выключена, возвращает middleware без обёртки.
+    """
+    if not tracer.enabled:
+        return middleware
+    name = getattr(middleware, "__name__", type(middleware).__name__)
+
+    async def wrapper(
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        with span(name, "middleware"):
+            return await middleware(handler, event, data)
+
+    return cast(Middleware, wrapper)
+
+
+async def handler_span_middleware(
+    handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+    event: TelegramObject,
+    data: Dict[str, Any],
+) -> Any:
+    """Внутренний middleware: интервал самого обработчика"""
+    with span(route_name(data["handler"]), "handler"):
+        return await handler(event, data)
+
+
+class BotApiTraceMiddleware(BaseRequestMiddleware):
+    """Интервал на каждый запрос к Bot API, включая загрузку файлов"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Any:
+        with span(method.__api_method__, "bot_api"):
+            return await make_request(bot, method)
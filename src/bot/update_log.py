@@ -0,0 +1,69 @@
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject, Update, User
+
+from config.log import UpdateContext, current_update
+
+logger = logging.getLogger("bot.updates")
+
+
+def route_name(handler: HandlerObject) -> str:
+    """`balance.quick:handle_quick_confirm` для обработчика из bot/route"""
+    module = handler.callback.__module__.removeprefix("bot.route.")
+    return f"{module}:{handler.callback.__qualname__}"
+
+
+class UpdateLogMiddleware(BaseMiddleware):
+    """
+    Открывает контекст апдейта для логов и пишет строку на каждый апдейт:
+    обработчик и полное время, включая ожидание очереди чата.
+
+    Регистрируется первым внешним middleware на `dp.update`; обработчик
+    в контекст записывает `route_middleware`.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        user: Optional[User] = data.get("event_from_user")
+        ctx = UpdateContext(
+            update_id=event.update_id if isinstance(event, Update) else 0,
+            user_id=user.id if user else None,
+        )
+        token = current_update.set(ctx)
+        started = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - started) * 1000, 1)
+            logger.info(
+                "update %s in %.1f ms%s",
+                ctx.route or "unhandled",
+                duration_ms,
+                f" failed: {error}" if error else "",
+                extra={"duration_ms": duration_ms},
+            )
+            current_update.reset(token)
+
+
+async def route_middleware(
+    handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+    event: TelegramObject,
+    data: Dict[str, Any],
+) -> Any:
+    """Внутренний middleware: к этому моменту обработчик апдейта уже выбран"""
+    ctx = current_update.get()
+    if ctx is not None:
+        ctx.route = route_name(data["handler"])
+    return await handler(event, data)
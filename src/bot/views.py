@@ -0,0 +1,103 @@
+from typing import Optional, Sequence
+
+from aiogram.types import InlineKeyboardButton
+
+from bot.paging import build_page_rows
+from db.repository.user import UserModelRepo
+from db.session import get_session, transaction
+
+CARD = "card"
+LIST = "list"
+VIEW_MODES = (CARD, LIST)
+
+# Сколько записей на странице в режиме списка
+LIST_PAGE_LIMIT = 10
+# Номеров в одном ряду кнопок выбора
+SELECT_ROW_SIZE = 5
+# Подпись к фото ограничена 1024 символами: длинные названия обрезаются
+TITLE_MAX_LEN = 48
+
+
+class ViewModes:
+    """
+    Режим показа списков каждого пользователя: карточки по одной или список.
+
+    Из БД читается один раз на процесс. Апдейты одного чата всегда
+    обрабатывает один процесс, поэтому и в режиме `WORKERS=N` переключение
+    сразу видно там, где пользователь листает.
+    """
+
+    def __init__(self) -> None:
+        self._modes: dict[int, str] = {}
+
+    async def get(self, user_id: int) -> str:
+        if user_id not in self._modes:
+            async with get_session() as session:
+                mode = await UserModelRepo(session).get_view_mode(user_id)
+            self._modes[user_id] = mode or CARD
+        return self._modes[user_id]
+
+    async def set(self, user_id: int, mode: str) -> None:
+        async with transaction() as session:
+            await UserModelRepo(session).set_view_mode(user_id, mode)
+        self._modes[user_id] = mode
+
+
+view_modes = ViewModes()
+
+
+def list_page_skip(skip: int) -> int:
+    """Начало страницы списка, на которой стоит запись `skip`"""
+    return skip - skip % LIST_PAGE_LIMIT
+
+
+def short_title(title: str) -> str:
+    if len(title) <= TITLE_MAX_LEN:
+        return title
+    return title[: TITLE_MAX_LEN - 1].rstrip() + "…"
+
+
+def build_list_msg(header: str, lines: Sequence[str], skip: int) -> str:
+    """Нумерованный список; номера те же, что на кнопках выбора"""
+    items = [f"{skip + i}. {line}" for i, line in enumerate(lines, start=1)]
+    return f"{header}\n\n" + "\n".join(items)
+
+
+def build_list_rows(
+    prefix: str,
+    skip: int,
+    shown: int,
+    has_next: bool,
+    total: Optional[int] = None,
+) -> list[list[InlineKeyboardButton]]:
+    """
+    Кнопки выбора записи и навигация по страницам списка.
+
+    Номер ведёт на карточку `{prefix}:card:{позиция}`, страницы - на `{prefix}:{skip}`.
+    """
+    numbers = [
+        InlineKeyboardButton(
+            text=str(skip + i + 1), callback_data=f"{prefix}:card:{skip + i}"
+        )
+        for i in range(shown)
+    ]
+    rows = [
+        numbers[i : i + SELECT_ROW_SIZE]
+        for i in range(0, len(numbers), SELECT_ROW_SIZE)
+    ]
+    rows.extend(build_page_rows(prefix, skip, LIST_PAGE_LIMIT, has_next, total))
+    return rows
+
+
+def build_back_to_list_row(prefix: str, skip: int) -> list[InlineKeyboardButton]:
+    """Вместо навигации в карточке, открытой из списка"""
+    return [InlineKeyboardButton(text="📋 К списку", callback_data=f"{prefix}:{skip}")]
+
+
+def build_view_toggle_row(section: str, mode: str) -> list[InlineKeyboardButton]:
+    """Переключатель режима в меню раздела: `{section}:view:{новый режим}`"""
+    if mode == LIST:
+        text, new_mode = "🖼 Показывать карточками", CARD
+    else:
+        text, new_mode = "📋 Показывать списком", LIST
+    return [InlineKeyboardButton(text=text, callback_data=f"{section}:view:{new_mode}")]
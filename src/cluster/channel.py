@@ -0,0 +1,52 @@
+import asyncio
+import contextlib
+import json
+import socket
+from typing import Any, AsyncIterator
+
+# Апдейт Telegram обычно занимает единицы КБ, лимит - на порядки больше
+LINE_LIMIT = 4 * 1024 * 1024
+# Выше этого объёма неотправленных данных ждём, пока процесс их заберёт
+HIGH_WATER = 16 * 1024 * 1024
+
+Message = dict[str, Any]
+
+
+class Channel:
+    """JSON-сообщения построчно поверх локального сокета между процессами"""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._reader = reader
+        self._writer = writer
+
+    @classmethod
+    async def open(cls, sock: socket.socket) -> "Channel":
+        reader, writer = await asyncio.open_connection(sock=sock, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    @property
+    def backlog(self) -> int:
+        """Байт, записанных, но ещё не отданных в сокет"""
+        return self._writer.transport.get_write_buffer_size()
+
+    def send(self, message: Message) -> None:
+        if self._writer.is_closing():
+            return
+        self._writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    async def drain(self) -> None:
+        if self.backlog > HIGH_WATER:
+            await self._writer.drain()
+
+    async def __aiter__(self) -> AsyncIterator[Message]:
+        while line := await self._reader.readline():
+            yield json.loads(line)
+
+    async def close(self) -> None:
+        if self._writer.is_closing():
+            return
+        self._writer.close()
+        with contextlib.suppress(ConnectionError):
+            await self._writer.wait_closed()
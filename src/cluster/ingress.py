@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import signal
+from urllib.parse import urlparse
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramNetworkError, TelegramServerError
+from aiogram.utils.backoff import Backoff, BackoffConfig
+from aiohttp import web
+
+from cluster.supervisor import Supervisor
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+POLLING_TIMEOUT = 10
+BACKOFF = BackoffConfig(min_delay=1.0, max_delay=5.0, factor=1.3, jitter=0.1)
+
+
+async def poll(bot: Bot, supervisor: Supervisor, allowed_updates: list[str]) -> None:
+    """Long polling: забирает апдейты и раздаёт обработчикам"""
+    await bot.delete_webhook(drop_pending_updates=True)
+    backoff = Backoff(config=BACKOFF)
+    offset = None
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=POLLING_TIMEOUT,
+                allowed_updates=allowed_updates,
+            )
+        except (TelegramNetworkError, TelegramServerError) as e:
+            logger.warning("get_updates failed: %s", e)
+            await backoff.asleep()
+            continue
+        backoff.reset()
+
+        for update in updates:
+            offset = update.update_id + 1
+            await supervisor.dispatch(
+                update.model_dump(mode="json", exclude_unset=True)
+            )
+
+
+async def serve_webhook(
+    bot: Bot, supervisor: Supervisor, allowed_updates: list[str]
+) -> None:
+    """Webhook: принимает апдейты от Telegram и сразу отвечает 200"""
+
+    async def handle(request: web.Request) -> web.Response:
+        secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token", "")
+        if settings.WEBHOOK_SECRET and secret != settings.WEBHOOK_SECRET:
+            return web.Response(status=401)
+        await supervisor.dispatch(await request.json())
+        return web.Response()
+
+    app = web.Application()
+    app.router.add_post(urlparse(settings.WEBHOOK_URL).path or "/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, settings.WEBHOOK_HOST, settings.WEBHOOK_PORT).start()
+
+    await bot.set_webhook(
+        settings.WEBHOOK_URL,
+        secret_token=settings.WEBHOOK_SECRET or None,
+        allowed_updates=allowed_updates,
+    )
+    logger.info(
+        "Webhook listening on %s:%d", settings.WEBHOOK_HOST, settings.WEBHOOK_PORT
+    )
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+async def run_cluster(bot: Bot, allowed_updates: list[str]) -> None:
+    """Режим supervisor: этот процесс только принимает апдейты"""
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    if task is not None:
+        # docker stop присылает SIGTERM: завершаемся так же, как по Ctrl+C
+        loop.add_signal_handler(signal.SIGTERM, task.cancel)
+
+    supervisor = Supervisor(settings.WORKERS)
+    await supervisor.start()
+    logger.info("Started %d workers", settings.WORKERS)
+    try:
+        if settings.WEBHOOK_URL:
+            await serve_webhook(bot, supervisor, allowed_updates)
+        else:
+            await poll(bot, supervisor, allowed_updates)
+    finally:
+        await supervisor.stop()
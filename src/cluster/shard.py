@@ -0,0 +1,29 @@
+from typing import Any, Optional
+
+
+def chat_id_of(update: dict[str, Any]) -> Optional[int]:
+    """
+    Чат, к которому относится апдейт.
+
+    Тот же ключ использует FSM (чат + пользователь), поэтому состояние
+    диалога всегда живёт в одном процессе. Если чата нет (inline-режим),
+    берётся пользователь.
+    """
+    for key, event in update.items():
+        if key == "update_id" or not isinstance(event, dict):
+            continue
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+        if chat:
+            return chat["id"]
+        user = event.get("from") or event.get("user")
+        if user:
+            return user["id"]
+    return None
+
+
+def shard_of(update: dict[str, Any], shards: int) -> int:
+    """Номер обработчика для апдейта; апдейты одного чата идут в один процесс"""
+    chat_id = chat_id_of(update)
+    if chat_id is None:
+        return update.get("update_id", 0) % shards
+    return chat_id % shards
@@ -0,0 +1,129 @@
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import socket
+from multiprocessing.process import BaseProcess
+from typing import Any, Optional
+
+from cluster.channel import Channel
+from cluster.shard import shard_of
+from cluster.worker import BotFactory, run_worker
+
+logger = logging.getLogger(__name__)
+
+# Планировщики (автосброс лимитов) работают только в этом обработчике
+SCHEDULER_WORKER = 0
+
+
+class WorkerHandle:
+    def __init__(self, index: int, process: BaseProcess, channel: Channel) -> None:
+        self.index = index
+        self.process = process
+        self.channel = channel
+        self.forwarded = 0
+        self.done = 0
+        self.reader: Optional[asyncio.Task[None]] = None
+
+    @property
+    def in_flight(self) -> int:
+        return self.forwarded - self.done
+
+
+class Supervisor:
+    """
+    Запускает N процессов-обработчиков и раздаёт им апдейты по chat_id.
+
+    Апдейты одного чата всегда попадают в один процесс, поэтому порядок
+    внутри чата и состояние FSM (MemoryStorage процесса) сохраняются.
+    Упавший обработчик перезапускается под тем же номером шарда.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        bot_factory: Optional[BotFactory] = None,
+        watch_interval: float = 1.0,
+    ) -> None:
+        self.size = workers
+        self.bot_factory = bot_factory
+        self.watch_interval = watch_interval
+        self.workers: list[WorkerHandle] = []
+        self._ctx = multiprocessing.get_context("spawn")
+        self._progress = asyncio.Event()
+        self._watcher: Optional[asyncio.Task[None]] = None
+
+    async def start(self) -> None:
+        self.workers = [await self._spawn(i) for i in range(self.size)]
+        self._watcher = asyncio.create_task(self._watch(), name="supervisor-watch")
+
+    async def dispatch(self, update: dict[str, Any]) -> None:
+        worker = self.workers[shard_of(update, self.size)]
+        worker.channel.send({"update": update})
+        worker.forwarded += 1
+        await worker.channel.drain()
+
+    @property
+    def in_flight(self) -> int:
+        return sum(w.in_flight for w in self.workers)
+
+    async def wait_idle(self) -> None:
+        """Ждёт, пока обработчики закончат все отправленные им апдейты"""
+        while self.in_flight:
+            self._progress.clear()
+            await self._progress.wait()
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        if self._watcher is not None:
+            self._watcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watcher
+
+        # Закрытый канал - сигнал обработчику доделать начатое и выйти
+        for worker in self.workers:
+            await worker.channel.close()
+        for worker in self.workers:
+            await asyncio.to_thread(worker.process.join, timeout)
+            if worker.process.is_alive():
+                logger.warning("Worker %d did not stop, terminating", worker.index)
+                worker.process.terminate()
+            if worker.reader is not None:
+                worker.reader.cancel()
+
+    async def _spawn(self, index: int) -> WorkerHandle:
+        parent, child = socket.socketpair()
+        process = self._ctx.Process(
+            target=run_worker,
+            args=(index, child, index == SCHEDULER_WORKER, self.bot_factory),
+            name=f"lifebot-worker-{index}",
+        )
+        process.start()
+        child.close()
+
+        worker = WorkerHandle(index, process, await Channel.open(parent))
+        worker.reader = asyncio.create_task(self._read(worker))
+        return worker
+
+    async def _read(self, worker: WorkerHandle) -> None:
+        async for message in worker.channel:
+            if "done" in message:
+                worker.done += 1
+                self._progress.set()
+            elif message.get("control") == "reload":
+                self.workers[SCHEDULER_WORKER].channel.send(message)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            for i, worker in enumerate(self.workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error(
+                    "Worker %d exited with %s, %d updates lost, restarting",
+                    i,
+                    worker.process.exitcode,
+                    worker.in_flight,
+                )
+                await worker.channel.close()
+                self.workers[i] = await self._spawn(i)
+                self._progress.set()
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import signal
+import socket
+from typing import Any, Callable, Optional
+
+from aiogram import Bot
+
+from cluster.channel import Channel
+from config.log import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BotFactory = Callable[[], Bot]
+
+
+def run_worker(
+    index: int,
+    sock: socket.socket,
+    owns_scheduler: bool,
+    bot_factory: Optional[BotFactory] = None,
+) -> None:
+    """Точка входа процесса-обработчика"""
+    # Ctrl+C приходит всей группе процессов: обработчик завершается сам,
+    # когда supervisor закроет канал, и успевает доделать начатое
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    setup_logging(f"worker {index}")
+    asyncio.run(serve(index, sock, owns_scheduler, bot_factory))
+
+
+async def serve(
+    index: int,
+    sock: socket.socket,
+    owns_scheduler: bool,
+    bot_factory: Optional[BotFactory] = None,
+) -> None:
+    # Импорт внутри: supervisor не должен создавать бота, движок БД и FSM
+    from api import api_server  # noqa: PLC0415
+    from bot.bot import bot as default_bot  # noqa: PLC0415
+    from bot.dp import dp  # noqa: PLC0415
+    from db.session import database  # noqa: PLC0415
+    from scheduler.archive import balance_archive_scheduler  # noqa: PLC0415
+    from scheduler.backup import backup_scheduler  # noqa: PLC0415
+    from scheduler.base import HeapScheduler  # noqa: PLC0415
+    from scheduler.counters import counter_reconcile_scheduler  # noqa: PLC0415
+    from scheduler.limits import limit_reset_scheduler  # noqa: PLC0415
+    from scheduler.recurring import recurring_scheduler  # noqa: PLC0415
+
+    bot = bot_factory() if bot_factory else default_bot
+    channel = await Channel.open(sock)
+    tasks: set[asyncio.Task[None]] = set()
+    # Планировщики, которые перечитываются по reload из других процессов
+    reloadable: dict[str, HeapScheduler] = {
+        s.name: s for s in (limit_reset_scheduler, recurring_scheduler)
+    }
+
+    if owns_scheduler:
+        limit_reset_scheduler.start()
+        balance_archive_scheduler.start()
+        counter_reconcile_scheduler.start()
+        backup_scheduler.start()
+        recurring_scheduler.bot = bot
+        recurring_scheduler.start()
+        # API слушает один порт, поэтому тоже только в первом обработчике
+        await api_server.start()
+    else:
+        for name, scheduler in reloadable.items():
+            scheduler.on_reload = lambda name=name: channel.send(
+                {"control": "reload", "name": name}
+            )
+
+    async def handle(update: dict[str, Any]) -> None:
+        try:
+            await dp.feed_raw_update(bot, update)
+        except Exception:
+            logger.exception("Update %s failed", update.get("update_id"))
+        finally:
+            channel.send({"done": update.get("update_id")})
+
+    logger.info("Worker %d started", index)
+    async for message in channel:
+        if "update" in message:
+            task = asyncio.create_task(handle(message["update"]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        elif message.get("control") == "reload":
+            target = reloadable.get(message.get("name", ""))
+            if target is not None:
+                target.reload()
+
+    # Канал закрыт: доделываем начатые апдейты и выходим
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await asyncio.gather(
+        limit_reset_scheduler.stop(),
+        balance_archive_scheduler.stop(),
+        counter_reconcile_scheduler.stop(),
+        backup_scheduler.stop(),
+        recurring_scheduler.stop(),
+    )
+    await api_server.stop()
+    await channel.close()
+    await bot.session.close()
+    await database.dispose()
+    logger.info("Worker %d stopped", index)
@@ -5,3 +5,6 @@ ASSETS_DIR = ROOT_DIR / "assets"
 IMG_DIR = ASSETS_DIR / "img"
 
 DEFAULT_PAGE_LIMIT = 10
+
+# Локальные превью постеров (см. bot/posters.py)
+MEDIA_DIR = ROOT_DIR / "media"
@@ -0,0 +1,211 @@
+"""
+Логи без записи в stdout из event loop.
+
+Обработчик корневого логгера только кладёт запись в очередь, в stdout её
+пишет поток QueueListener. Поэтому медленный stdout (docker, pipe) не
+останавливает обработку апдейтов. Если очередь переполнена, запись
+отбрасывается, не дожидаясь места.
+
+Запись дополняется полями текущего апдейта (`update_id`, `user_id`,
+`route`) из contextvars и выводится строкой JSON. Записи ниже WARNING от
+шумных логгеров (`LOG_SAMPLED`) проходят в доле `LOG_SAMPLE_RATE`.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, Sequence
+
+from config.settings import settings
+
+# Поля записи, которые попадают в JSON помимо стандартных
+CONTEXT_FIELDS = ("process_name", "update_id", "user_id", "route", "duration_ms")
+
+
+class UpdateContext:
+    """Апдейт, который сейчас обрабатывается в этой задаче"""
+
+    __slots__ = ("route", "update_id", "user_id")
+
+    def __init__(self, update_id: int, user_id: Optional[int]) -> None:
+        self.update_id = update_id
+        self.user_id = user_id
+        # Обработчик апдейта, известен после роутинга
+        self.route: Optional[str] = None
+
+
+current_update: ContextVar[Optional[UpdateContext]] = ContextVar(
+    "current_update", default=None
+)
+
+
+class ContextFilter(logging.Filter):
+    """Переносит в запись поля апдейта: в потоке записи contextvars уже не те"""
+
+    def __init__(self, process_name: Optional[str]) -> None:
+        super().__init__()
+        self.process_name = process_name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.process_name:
+            record.process_name = self.process_name
+        ctx = current_update.get()
+        if ctx is not None:
+            for field in ("update_id", "user_id", "route"):
+                if not hasattr(record, field):
+                    setattr(record, field, getattr(ctx, field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Пропускает долю `rate` записей ниже WARNING от логгеров `prefixes`"""
+
+    def __init__(self, rate: float, prefixes: Sequence[str]) -> None:
+        super().__init__()
+        self.rate = rate
+        self.prefixes = tuple(prefixes)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1:
+            return True
+        if not record.name.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate  # noqa: S311
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler, который при полной очереди считает и отбрасывает запись"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]") -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Аргументы и traceback - ссылки на живые объекты: сводим их к тексту
+        # здесь, форматирование в JSON остаётся потоку записи
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    def __init__(self) -> None:
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.sampling: Optional[SamplingFilter] = None
+        self._listener: Optional[QueueListener] = None
+
+    def setup(
+        self,
+        level: int,
+        *,
+        fmt: str,
+        sample_rate: float,
+        sampled: Sequence[str],
+        queue_size: int,
+        process_name: Optional[str] = None,
+    ) -> None:
+        """Заменяет обработчики корневого логгера очередью и потоком записи"""
+        output = logging.StreamHandler(sys.stdout)
+        if fmt == "json":
+            output.setFormatter(JsonFormatter())
+        else:
+            prefix = f"[{process_name}] " if process_name else ""
+            output.setFormatter(
+                logging.Formatter(prefix + "%(levelname)s:%(name)s:%(message)s")
+            )
+
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(queue_size)
+        self.handler = DroppingQueueHandler(log_queue)
+        self.sampling = SamplingFilter(sample_rate, sampled)
+        self.handler.addFilter(self.sampling)
+        self.handler.addFilter(ContextFilter(process_name))
+
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level)
+
+        self._listener = QueueListener(log_queue, output)
+        self._listener.start()
+        # Дописывает очередь при выходе
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+    @property
+    def dropped(self) -> int:
+        return self.handler.dropped if self.handler else 0
+
+    def set_level(self, name: str, level: str) -> int:
+        """
+        Меняет уровень логгера `name` (пусто или root - корневой) на ходу.
+        Бросает ValueError на неизвестный уровень.
+        """
+        value = logging.getLevelNamesMapping().get(level.upper())
+        if value is None:
+            raise ValueError(f"unknown level {level!r}")
+        target = "" if name in ("", "root") else name
+        logging.getLogger(target).setLevel(value)
+        return value
+
+    def levels(self) -> dict[str, str]:
+        """Явно заданные уровни: корневой и логгеры, которым их меняли"""
+        levels = {"root": logging.getLevelName(logging.getLogger().level)}
+        for name, logger in sorted(logging.root.manager.loggerDict.items()):
+            if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+                levels[name] = logging.getLevelName(logger.level)
+        return levels
+
+
+log_pipeline = LogPipeline()
+
+
+def setup_logging(process_name: Optional[str] = None) -> None:
+    log_pipeline.setup(
+        logging.DEBUG if settings.DEBUG else logging.INFO,
+        fmt=settings.LOG_FORMAT,
+        sample_rate=settings.LOG_SAMPLE_RATE,
+        sampled=settings.LOG_SAMPLED,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        process_name=process_name,
+    )
@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,9 +11,73 @@ class Settings(BaseSettings):
     ADMIN_IDS: list[int] = [
         1287305857,  # me
     ]
+    # Общий режим семьи: данные всех пользователей принадлежат этому tg_id.
+    # 0 - каждый пользователь ведёт свои категории, записи, фильмы и сериалы
+    HOUSEHOLD_OWNER_ID: int = 0
     DEBUG: bool = False
     BOT_TOKEN: str = ""
     DB_URL: str = "sqlite+aiosqlite:///db.db"
+    # Пул соединений, для SQLite не используется
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 30 * 60
+    DB_POOL_PRE_PING: bool = True
+    # Только для SQLite: число read-only соединений, размер пачки group commit
+    # и ожидание блокировки в мс
+    DB_READERS: int = 4
+    DB_WRITE_BATCH: int = 32
+    DB_BUSY_TIMEOUT: int = 5000
+    # Сколько последних периодов записи лежат в основной таблице balance,
+    # более старые переносятся в balance_archive пачками по ARCHIVE_CHUNK_SIZE.
+    # Текущий период всегда в balance, поэтому меньше одного быть не может
+    BALANCE_HOT_PERIODS: int = Field(default=3, ge=1)
+    ARCHIVE_CHUNK_SIZE: int = 500
+    # Период сверки счётчиков длин списков по данным, в секундах
+    COUNTER_RECONCILE_INTERVAL: int = 6 * 60 * 60
+    # Бэкапы файловой SQLite: период в секундах (0 - только вручную), сколько
+    # снимков хранить, сжимать ли gzip. Копия идёт шагами по BACKUP_STEP_PAGES
+    # страниц, между шагами пауза BACKUP_STEP_PAUSE секунд для писателя
+    BACKUP_DIR: str = "backups"
+    BACKUP_INTERVAL: int = 24 * 60 * 60
+    BACKUP_KEEP: int = 7
+    BACKUP_COMPRESS: bool = True
+    BACKUP_STEP_PAGES: int = 256
+    BACKUP_STEP_PAUSE: float = 0.005
+    # Сколько апдейтов обрабатывается одновременно (в одном процессе)
+    MAX_CONCURRENT_UPDATES: int = 32
+    # 0 - всё в одном процессе; N - supervisor и N процессов-обработчиков
+    WORKERS: int = 0
+    # Webhook вместо long polling (только при WORKERS > 0), пусто - polling
+    WEBHOOK_URL: str = ""
+    WEBHOOK_SECRET: str = ""
+    WEBHOOK_HOST: str = "0.0.0.0"  # noqa: S104
+    WEBHOOK_PORT: int = 8080
+    # Read-only JSON API для дашбордов: 0 - выключен. Без API_TOKEN доступен
+    # всем, кто достучится до API_HOST, поэтому по умолчанию только localhost
+    API_PORT: int = 0
+    API_HOST: str = "127.0.0.1"
+    API_TOKEN: str = ""
+    API_PAGE_LIMIT: int = 50
+    # Сколько секунд версия данных для ETag не перечитывается из БД
+    API_ETAG_TTL: float = 2.0
+    # Логи: json - строка JSON на запись, text - для чтения глазами. Записи
+    # ниже WARNING от логгеров LOG_SAMPLED проходят в доле LOG_SAMPLE_RATE.
+    # Очередь к потоку записи ограничена LOG_QUEUE_SIZE, лишнее отбрасывается
+    LOG_FORMAT: str = "json"
+    LOG_SAMPLE_RATE: float = 0.1
+    LOG_SAMPLED: list[str] = ["aiogram.event", "sqlalchemy.engine", "aiosqlite"]
+    LOG_QUEUE_SIZE: int = 10_000
+    # Трассировка: доля апдейтов, получающих трейс (0 - выключена), файл в формате
+    # Chrome Trace Event, ротация по размеру и число старых файлов
+    TRACE_SAMPLE_RATE: float = 0.0
+    TRACE_FILE: str = "traces/trace.json"
+    TRACE_MAX_BYTES: int = 50 * 1024 * 1024
+    TRACE_BACKUPS: int = 3
+
+    def owner_for(self, user_id: int) -> int:
+        """Чьи данные видит пользователь"""
+        return self.HOUSEHOLD_OWNER_ID or user_id
 
 
 settings = Settings()
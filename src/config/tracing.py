@@ -0,0 +1,169 @@
+"""
+Трассировка апдейтов в формате Chrome Trace Event.
+
+Для доли апдейтов `TRACE_SAMPLE_RATE` собираются интервалы (spans):
+middleware, обработчик, каждый SQL-запрос и каждый запрос к Bot API.
+Интервалы копятся в памяти трейса и по окончании апдейта целиком уходят
+в поток записи, как записи логов. Неотобранные апдейты трейса не имеют,
+и `span()` для них ничего не делает.
+
+Файл `TRACE_FILE` - массив событий, по событию на строку: `[` в первой
+строке, дальше `{...},`. Закрывающая скобка не нужна, такой файл открывают
+chrome://tracing и ui.perfetto.dev. Апдейт - отдельная строка (tid) на
+временной шкале. Файл ротируется по `TRACE_MAX_BYTES`.
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import os
+import queue
+import random
+import time
+from contextvars import ContextVar
+from io import TextIOWrapper
+from logging.handlers import QueueListener, RotatingFileHandler
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from config.log import DroppingQueueHandler
+from config.settings import settings
+
+# Сдвиг perf_counter до unix time: ts событий - микросекунды от эпохи
+_EPOCH = time.time() - time.perf_counter()
+
+
+def _us(moment: float) -> int:
+    return int((_EPOCH + moment) * 1_000_000)
+
+
+class Trace:
+    """События одного апдейта"""
+
+    __slots__ = ("events", "tid")
+
+    def __init__(self, tid: int) -> None:
+        self.tid = tid
+        self.events: list[dict[str, Any]] = []
+
+    def add(
+        self, name: str, cat: str, started: float, ended: float, **args: Any
+    ) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": _us(started),
+            "dur": max(_us(ended) - _us(started), 1),
+            "tid": self.tid,
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+
+current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+@contextlib.contextmanager
+def span(name: str, cat: str, **args: Any) -> Iterator[None]:
+    """Интервал в трейсе текущего апдейта, если он отобран"""
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, cat, started, time.perf_counter(), **args)
+
+
+class TraceFileHandler(RotatingFileHandler):
+    """RotatingFileHandler, который начинает каждый новый файл строкой `[`"""
+
+    def _open(self) -> TextIOWrapper:
+        stream = super()._open()
+        if stream.tell() == 0:
+            stream.write("[\n")
+        return stream
+
+
+class Tracer:
+    def __init__(
+        self, path: Path, sample_rate: float, max_bytes: int, backups: int
+    ) -> None:
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._handler: Optional[DroppingQueueHandler] = None
+        self._listener: Optional[QueueListener] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0
+
+    def begin(self, tid: int) -> Optional[Trace]:
+        """Трейс апдейта или None, если апдейт не попал в выборку"""
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return None
+        return Trace(tid)
+
+    def finish(self, trace: Trace, title: str) -> None:
+        """Отдаёт события трейса потоку записи"""
+        if self._handler is None:
+            self._start()
+        pid = os.getpid()
+        lines = [
+            json.dumps(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": trace.tid,
+                    "args": {"name": title},
+                },
+                ensure_ascii=False,
+            )
+        ]
+        lines.extend(
+            json.dumps({**event, "pid": pid}, ensure_ascii=False, default=str)
+            for event in trace.events
+        )
+        record = logging.makeLogRecord({"msg": ",\n".join(lines) + ","})
+        if self._handler is not None:
+            self._handler.handle(record)
+
+    def _file(self) -> Path:
+        # Процессы-обработчики пишут каждый в свой файл: ротация общего
+        # файла из нескольких процессов теряет события
+        if not settings.WORKERS:
+            return self.path
+        return self.path.with_stem(f"{self.path.stem}-{os.getpid()}")
+
+    def _start(self) -> None:
+        path = self._file()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        output = TraceFileHandler(
+            path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"
+        )
+        trace_queue: queue.Queue[logging.LogRecord] = queue.Queue(1000)
+        self._handler = DroppingQueueHandler(trace_queue)
+        self._listener = QueueListener(trace_queue, output)
+        self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+tracer = Tracer(
+    Path(settings.TRACE_FILE),
+    sample_rate=settings.TRACE_SAMPLE_RATE,
+    max_bytes=settings.TRACE_MAX_BYTES,
+    backups=settings.TRACE_BACKUPS,
+)
@@ -0,0 +1,286 @@
+"""
+Онлайн-бэкапы файловой SQLite.
+
+Копия снимается через backup API SQLite в отдельном потоке шагами по
+`step_pages` страниц, между шагами - пауза `step_pause`, и event loop не
+блокируется. Копирование идёт внутри читающей транзакции: в режиме WAL она
+видит одну версию базы и не мешает писателю, поэтому снимок целостный - в
+отличие от копирования файла `db.db`, которое может попасть на середину
+записи.
+
+Снимки называются `lifebot-<дата>-<время>.db[.gz]`, старше `keep`
+последних удаляются.
+"""
+
+import asyncio
+import contextlib
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, NamedTuple, Optional
+
+from sqlalchemy.engine import make_url
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_PREFIX = "lifebot-"
+SNAPSHOT_SUFFIXES = (".db", ".db.gz")
+
+
+class BackupError(Exception):
+    """Бэкап невозможен или снимок не прошёл проверку"""
+
+
+class BackupResult(NamedTuple):
+    path: Path
+    size: int
+    pages: int
+    seconds: float
+
+
+class VerifyResult(NamedTuple):
+    ok: bool
+    # Ответ PRAGMA integrity_check: "ok" или первые найденные ошибки
+    integrity: str
+    # Версия схемы alembic в снимке
+    revision: Optional[str]
+
+
+def sqlite_path(url: str) -> Optional[Path]:
+    """Путь к файлу базы из DB_URL; None для PostgreSQL и SQLite в памяти"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return None
+    if parsed.database in (None, "", ":memory:"):
+        return None
+    return Path(parsed.database)
+
+
+def snapshots(backup_dir: Path) -> list[Path]:
+    """Снимки в каталоге, от старых к новым (имя содержит время)"""
+    if not backup_dir.is_dir():
+        return []
+    return sorted(
+        p
+        for p in backup_dir.iterdir()
+        if p.name.startswith(SNAPSHOT_PREFIX) and p.name.endswith(SNAPSHOT_SUFFIXES)
+    )
+
+
+def rotate(backup_dir: Path, keep: int) -> list[Path]:
+    """Удаляет снимки старше `keep` последних, возвращает удалённые"""
+    removed = snapshots(backup_dir)[:-keep] if keep > 0 else []
+    for path in removed:
+        path.unlink(missing_ok=True)
+    return removed
+
+
+def _copy_online(source: Path, target: Path, step_pages: int, step_pause: float) -> int:
+    """Копирует базу backup API по шагам, возвращает число страниц"""
+    pages = 0
+
+    def progress(status: int, remaining: int, total: int) -> None:
+        nonlocal pages
+        pages = total
+        # Пауза между шагами отдаёт диск и GIL обработчикам апдейтов
+        if remaining and step_pause:
+            time.sleep(step_pause)
+
+    src = sqlite3.connect(source, isolation_level=None)
+    dst = sqlite3.connect(target)
+    try:
+        # Открытая читающая транзакция фиксирует снимок WAL: шаги копируют
+        # одну версию базы, и запись писателя не перезапускает копирование
+        src.execute("BEGIN")
+        src.execute("SELECT count(*) FROM sqlite_master").fetchone()
+        src.backup(dst, pages=step_pages, progress=progress)
+        src.execute("ROLLBACK")
+        # Копия наследует WAL источника; снимок должен быть одним файлом
+        dst.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dst.close()
+        src.close()
+    return pages
+
+
+def _compress(source: Path, target: Path) -> None:
+    with source.open("rb") as src, gzip.open(target, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst)
+
+
+@contextlib.contextmanager
+def _plain_copy(snapshot: Path) -> Iterator[Path]:
+    """Несжатый файл снимка: сам снимок или временная распакованная копия"""
+    if not snapshot.name.endswith(".gz"):
+        yield snapshot
+        return
+    fd, name = tempfile.mkstemp(suffix=".db", dir=snapshot.parent)
+    os.close(fd)
+    plain = Path(name)
+    try:
+        with gzip.open(snapshot, "rb") as src, plain.open("wb") as dst:
+            shutil.copyfileobj(src, dst)
+        yield plain
+    finally:
+        plain.unlink(missing_ok=True)
+
+
+def _check(path: Path) -> VerifyResult:
+    conn = sqlite3.connect(path.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        rows = conn.execute("PRAGMA integrity_check").fetchall()
+        integrity = "; ".join(str(row[0]) for row in rows[:5])
+        try:
+            row = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+            revision = row[0] if row else None
+        except sqlite3.DatabaseError:
+            revision = None
+    except sqlite3.DatabaseError as e:
+        return VerifyResult(ok=False, integrity=str(e), revision=None)
+    finally:
+        conn.close()
+    return VerifyResult(ok=integrity == "ok", integrity=integrity, revision=revision)
+
+
+def verify_snapshot(snapshot: Path) -> VerifyResult:
+    """PRAGMA integrity_check снимка (сжатый распаковывается во временный файл)"""
+    if not snapshot.is_file():
+        raise BackupError(f"{snapshot} not found")
+    with _plain_copy(snapshot) as plain:
+        return _check(plain)
+
+
+def restore_snapshot(snapshot: Path, database: Path) -> VerifyResult:
+    """
+    Заменяет файл базы снимком. Бот в это время должен быть остановлен:
+    открытые соединения продолжат писать в старый файл.
+    """
+    with _plain_copy(snapshot) as plain:
+        result = _check(plain)
+        if not result.ok:
+            raise BackupError(f"{snapshot} is corrupted: {result.integrity}")
+        staged = database.with_name(database.name + ".restore")
+        shutil.copyfile(plain, staged)
+    # WAL и shm старой базы к снимку не относятся
+    for suffix in ("-wal", "-shm"):
+        database.with_name(database.name + suffix).unlink(missing_ok=True)
+    staged.replace(database)
+    return result
+
+
+def take_snapshot(
+    database: Path,
+    backup_dir: Path,
+    *,
+    compress: bool,
+    step_pages: int,
+    step_pause: float,
+) -> BackupResult:
+    """
+    Снимает проверенный снимок базы. Файл появляется под итоговым именем
+    только целиком (через переименование), поэтому ротация и restore
+    не увидят недописанный снимок.
+    """
+    if not database.is_file():
+        raise BackupError(f"{database} not found")
+    backup_dir.mkdir(parents=True, exist_ok=True)
+    started = time.monotonic()
+    name = SNAPSHOT_PREFIX + time.strftime("%Y%m%d-%H%M%S")
+    plain = backup_dir / f".{name}.db.part"
+    try:
+        pages = _copy_online(database, plain, step_pages, step_pause)
+        result = _check(plain)
+        if not result.ok:
+            raise BackupError(f"snapshot failed integrity_check: {result.integrity}")
+        if compress:
+            target = backup_dir / f"{name}.db.gz"
+            packed = backup_dir / f".{name}.db.gz.part"
+            try:
+                _compress(plain, packed)
+                packed.replace(target)
+            finally:
+                packed.unlink(missing_ok=True)
+        else:
+            target = backup_dir / f"{name}.db"
+            plain.replace(target)
+    finally:
+        plain.unlink(missing_ok=True)
+    return BackupResult(
+        path=target,
+        size=target.stat().st_size,
+        pages=pages,
+        seconds=time.monotonic() - started,
+    )
+
+
+class SqliteBackup:
+    """
+    Бэкапы базы приложения: снимок в потоке, затем ротация.
+    Одновременно идёт не больше одного бэкапа на процесс.
+    """
+
+    def __init__(
+        self,
+        database: Optional[Path],
+        backup_dir: Path,
+        *,
+        keep: int,
+        compress: bool,
+        step_pages: int,
+        step_pause: float,
+    ) -> None:
+        self.database = database
+        self.backup_dir = backup_dir
+        self.keep = keep
+        self.compress = compress
+        self.step_pages = step_pages
+        self.step_pause = step_pause
+        self._lock = asyncio.Lock()
+
+    @property
+    def available(self) -> bool:
+        return self.database is not None
+
+    def last_snapshot_at(self) -> Optional[int]:
+        existing = snapshots(self.backup_dir)
+        return int(existing[-1].stat().st_mtime) if existing else None
+
+    async def run(self) -> BackupResult:
+        if self.database is None:
+            raise BackupError("backups are supported for file SQLite only")
+        async with self._lock:
+            result = await asyncio.to_thread(
+                take_snapshot,
+                self.database,
+                self.backup_dir,
+                compress=self.compress,
+                step_pages=self.step_pages,
+                step_pause=self.step_pause,
+            )
+            removed = await asyncio.to_thread(rotate, self.backup_dir, self.keep)
+        logger.info(
+            "Backup: %s, %d bytes, %d pages in %.1fs, %d old removed",
+            result.path,
+            result.size,
+            result.pages,
+            result.seconds,
+            len(removed),
+        )
+        return result
+
+
+sqlite_backup = SqliteBackup(
+    sqlite_path(settings.DB_URL),
+    Path(settings.BACKUP_DIR),
+    keep=settings.BACKUP_KEEP,
+    compress=settings.BACKUP_COMPRESS,
+    step_pages=settings.BACKUP_STEP_PAGES,
+    step_pause=settings.BACKUP_STEP_PAUSE,
+)
@@ -6,14 +6,22 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     Column,
-    Float,
     ForeignKey,
+    Index,
     Integer,
+    PrimaryKeyConstraint,
     String,
     Table,
     Text,
+    UniqueConstraint,
+)
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    validates,
 )
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
 class Base(DeclarativeBase):
@@ -27,6 +35,16 @@ class BaseWithID(Base):
     )
 
 
+class BaseWithOwner(Base):
+    __abstract__ = True
+    # Владелец данных: tg_id пользователя или общий владелец семьи
+    owner_id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"),
+        ForeignKey("users.tg_id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+
 class BaseWithDate(Base):
     __abstract__ = True
     created_at: Mapped[int] = mapped_column(
@@ -56,6 +74,25 @@ class BaseWithDate(Base):
         )
 
 
+def normalize_title(title: str) -> str:
+    """Ключ поиска дублей: без регистра, пунктуации и буквы «ё»"""
+    text = title.casefold().replace("ё", "е")
+    return " ".join("".join(ch if ch.isalnum() else " " for ch in text).split())
+
+
+def schedule_readable(
+    period: str, day: Optional[int], interval_days: Optional[int]
+) -> str:
+    if period == "monthly":
+        return f"ежемесячно, {day} числа"
+    if period == "weekly":
+        weekdays = ["пн", "вт", "ср", "чт", "пт", "сб", "вс"]
+        return f"еженедельно, {weekdays[(day or 0) % 7]}"
+    if period == "interval":
+        return f"каждые {interval_days} дн."
+    return "вручную"
+
+
 # ------------------- Таблицы -------------------
 
 
@@ -64,23 +101,59 @@ class UserModel(BaseWithDate):
 
     tg_id: Mapped[int] = mapped_column(
         BigInteger().with_variant(Integer(), "sqlite"),
-        unique=True,
         nullable=False,
         primary_key=True,
+        autoincrement=False,
     )
     username: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     first_name: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     last_name: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Как показывать списки фильмов и сериалов: "card" или "list"
+    view_mode: Mapped[str] = mapped_column(
+        String(8), default="card", server_default="card", nullable=False
+    )
 
 
-class BalanceCategoryModel(BaseWithID, BaseWithDate):
+class BalanceCategoryModel(BaseWithID, BaseWithDate, BaseWithOwner):
     __tablename__ = "balance_category"
+    __table_args__ = (
+        # Имена уникальны в пределах владельца; индекс ведёт и выборку категорий
+        UniqueConstraint("owner_id", "name", name="uq_balance_category_owner_id_name"),
+    )
 
-    name: Mapped[str] = mapped_column(String(128), nullable=False, unique=True)
-    max_limit: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    # Суммы хранятся в копейках
+    max_limit: Mapped[Optional[int]] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=True
+    )
     last_reset: Mapped[int] = mapped_column(
         BigInteger(), default=lambda: int(time.time())
     )
+    reset_period: Mapped[str] = mapped_column(
+        String(16), default="manual", server_default="manual", nullable=False
+    )  # 'manual', 'monthly', 'weekly', 'interval'
+    reset_day: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )  # день месяца (1-31) для monthly или день недели (0-6) для weekly
+    reset_interval_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    next_reset: Mapped[Optional[int]] = mapped_column(
+        BigInteger(), nullable=True, index=True
+    )
+    # Пороги уведомлений в процентах от max_limit, через запятую: "80,100"
+    alert_thresholds: Mapped[Optional[str]] = mapped_column(
+        String(64), default="80,100", server_default="80,100", nullable=True
+    )
+    # Сумма расходов текущего периода, поддерживается при каждой записи
+    period_expense: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"),
+        default=0,
+        server_default="0",
+        nullable=False,
+    )
+    # Старший уже отправленный порог текущего периода
+    alert_level: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
 
     balances: Mapped[List["BalanceModel"]] = relationship(
         "BalanceModel", back_populates="category"
@@ -92,6 +165,20 @@ class BalanceCategoryModel(BaseWithID, BaseWithDate):
             "%d.%m.%Y %H:%M"
         )
 
+    @property
+    def next_reset_readable(self) -> str:
+        if self.next_reset is None:
+            return "—"
+        return datetime.datetime.fromtimestamp(self.next_reset).strftime(
+            "%d.%m.%Y %H:%M"
+        )
+
+    @property
+    def reset_schedule_readable(self) -> str:
+        return schedule_readable(
+            self.reset_period, self.reset_day, self.reset_interval_days
+        )
+
 
 class TagModel(BaseWithID, BaseWithDate):
     __tablename__ = "tags"
@@ -112,19 +199,94 @@ balance_tags = Table(
 )
 
 
-class BalanceModel(BaseWithID, BaseWithDate):
+# Теги шаблонов регулярных записей
+recurring_tags = Table(
+    "recurring_tags",
+    Base.metadata,
+    Column(
+        "recurring_id", ForeignKey("recurring.id", ondelete="CASCADE"), primary_key=True
+    ),
+    Column("tag_id", ForeignKey("tags.id"), primary_key=True),
+)
+
+
+class RecurringModel(BaseWithID, BaseWithDate, BaseWithOwner):
+    """Шаблон регулярной записи: подписки, аренда, зарплата"""
+
+    __tablename__ = "recurring"
+    __table_args__ = (Index("ix_recurring_owner_id", "owner_id"),)
+
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    amount: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )  # в копейках
+    category_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=True
+    )
+    period: Mapped[str] = mapped_column(
+        String(16), nullable=False
+    )  # 'monthly', 'weekly', 'interval'
+    day: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    interval_days: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Время следующей записи
+    next_run: Mapped[Optional[int]] = mapped_column(
+        BigInteger(), nullable=True, index=True
+    )
+
+    category: Mapped[Optional["BalanceCategoryModel"]] = relationship(
+        "BalanceCategoryModel"
+    )
+    tags: Mapped[List["TagModel"]] = relationship("TagModel", secondary=recurring_tags)
+
+    @property
+    def schedule_readable(self) -> str:
+        return schedule_readable(self.period, self.day, self.interval_days)
+
+    @property
+    def next_run_readable(self) -> str:
+        if self.next_run is None:
+            return "—"
+        return datetime.datetime.fromtimestamp(self.next_run).strftime("%d.%m.%Y %H:%M")
+
+
+class BalanceModel(BaseWithID, BaseWithDate, BaseWithOwner):
     __tablename__ = "balance"
+    __table_args__ = (
+        Index("ix_balance_category_id_created_at", "category_id", "created_at"),
+        Index(
+            "ix_balance_owner_id_category_id_created_at",
+            "owner_id",
+            "category_id",
+            "created_at",
+        ),
+        # Одна запись на срабатывание шаблона: повторный запуск не дублирует
+        UniqueConstraint(
+            "recurring_id",
+            "created_at",
+            name="uq_balance_recurring_id_created_at",
+        ),
+        # Без AUTOINCREMENT SQLite выдаёт id как max(id) + 1: после удаления
+        # самой новой записи новая получила бы id, уже ушедший в balance_archive
+        {"sqlite_autoincrement": True},
+    )
 
     type: Mapped[str] = mapped_column(
         String(16), nullable=False
     )  # 'income' или 'expense'
     name: Mapped[str] = mapped_column(String(128), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    amount: Mapped[float] = mapped_column(Float, nullable=False)
+    amount: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )  # в копейках
 
     category_id: Mapped[Optional[int]] = mapped_column(
         ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=True
     )
+    # Шаблон, из которого создана запись
+    recurring_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("recurring.id", ondelete="SET NULL"), nullable=True
+    )
 
     category: Mapped[Optional["BalanceCategoryModel"]] = relationship(
         "BalanceCategoryModel", back_populates="balances"
@@ -138,31 +300,196 @@ class BalanceModel(BaseWithID, BaseWithDate):
         return {"income": "Доход", "expense": "Расход"}.get(self.type, self.type)
 
 
-class MovieModel(BaseWithID, BaseWithDate):
+class BalanceResetModel(BaseWithID):
+    """Журнал сбросов лимита: по нему считаются периоды"""
+
+    __tablename__ = "balance_reset"
+    __table_args__ = (
+        Index("ix_balance_reset_category_id_reset_at", "category_id", "reset_at"),
+    )
+
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=False
+    )
+    reset_at: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+
+
+# Теги архивных записей
+balance_archive_tags = Table(
+    "balance_archive_tags",
+    Base.metadata,
+    Column(
+        "balance_id",
+        ForeignKey("balance_archive.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column("tag_id", ForeignKey("tags.id"), primary_key=True),
+)
+
+
+class BalanceArchiveModel(BaseWithDate, BaseWithOwner):
+    """
+    Записи старых периодов, перенесённые из `balance`.
+    Колонки и id те же, что в BalanceModel
+    """
+
+    __tablename__ = "balance_archive"
+    __table_args__ = (
+        Index("ix_balance_archive_category_id_created_at", "category_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"),
+        primary_key=True,
+        autoincrement=False,
+    )
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    amount: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )
+    category_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=True
+    )
+    recurring_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("recurring.id", ondelete="SET NULL"), nullable=True
+    )
+
+    tags: Mapped[List["TagModel"]] = relationship(
+        "TagModel", secondary=balance_archive_tags
+    )
+
+
+class BalancePeriodSummaryModel(BaseWithID):
+    """Итоги архивных записей категории за период по типу (доход/расход)"""
+
+    __tablename__ = "balance_period_summary"
+    __table_args__ = (
+        UniqueConstraint(
+            "category_id",
+            "period_start",
+            "type",
+            name="uq_balance_period_summary_category_id_period_start_type",
+        ),
+    )
+
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=False
+    )
+    # 0 - период до первой записи в журнале сбросов
+    period_start: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    period_end: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    type: Mapped[str] = mapped_column(String(16), nullable=False)
+    total: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )  # в копейках
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class CategoryPeriodSnapshotModel(BaseWithID):
+    """Итоги категории за период, записываются при обнулении лимита"""
+
+    __tablename__ = "category_period_snapshot"
+    __table_args__ = (
+        Index(
+            "ix_category_period_snapshot_category_id_period_end",
+            "category_id",
+            "period_end",
+        ),
+    )
+
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("balance_category.id", ondelete="CASCADE"), nullable=False
+    )
+    period_start: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    period_end: Mapped[int] = mapped_column(BigInteger(), nullable=False)
+    # Суммы в копейках
+    spent: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )
+    income: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=False
+    )
+    max_limit: Mapped[Optional[int]] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"), nullable=True
+    )
+    items: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Самые частые теги периода через запятую
+    top_tags: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+
+    @property
+    def period_readable(self) -> str:
+        start = (
+            datetime.datetime.fromtimestamp(self.period_start).strftime("%d.%m.%Y")
+            if self.period_start
+            else "…"
+        )
+        end = datetime.datetime.fromtimestamp(self.period_end).strftime("%d.%m.%Y")
+        return f"{start} – {end}"
+
+
+class MovieModel(BaseWithID, BaseWithDate, BaseWithOwner):
     __tablename__ = "movies"
+    __table_args__ = (
+        Index(
+            "ix_movies_owner_id_watched_created_at", "owner_id", "watched", "created_at"
+        ),
+        # Поиск дублей при добавлении одним запросом по индексу
+        Index("ix_movies_owner_id_title_norm_year", "owner_id", "title_norm", "year"),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Заполняется из title, см. normalize_title
+    title_norm: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
     poster: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # file_unique_id постера: поиск одинаковых постеров и ключ кэша превью
+    poster_unique_id: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     source: Mapped[Optional[str]] = mapped_column(
         String(50), nullable=True
     )  # tmdb / kinopoisk
     external_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     watched: Mapped[bool] = mapped_column(Boolean, default=False, index=True)
 
+    @validates("title")
+    def _set_title_norm(self, key: str, title: str) -> str:
+        self.title_norm = normalize_title(title)
+        return title
+
     @property
     def status(self) -> str:
         return "Просмотренно" if self.watched else "Хочу посмотреть"
 
 
-class SeriesModel(BaseWithID, BaseWithDate):
+class SeriesModel(BaseWithID, BaseWithDate, BaseWithOwner):
     __tablename__ = "series"
+    __table_args__ = (
+        Index(
+            "ix_series_owner_id_watched_created_at", "owner_id", "watched", "created_at"
+        ),
+        Index(
+            "ix_series_owner_id_watch_status_created_at",
+            "owner_id",
+            "watch_status",
+            "created_at",
+        ),
+        Index("ix_series_owner_id_title_norm_year", "owner_id", "title_norm", "year"),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
+    # Заполняется из title, см. normalize_title
+    title_norm: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(String)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
     poster: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # file_unique_id постера: поиск одинаковых постеров и ключ кэша превью
+    poster_unique_id: Mapped[Optional[str]] = mapped_column(
+        String(64), nullable=True, index=True
+    )
     source: Mapped[Optional[str]] = mapped_column(
         String(50), nullable=True
     )  # tmdb / kinopoisk
@@ -176,6 +503,11 @@ class SeriesModel(BaseWithID, BaseWithDate):
     episode_current: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     season_current: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    @validates("title")
+    def _set_title_norm(self, key: str, title: str) -> str:
+        self.title_norm = normalize_title(title)
+        return title
+
     @property
     def status(self) -> str:
         if self.watch_status == "completed":
@@ -185,3 +517,19 @@ class SeriesModel(BaseWithID, BaseWithDate):
         if self.watch_status == "planned":
             return "Запланировано"
         return "Просмотренно" if self.watched else "Хочу посмотреть"
+
+
+class ListCounterModel(BaseWithOwner):
+    """
+    Длины списков для навигации «3 / 41» без COUNT(*) на каждый клик.
+
+    Меняются репозиториями в той же транзакции, что и сами записи;
+    расхождения исправляет периодическая сверка.
+    """
+
+    __tablename__ = "list_counters"
+    __table_args__ = (PrimaryKeyConstraint("owner_id", "name"),)
+
+    # Имя списка, см. db.repository.counter
+    name: Mapped[str] = mapped_column(String(64), nullable=False)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
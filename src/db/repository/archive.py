@@ -0,0 +1,158 @@
+import bisect
+from typing import NamedTuple, Sequence
+
+from sqlalchemy import ScalarSelect, delete, desc, exists, insert, select
+
+from db.models import (
+    BalanceArchiveModel,
+    BalanceCategoryModel,
+    BalanceModel,
+    BalancePeriodSummaryModel,
+    BalanceResetModel,
+    balance_archive_tags,
+    balance_tags,
+)
+from db.repository.base import BaseSqlAlchemyRepo
+
+# Колонки, общие для balance и balance_archive
+_COLUMNS = [
+    "id",
+    "created_at",
+    "updated_at",
+    "type",
+    "name",
+    "description",
+    "amount",
+    "category_id",
+    "recurring_id",
+    "owner_id",
+]
+
+
+class ArchiveDue(NamedTuple):
+    category_id: int
+    # Записи раньше этой границы уходят в архив
+    cutoff: int
+
+
+def period_bounds(resets: Sequence[int], ts: int) -> tuple[int, int]:
+    """(начало, конец) периода, в который попадает `ts`, по журналу сбросов"""
+    i = bisect.bisect_right(resets, ts)
+    start = resets[i - 1] if i else 0
+    end = resets[i] if i < len(resets) else ts
+    return start, end
+
+
+def _cutoff(keep: int) -> ScalarSelect[int]:
+    # Момент обнуления лимита номер keep от конца: всё раньше - старые периоды
+    return (
+        select(BalanceResetModel.reset_at)
+        .where(BalanceResetModel.category_id == BalanceCategoryModel.id)
+        .order_by(desc(BalanceResetModel.reset_at))
+        .limit(1)
+        .offset(keep - 1)
+        .scalar_subquery()
+    )
+
+
+class ArchiveRepo(BaseSqlAlchemyRepo):
+    async def get_due(self, keep: int) -> list[ArchiveDue]:
+        """Категории, где есть записи старше `keep` последних сбросов"""
+        cutoff = _cutoff(keep)
+        stmt = select(BalanceCategoryModel.id, cutoff).where(
+            exists().where(
+                BalanceModel.category_id == BalanceCategoryModel.id,
+                BalanceModel.created_at < cutoff,
+            )
+        )
+        result = await self.session.execute(stmt)
+        return [ArchiveDue(row[0], row[1]) for row in result.all()]
+
+    async def get_resets(self, category_id: int) -> list[int]:
+        stmt = (
+            select(BalanceResetModel.reset_at)
+            .where(BalanceResetModel.category_id == category_id)
+            .order_by(BalanceResetModel.reset_at)
+        )
+        result = await self.session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def archive_chunk(
+        self, category_id: int, cutoff: int, resets: Sequence[int], limit: int
+    ) -> int:
+        """
+        Переносит в архив до `limit` записей категории старше `cutoff`, включая
+        теги, и дописывает их в итоги периодов. Возвращает число записей.
+        """
+        stmt = (
+            select(
+                BalanceModel.id,
+                BalanceModel.created_at,
+                BalanceModel.type,
+                BalanceModel.amount,
+            )
+            .where(
+                BalanceModel.category_id == category_id,
+                BalanceModel.created_at < cutoff,
+            )
+            .order_by(BalanceModel.id)
+            .limit(limit)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return 0
+        ids = [row.id for row in rows]
+
+        columns = [getattr(BalanceModel, name) for name in _COLUMNS]
+        await self.session.execute(
+            insert(BalanceArchiveModel).from_select(
+                _COLUMNS, select(*columns).where(BalanceModel.id.in_(ids))
+            )
+        )
+        await self.session.execute(
+            insert(balance_archive_tags).from_select(
+                ["balance_id", "tag_id"],
+                select(balance_tags.c.balance_id, balance_tags.c.tag_id).where(
+                    balance_tags.c.balance_id.in_(ids)
+                ),
+            )
+        )
+
+        summary: dict[tuple[int, str], list[int]] = {}
+        for row in rows:
+            start, end = period_bounds(resets, row.created_at)
+            item = summary.setdefault((start, row.type), [end, 0, 0])
+            item[1] += row.amount
+            item[2] += 1
+        table = BalancePeriodSummaryModel.__table__
+        upsert = self.insert(table)
+        await self.session.execute(
+            upsert.on_conflict_do_update(
+                index_elements=["category_id", "period_start", "type"],
+                set_={
+                    "total": table.c.total + upsert.excluded.total,
+                    "count": table.c.count + upsert.excluded.count,
+                },
+            ),
+            [
+                {
+                    "category_id": category_id,
+                    "period_start": start,
+                    "period_end": end,
+                    "type": balance_type,
+                    "total": total,
+                    "count": count,
+                }
+                for (start, balance_type), (end, total, count) in summary.items()
+            ],
+        )
+
+        await self.session.execute(
+            delete(balance_tags).where(balance_tags.c.balance_id.in_(ids))
+        )
+        await self.session.execute(
+            delete(BalanceModel)
+            .where(BalanceModel.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        return len(ids)
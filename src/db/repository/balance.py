@@ -1,15 +1,32 @@
-from typing import Sequence
+from collections import Counter
+from typing import NamedTuple, Sequence
 
-from sqlalchemy import desc, select
+from sqlalchemy import desc, insert, select, union_all
+from sqlalchemy.orm import aliased, selectinload
 
 from config.consts import DEFAULT_PAGE_LIMIT
-from db.models import BalanceCategoryModel, BalanceModel, TagModel
-from db.repository.base import BaseSqlAlchemyRepo
+from db.models import (
+    BalanceArchiveModel,
+    BalanceCategoryModel,
+    BalanceModel,
+    TagModel,
+    balance_tags,
+)
+from db.repository.base import BaseSqlAlchemyRepo, Cursor, after_cursor
+from db.repository.counter import CounterRepo, balance_list
 
 Count = int
 HasNext = bool
 
 
+class NewBalance(NamedTuple):
+    name: str
+    amount: int
+    balance_type: str
+    category_id: int | None
+    tag_ids: list[int]
+
+
 class BalanceRepo(BaseSqlAlchemyRepo):
     async def get_by_category_and_last_reset(
         self, category_id: int, skip: int = 0
@@ -21,8 +38,11 @@ class BalanceRepo(BaseSqlAlchemyRepo):
                 BalanceModel.category_id == BalanceCategoryModel.id,
             )
             .where(
-                BalanceCategoryModel.id == category_id,
-                BalanceModel.created_at > BalanceCategoryModel.last_reset,
+                # owner_id первым: запрос идёт по индексу (owner_id, category_id,
+                # created_at) и не видит чужих записей
+                self.owned(BalanceModel),
+                BalanceModel.category_id == category_id,
+                BalanceModel.created_at >= BalanceCategoryModel.last_reset,
             )
             .order_by(desc(BalanceModel.created_at))
             .limit(DEFAULT_PAGE_LIMIT + 1)
@@ -38,20 +58,115 @@ class BalanceRepo(BaseSqlAlchemyRepo):
 
         return balances, has_next
 
+    async def get_page(
+        self, category_id: int, cursor: Cursor | None, limit: int
+    ) -> tuple[Sequence[BalanceModel], HasNext]:
+        """Записи категории и их теги, от новых к старым, после `cursor`"""
+        stmt = (
+            select(BalanceModel)
+            .where(
+                self.owned(BalanceModel),
+                BalanceModel.category_id == category_id,
+                after_cursor(BalanceModel, cursor),
+            )
+            .options(selectinload(BalanceModel.tags))
+            .order_by(desc(BalanceModel.created_at), desc(BalanceModel.id))
+            .limit(limit + 1)
+        )
+        balances = (await self.session.execute(stmt)).scalars().all()
+        return balances[:limit], len(balances) > limit
+
+    async def get_history(
+        self, category_id: int, skip: int = 0
+    ) -> tuple[Sequence[BalanceModel], HasNext]:
+        """
+        История категории целиком, включая записи в архиве.
+        Архивные строки приходят как BalanceModel (без тегов)
+        """
+        columns = [c.name for c in BalanceArchiveModel.__table__.columns]
+        hot = select(*(getattr(BalanceModel, c) for c in columns)).where(
+            self.owned(BalanceModel), BalanceModel.category_id == category_id
+        )
+        archived = select(*(getattr(BalanceArchiveModel, c) for c in columns)).where(
+            self.owned(BalanceArchiveModel),
+            BalanceArchiveModel.category_id == category_id,
+        )
+        history = aliased(BalanceModel, union_all(hot, archived).subquery())
+        stmt = (
+            select(history)
+            .order_by(desc(history.created_at), desc(history.id))
+            .limit(DEFAULT_PAGE_LIMIT + 1)
+            .offset(skip)
+        )
+
+        res = await self.session.execute(stmt)
+        balances = res.scalars().all()
+
+        has_next = len(balances) > DEFAULT_PAGE_LIMIT
+        if has_next:
+            balances = balances[:DEFAULT_PAGE_LIMIT]
+
+        return balances, has_next
+
     async def create(
         self,
         name: str,
-        amount: float,
+        amount: int,
         balance_type: str,
         category_id: int | None = None,
         tags: list[TagModel] | None = None,
+        *,
+        recurring_id: int | None = None,
     ) -> BalanceModel:
         balance = BalanceModel(
             name=name,
             amount=amount,
             type=balance_type,
             category_id=category_id,
+            owner_id=self.owner_id,
             tags=tags or [],
+            recurring_id=recurring_id,
         )
         self.session.add(balance)
+        if category_id is not None:
+            await CounterRepo(self.session, self.owner_id).add(
+                (balance_list(category_id), 1)
+            )
         return balance
+
+    async def create_many(self, balances: Sequence[NewBalance]) -> list[int]:
+        """
+        Создаёт записи одним INSERT, привязки тегов - вторым.
+        Возвращает id записей в порядке `balances`.
+        """
+        if not balances:
+            return []
+        stmt = self.insert(BalanceModel.__table__).returning(
+            BalanceModel.id, sort_by_parameter_order=True
+        )
+        result = await self.session.execute(
+            stmt,
+            [
+                {
+                    "name": b.name,
+                    "amount": b.amount,
+                    "type": b.balance_type,
+                    "category_id": b.category_id,
+                    "owner_id": self.owner_id,
+                }
+                for b in balances
+            ],
+        )
+        ids = list(result.scalars())
+        links = [
+            {"balance_id": balance_id, "tag_id": tag_id}
+            for balance_id, b in zip(ids, balances, strict=True)
+            for tag_id in b.tag_ids
+        ]
+        if links:
+            await self.session.execute(insert(balance_tags).values(links))
+        per_category = Counter(b.category_id for b in balances if b.category_id)
+        await CounterRepo(self.session, self.owner_id).add(
+            *((balance_list(cid), count) for cid, count in per_category.items())
+        )
+        return ids
@@ -1,6 +1,94 @@
+import random
+from typing import Any, Collection, Optional
+
+from sqlalchemy import ColumnElement, func, literal, select, true, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from db.revisions import OWNERS_KEY
+
+# Позиция в списке по убыванию (created_at, id): следующая страница - после неё
+Cursor = tuple[int, int]
+
+
+def after_cursor(model: Any, cursor: Optional[Cursor]) -> ColumnElement[bool]:
+    """Условие keyset-пагинации: строки после `cursor` в порядке убывания"""
+    if cursor is None:
+        return true()
+    created_at, id_ = cursor
+    return tuple_(model.created_at, model.id) < tuple_(
+        literal(created_at), literal(id_)
+    )
+
+
+def year_between(
+    model: Any, year_from: Optional[int], year_to: Optional[int]
+) -> ColumnElement[bool]:
+    """Условие на год выпуска, границы включительно и необязательны"""
+    if year_from is not None and year_to is not None:
+        return model.year.between(year_from, year_to)
+    if year_from is not None:
+        return model.year >= year_from
+    if year_to is not None:
+        return model.year <= year_to
+    return true()
+
 
 class BaseSqlAlchemyRepo:
-    def __init__(self, session: AsyncSession) -> None:
+    """
+    Основа репозиториев.
+
+    Если задан `owner_id`, выборки и изменения ограничены данными владельца,
+    новые строки создаются на него. Без `owner_id` (фоновые задачи) видны
+    строки всех владельцев.
+    """
+
+    def __init__(self, session: AsyncSession, owner_id: Optional[int] = None) -> None:
         self.session = session
+        self.owner_id = owner_id
+        # Чьи ревизии сдвигают массовые запросы сессии, см. db.revisions
+        session.info.setdefault(OWNERS_KEY, set()).add(owner_id)
+
+    def owned(self, model: Any) -> ColumnElement[bool]:
+        """Условие на владельца строк `model`"""
+        if self.owner_id is None:
+            return true()
+        return model.owner_id == self.owner_id
+
+    @property
+    def dialect(self) -> str:
+        return self.session.get_bind().dialect.name
+
+    def insert(self, table: Any) -> postgresql.Insert | sqlite.Insert:
+        """
+        INSERT текущего диалекта.
+
+        SQLite и PostgreSQL поддерживают одинаковые on_conflict_do_nothing,
+        on_conflict_do_update и returning, поэтому upsert пишется один раз.
+        """
+        if self.dialect == "postgresql":
+            return postgresql.insert(table)
+        return sqlite.insert(table)
+
+    async def pick_random(
+        self, model: Any, *where: Any, exclude: Collection[int] = ()
+    ) -> Any:
+        """
+        Случайная строка без ORDER BY RANDOM(): количество подходящих строк
+        и OFFSET по индексу, который ведёт where и заканчивается created_at.
+        Каждый из двух запросов читает лишь свой кусок индекса, не всю таблицу.
+        """
+        if exclude:
+            where = (*where, model.id.not_in(exclude))
+        count = select(func.count()).select_from(model).where(*where)
+        total = (await self.session.execute(count)).scalar_one()
+        if not total:
+            return None
+        stmt = (
+            select(model)
+            .where(*where)
+            .order_by(model.created_at)
+            .offset(random.randrange(total))  # noqa: S311
+            .limit(1)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
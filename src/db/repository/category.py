@@ -2,17 +2,51 @@ import logging
 import time
 from typing import Any, NamedTuple, Optional, Sequence, TypeVarTuple, Unpack, overload
 
-from sqlalchemy import case, delete, func, literal, select, update
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Row,
+    case,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
 
-from db.models import BalanceCategoryModel, BalanceModel
+from db.models import (
+    BalanceCategoryModel,
+    BalanceModel,
+    BalanceResetModel,
+    CategoryPeriodSnapshotModel,
+    TagModel,
+    balance_tags,
+)
 from db.repository.base import BaseSqlAlchemyRepo
+from db.repository.counter import CounterRepo, balance_list
 
 logger = logging.getLogger(__name__)
 
+# Сколько тегов попадает в итоги периода
+SNAPSHOT_TOP_TAGS = 3
+
 
 class CategoryWithLimit(NamedTuple):
     category: BalanceCategoryModel
-    limit: float
+    limit: int
+
+
+class ExpenseTotals(NamedTuple):
+    category_id: int
+    owner_id: int
+    name: str
+    before: int
+    after: int
+    max_limit: Optional[int]
+    alert_thresholds: Optional[str]
+    alert_level: int
 
 
 _Ts = TypeVarTuple("_Ts")  # для нескольких полей
@@ -37,6 +71,7 @@ class CategoryRepo(BaseSqlAlchemyRepo):
 
     async def get(self, *fields: Any, id: int | None = None) -> Any:  # type: ignore
         stmt = select(*fields) if fields else select(BalanceCategoryModel)
+        stmt = stmt.where(self.owned(BalanceCategoryModel))
 
         if id is not None:
             stmt = stmt.where(BalanceCategoryModel.id == id)
@@ -53,29 +88,23 @@ class CategoryRepo(BaseSqlAlchemyRepo):
         return result.scalars().all()
 
     async def get_with_cur_limit(self) -> list[CategoryWithLimit]:
+        # Условия периода в ON (не в CASE): так работает индекс
+        # (category_id, created_at) и в SUM попадают только нужные строки
         stmt = (
             select(
                 BalanceCategoryModel,
-                func.coalesce(
-                    func.sum(
-                        case(
-                            (
-                                (BalanceModel.type == "expense")
-                                & (
-                                    BalanceModel.created_at
-                                    >= BalanceCategoryModel.last_reset
-                                ),
-                                BalanceModel.amount,
-                            ),
-                            else_=literal(0),
-                        )
-                    ),
-                    0,
-                ).label("current_expense"),
+                # SUM(bigint) в PostgreSQL — numeric, приводим обратно к целому
+                cast(func.coalesce(func.sum(BalanceModel.amount), 0), BigInteger).label(
+                    "current_expense"
+                ),
             )
             .outerjoin(
-                BalanceModel, BalanceModel.category_id == BalanceCategoryModel.id
+                BalanceModel,
+                (BalanceModel.category_id == BalanceCategoryModel.id)
+                & (BalanceModel.type == "expense")
+                & (BalanceModel.created_at >= BalanceCategoryModel.last_reset),
             )
+            .where(self.owned(BalanceCategoryModel))
             .group_by(BalanceCategoryModel.id)
         )
 
@@ -85,27 +114,238 @@ class CategoryRepo(BaseSqlAlchemyRepo):
         return [CategoryWithLimit(category=row[0], limit=row[1]) for row in rows]
 
     async def create(
-        self, name: str, max_limit: Optional[float], last_reset: int
+        self, name: str, max_limit: Optional[int], last_reset: int
     ) -> BalanceCategoryModel:
         entity = BalanceCategoryModel(
-            name=name, max_limit=max_limit, last_reset=last_reset
+            name=name,
+            max_limit=max_limit,
+            last_reset=last_reset,
+            owner_id=self.owner_id,
         )
         self.session.add(entity)
         return entity
 
     async def update(self, cid: int, **updates: Any) -> None:
+        # Отправленный порог считался от старого лимита или старых порогов:
+        # не обнулив уровень, после повышения лимита новые пороги не придут
+        if "max_limit" in updates or "alert_thresholds" in updates:
+            updates.setdefault("alert_level", 0)
         stmt = (
             update(BalanceCategoryModel)
-            .where(BalanceCategoryModel.id == cid)
+            .where(BalanceCategoryModel.id == cid, self.owned(BalanceCategoryModel))
             .values(**updates)
         )
         await self.session.execute(stmt)
 
+    async def snapshot_periods(
+        self, period_end: Any, ids: Optional[Sequence[int]] = None
+    ) -> None:
+        """
+        Сохраняет итоги текущего периода категорий одним INSERT ... SELECT.
+
+        Вызывается в транзакции обнуления до правки last_reset. `period_end`
+        - граница периода: число или выражение от BalanceCategoryModel.id
+        """
+        in_period = (
+            (BalanceModel.category_id == BalanceCategoryModel.id)
+            & (BalanceModel.created_at >= BalanceCategoryModel.last_reset)
+            & (BalanceModel.created_at < period_end)
+        )
+        # Порядок строк подзапроса не задаёт порядок склейки ни в SQLite,
+        # ни в PostgreSQL: место тега считается явно, и теги склеиваются
+        # по местам
+        ranked = (
+            select(
+                TagModel.name.label("name"),
+                func.row_number()
+                .over(order_by=(func.count().desc(), TagModel.name))
+                .label("place"),
+            )
+            .select_from(
+                balance_tags.join(TagModel, TagModel.id == balance_tags.c.tag_id).join(
+                    BalanceModel, BalanceModel.id == balance_tags.c.balance_id
+                )
+            )
+            .where(in_period)
+            .group_by(TagModel.id, TagModel.name)
+            .correlate(BalanceCategoryModel)
+            .subquery()
+        )
+        places: list[ColumnElement[Any]] = [
+            func.max(case((ranked.c.place == place, ranked.c.name)))
+            for place in range(1, SNAPSHOT_TOP_TAGS + 1)
+        ]
+        top_tags = places[0]
+        for name in places[1:]:
+            top_tags = top_tags + func.coalesce(literal(", ") + name, "")
+
+        def total(balance_type: str) -> Any:
+            amount = case((BalanceModel.type == balance_type, BalanceModel.amount))
+            return cast(func.coalesce(func.sum(amount), 0), BigInteger)
+
+        stmt = (
+            select(
+                BalanceCategoryModel.id,
+                BalanceCategoryModel.last_reset,
+                period_end,
+                total("expense"),
+                total("income"),
+                BalanceCategoryModel.max_limit,
+                func.count(BalanceModel.id),
+                select(top_tags).scalar_subquery().correlate(BalanceCategoryModel),
+            )
+            .outerjoin(BalanceModel, in_period)
+            .where(self.owned(BalanceCategoryModel))
+            .group_by(BalanceCategoryModel.id)
+        )
+        if ids is not None:
+            stmt = stmt.where(BalanceCategoryModel.id.in_(ids))
+        await self.session.execute(
+            insert(CategoryPeriodSnapshotModel).from_select(
+                [
+                    "category_id",
+                    "period_start",
+                    "period_end",
+                    "spent",
+                    "income",
+                    "max_limit",
+                    "items",
+                    "top_tags",
+                ],
+                stmt,
+            )
+        )
+
     async def reset_all_limits(self) -> None:
         current_ts = int(time.time())
-        stmt = update(BalanceCategoryModel).values(last_reset=current_ts)
+        await self.snapshot_periods(literal(current_ts, BigInteger))
+        stmt = (
+            update(BalanceCategoryModel)
+            .where(self.owned(BalanceCategoryModel))
+            .values(last_reset=current_ts, period_expense=0, alert_level=0)
+        )
+        await self.session.execute(stmt)
+        await self.session.execute(
+            insert(BalanceResetModel).from_select(
+                ["category_id", "reset_at"],
+                select(BalanceCategoryModel.id, literal(current_ts, BigInteger)).where(
+                    self.owned(BalanceCategoryModel)
+                ),
+            )
+        )
+        await CounterRepo(self.session, self.owner_id).recount_balance(None)
+
+    async def add_expense(self, cid: int, amount: int) -> ExpenseTotals | None:
+        """Прибавляет расход к сумме текущего периода, O(1) без агрегатов"""
+        stmt = (
+            update(BalanceCategoryModel)
+            .where(BalanceCategoryModel.id == cid, self.owned(BalanceCategoryModel))
+            .values(period_expense=BalanceCategoryModel.period_expense + amount)
+            .returning(
+                BalanceCategoryModel.id,
+                BalanceCategoryModel.owner_id,
+                BalanceCategoryModel.name,
+                BalanceCategoryModel.period_expense,
+                BalanceCategoryModel.max_limit,
+                BalanceCategoryModel.alert_thresholds,
+                BalanceCategoryModel.alert_level,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        row = (await self.session.execute(stmt)).first()
+        if row is None:
+            return None
+        return ExpenseTotals(
+            category_id=row.id,
+            owner_id=row.owner_id,
+            name=row.name,
+            before=row.period_expense - amount,
+            after=row.period_expense,
+            max_limit=row.max_limit,
+            alert_thresholds=row.alert_thresholds,
+            alert_level=row.alert_level,
+        )
+
+    async def set_alert_level(self, cid: int, level: int) -> None:
+        stmt = (
+            update(BalanceCategoryModel)
+            .where(BalanceCategoryModel.id == cid)
+            .values(alert_level=level)
+            .execution_options(synchronize_session=False)
+        )
         await self.session.execute(stmt)
 
+    async def get_many(self, ids: Sequence[int]) -> Sequence[BalanceCategoryModel]:
+        stmt = select(BalanceCategoryModel).where(
+            BalanceCategoryModel.id.in_(ids), self.owned(BalanceCategoryModel)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_reset_due(self) -> Sequence[Row[tuple[int, int]]]:
+        """(id, next_reset) категорий, где включён автосброс"""
+        stmt = select(BalanceCategoryModel.id, BalanceCategoryModel.next_reset).where(
+            BalanceCategoryModel.reset_period != "manual",
+            BalanceCategoryModel.next_reset.is_not(None),
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def reset_limits(self, resets: dict[int, tuple[int, int | None]]) -> None:
+        """
+        Сбрасывает лимиты нескольких категорий одним UPDATE.
+
+        `resets` — {category_id: (last_reset, next_reset)}
+        """
+        if not resets:
+            return
+        last_reset = case(
+            {cid: last for cid, (last, _) in resets.items()},
+            value=BalanceCategoryModel.id,
+        )
+        await self.snapshot_periods(last_reset, list(resets))
+        # Граница периода может быть в прошлом (догоняем простой), поэтому
+        # расходы, сделанные после неё, остаются в новом периоде
+        period_expense = (
+            select(func.coalesce(func.sum(BalanceModel.amount), 0))
+            .where(
+                BalanceModel.category_id == BalanceCategoryModel.id,
+                BalanceModel.type == "expense",
+                BalanceModel.created_at >= last_reset,
+            )
+            .scalar_subquery()
+        )
+        stmt = (
+            update(BalanceCategoryModel)
+            .where(BalanceCategoryModel.id.in_(resets))
+            .values(
+                last_reset=last_reset,
+                # Без cast PostgreSQL типизирует CASE из одних NULL как text
+                next_reset=cast(
+                    case(
+                        {cid: nxt for cid, (_, nxt) in resets.items()},
+                        value=BalanceCategoryModel.id,
+                    ),
+                    BigInteger,
+                ),
+                period_expense=period_expense,
+                alert_level=0,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+        await self.session.execute(
+            insert(BalanceResetModel),
+            [
+                {"category_id": cid, "reset_at": last}
+                for cid, (last, _) in resets.items()
+            ],
+        )
+        await CounterRepo(self.session, self.owner_id).recount_balance(list(resets))
+
     async def delete(self, cid: int) -> None:
-        stmt = delete(BalanceCategoryModel).where(BalanceCategoryModel.id == cid)
+        stmt = delete(BalanceCategoryModel).where(
+            BalanceCategoryModel.id == cid, self.owned(BalanceCategoryModel)
+        )
         await self.session.execute(stmt)
+        await CounterRepo(self.session, self.owner_id).drop([balance_list(cid)])
@@ -0,0 +1,192 @@
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import and_, delete, func, select, true
+
+from db.models import (
+    BalanceCategoryModel,
+    BalanceModel,
+    ListCounterModel,
+    MovieModel,
+    SeriesModel,
+)
+from db.repository.base import BaseSqlAlchemyRepo
+from db.revisions import REVISION_PREFIX, revision_name
+
+# Статусы сериалов, которым соответствует отдельный список
+SERIES_STATUS_LISTS = ("planned", "watching")
+
+CounterKey = tuple[int, str]
+
+
+def movies_list(watched: bool) -> str:
+    return "movies:watched" if watched else "movies:want"
+
+
+def series_lists(watch_status: Optional[str], watched: bool) -> set[str]:
+    """Списки, в которых показывается сериал"""
+    lists = {f"series:{watch_status}"} if watch_status in SERIES_STATUS_LISTS else set()
+    if watched:
+        lists.add("series:watched")
+    return lists
+
+
+def balance_list(category_id: int) -> str:
+    """Записи категории за текущий период"""
+    return f"balance:{category_id}"
+
+
+class CounterRepo(BaseSqlAlchemyRepo):
+    """
+    Счётчики длин списков.
+
+    `get`, `add` и `drop` относятся к владельцу репозитория; пересчёт
+    без владельца затрагивает счётчики всех владельцев.
+    """
+
+    async def get(self, name: str) -> int:
+        stmt = select(ListCounterModel.count).where(
+            ListCounterModel.owner_id == self.owner_id, ListCounterModel.name == name
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none() or 0
+
+    async def revisions(self, *sections: str) -> tuple[int, ...]:
+        """Ревизии разделов владельца (см. db.revisions), 0 - ещё не менялся"""
+        names = [revision_name(section) for section in sections]
+        stmt = select(ListCounterModel.name, ListCounterModel.count).where(
+            ListCounterModel.owner_id == self.owner_id,
+            ListCounterModel.name.in_(names),
+        )
+        found = dict((await self.session.execute(stmt)).tuples().all())
+        return tuple(found.get(name, 0) for name in names)
+
+    async def add(self, *changes: tuple[str, int]) -> None:
+        """Сдвигает счётчики владельца на (имя, дельта) одним upsert"""
+        rows = [
+            {"owner_id": self.owner_id, "name": name, "count": delta}
+            for name, delta in changes
+            if delta
+        ]
+        if not rows:
+            return
+        stmt = self.insert(ListCounterModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ListCounterModel.owner_id, ListCounterModel.name],
+            set_={"count": ListCounterModel.count + stmt.excluded.count},
+        )
+        await self.session.execute(stmt, rows)
+
+    async def move(self, before: Iterable[str], after: Iterable[str]) -> None:
+        """Запись перешла из списков `before` в списки `after`"""
+        before, after = set(before), set(after)
+        await self.add(
+            *((name, -1) for name in before - after),
+            *((name, 1) for name in after - before),
+        )
+
+    async def drop(self, names: Sequence[str]) -> None:
+        stmt = delete(ListCounterModel).where(
+            self.owned(ListCounterModel), ListCounterModel.name.in_(names)
+        )
+        await self.session.execute(stmt)
+
+    async def _store(self, counts: dict[CounterKey, int]) -> None:
+        if not counts:
+            return
+        stmt = self.insert(ListCounterModel)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ListCounterModel.owner_id, ListCounterModel.name],
+            set_={"count": stmt.excluded.count},
+        )
+        await self.session.execute(
+            stmt,
+            [
+                {"owner_id": owner_id, "name": name, "count": count}
+                for (owner_id, name), count in counts.items()
+            ],
+        )
+
+    async def _count_balance(
+        self, category_ids: Optional[Sequence[int]] = None
+    ) -> dict[CounterKey, int]:
+        stmt = (
+            select(
+                BalanceCategoryModel.owner_id,
+                BalanceCategoryModel.id,
+                func.count(BalanceModel.id),
+            )
+            .outerjoin(
+                BalanceModel,
+                and_(
+                    BalanceModel.category_id == BalanceCategoryModel.id,
+                    BalanceModel.created_at >= BalanceCategoryModel.last_reset,
+                ),
+            )
+            .where(self.owned(BalanceCategoryModel))
+            .group_by(BalanceCategoryModel.owner_id, BalanceCategoryModel.id)
+        )
+        if category_ids is not None:
+            stmt = stmt.where(BalanceCategoryModel.id.in_(category_ids))
+        rows = (await self.session.execute(stmt)).all()
+        return {(owner_id, balance_list(cid)): count for owner_id, cid, count in rows}
+
+    async def recount_balance(self, category_ids: Optional[Sequence[int]]) -> None:
+        """Пересчитывает счётчики категорий, например когда период сброшен"""
+        await self._store(await self._count_balance(category_ids))
+
+    async def count_all(self) -> dict[CounterKey, int]:
+        """Точные значения всех счётчиков по данным (GROUP BY по индексам)"""
+        counts: dict[CounterKey, int] = {}
+        movies = (
+            select(MovieModel.owner_id, MovieModel.watched, func.count())
+            .where(self.owned(MovieModel))
+            .group_by(MovieModel.owner_id, MovieModel.watched)
+        )
+        for owner_id, watched, count in await self.session.execute(movies):
+            counts[owner_id, movies_list(watched)] = count
+
+        statuses = (
+            select(SeriesModel.owner_id, SeriesModel.watch_status, func.count())
+            .where(
+                self.owned(SeriesModel),
+                SeriesModel.watch_status.in_(SERIES_STATUS_LISTS),
+            )
+            .group_by(SeriesModel.owner_id, SeriesModel.watch_status)
+        )
+        for owner_id, status, count in await self.session.execute(statuses):
+            counts[owner_id, f"series:{status}"] = count
+        watched = (
+            select(SeriesModel.owner_id, func.count())
+            .where(self.owned(SeriesModel), SeriesModel.watched == true())
+            .group_by(SeriesModel.owner_id)
+        )
+        for owner_id, count in await self.session.execute(watched):
+            counts[owner_id, "series:watched"] = count
+
+        counts.update(await self._count_balance())
+        return counts
+
+    async def reconcile(self) -> int:
+        """Сверяет счётчики по данным, возвращает число исправленных"""
+        actual = await self.count_all()
+        stored = {
+            (row.owner_id, row.name): row.count
+            for row in await self.session.execute(
+                select(
+                    ListCounterModel.owner_id,
+                    ListCounterModel.name,
+                    ListCounterModel.count,
+                ).where(
+                    self.owned(ListCounterModel),
+                    # Ревизии - не длины списков, сверять их нечем
+                    ListCounterModel.name.not_like(f"{REVISION_PREFIX}%"),
+                )
+            )
+        }
+        # Пустые списки не имеют строки в count_all: их счётчик - 0
+        wrong = {
+            key: actual.get(key, 0)
+            for key in actual.keys() | stored.keys()
+            if actual.get(key, 0) != stored.get(key)
+        }
+        await self._store(wrong)
+        return len(wrong)
@@ -1,9 +1,15 @@
-from typing import Any, Optional, Sequence, overload
+from typing import Any, Collection, Optional, Sequence, overload
 
-from sqlalchemy import delete, desc, select
+from sqlalchemy import delete, desc, false, func, select
 
-from db.models import MovieModel
-from db.repository.base import BaseSqlAlchemyRepo
+from db.models import MovieModel, normalize_title
+from db.repository.base import (
+    BaseSqlAlchemyRepo,
+    Cursor,
+    after_cursor,
+    year_between,
+)
+from db.repository.counter import CounterRepo, movies_list
 
 HasNext = bool
 
@@ -16,11 +22,13 @@ class MoviesRepository(BaseSqlAlchemyRepo):
 
     async def get(self, mid: Optional[int] = None) -> Any:
         if mid is None:
-            result = await self.session.execute(select(MovieModel))
+            result = await self.session.execute(
+                select(MovieModel).where(self.owned(MovieModel))
+            )
             return result.scalars().all()
 
         result = await self.session.execute(
-            select(MovieModel).where(MovieModel.id == mid)
+            select(MovieModel).where(self.owned(MovieModel), MovieModel.id == mid)
         )
         return result.scalar_one_or_none()
 
@@ -29,7 +37,7 @@ class MoviesRepository(BaseSqlAlchemyRepo):
     ) -> tuple[Sequence[MovieModel], HasNext]:
         stmt = (
             select(MovieModel)
-            .where(MovieModel.watched == is_watched)
+            .where(self.owned(MovieModel), MovieModel.watched == is_watched)
             .order_by(desc(MovieModel.created_at))
             .limit(page_limit + 1)
             .offset(skip)
@@ -44,19 +52,128 @@ class MoviesRepository(BaseSqlAlchemyRepo):
 
         return balances, has_next
 
+    async def get_page(
+        self, watched: Optional[bool], cursor: Optional[Cursor], limit: int
+    ) -> tuple[Sequence[MovieModel], HasNext]:
+        """Страница от новых к старым после `cursor`, фильтр по watched"""
+        stmt = (
+            select(MovieModel)
+            .where(self.owned(MovieModel), after_cursor(MovieModel, cursor))
+            .order_by(desc(MovieModel.created_at), desc(MovieModel.id))
+            .limit(limit + 1)
+        )
+        if watched is not None:
+            stmt = stmt.where(MovieModel.watched == watched)
+        items = (await self.session.execute(stmt)).scalars().all()
+        return items[:limit], len(items) > limit
+
+    async def pick_unwatched(
+        self,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        exclude: Collection[int] = (),
+    ) -> Optional[MovieModel]:
+        """Случайный фильм из «Хочу посмотреть», кроме `exclude`"""
+        return await self.pick_random(
+            MovieModel,
+            self.owned(MovieModel),
+            MovieModel.watched == false(),
+            year_between(MovieModel, year_from, year_to),
+            exclude=exclude,
+        )
+
+    async def find_duplicate(
+        self, title: str, year: Optional[int] = None
+    ) -> Optional[MovieModel]:
+        """Уже добавленная запись под тем же названием (и годом, если задан)"""
+        stmt = (
+            select(MovieModel)
+            .where(
+                self.owned(MovieModel), MovieModel.title_norm == normalize_title(title)
+            )
+            .order_by(MovieModel.id)
+            .limit(1)
+        )
+        if year is not None:
+            stmt = stmt.where(MovieModel.year == year)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def find_poster(self, unique_id: str) -> Optional[str]:
+        """file_id сохранённого ранее постера, совпавшего по file_unique_id"""
+        stmt = (
+            select(MovieModel.poster)
+            .where(self.owned(MovieModel), MovieModel.poster_unique_id == unique_id)
+            .limit(1)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def get_duplicate_groups(self) -> list[list[MovieModel]]:
+        """Группы записей, совпадающих по владельцу, названию и году"""
+        keys = (
+            select(MovieModel.owner_id, MovieModel.title_norm, MovieModel.year)
+            .where(self.owned(MovieModel))
+            .group_by(MovieModel.owner_id, MovieModel.title_norm, MovieModel.year)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        stmt = (
+            select(MovieModel)
+            .join(
+                keys,
+                (MovieModel.owner_id == keys.c.owner_id)
+                & (MovieModel.title_norm == keys.c.title_norm)
+                & (MovieModel.year == keys.c.year),
+            )
+            .order_by(
+                MovieModel.owner_id,
+                MovieModel.title_norm,
+                MovieModel.year,
+                MovieModel.id,
+            )
+        )
+        groups: dict[tuple[int, str, int], list[MovieModel]] = {}
+        for item in (await self.session.execute(stmt)).scalars():
+            groups.setdefault((item.owner_id, item.title_norm, item.year), []).append(
+                item
+            )
+        return list(groups.values())
+
     async def create(
-        self, title: str, year: int, description: Optional[str], poster: Optional[str]
+        self,
+        title: str,
+        year: int,
+        description: Optional[str],
+        poster: Optional[str],
+        poster_unique_id: Optional[str] = None,
     ) -> MovieModel:
         entity = MovieModel(
             title=title,
             year=year,
             description=description,
             poster=poster,
+            poster_unique_id=poster_unique_id,
             watched=False,
+            owner_id=self.owner_id,
         )
         self.session.add(entity)
+        await CounterRepo(self.session, self.owner_id).add((movies_list(False), 1))
         return entity
 
+    async def set_watched(self, mid: int) -> Optional[MovieModel]:
+        movie = await self.get(mid=mid)
+        if movie and not movie.watched:
+            movie.watched = True
+            await CounterRepo(self.session, self.owner_id).move(
+                [movies_list(False)], [movies_list(True)]
+            )
+        return movie
+
     async def delete(self, mid: int) -> None:
-        stmt = delete(MovieModel).where(MovieModel.id == mid)
-        await self.session.execute(stmt)
+        stmt = (
+            delete(MovieModel)
+            .where(self.owned(MovieModel), MovieModel.id == mid)
+            .returning(MovieModel.watched)
+        )
+        counters = CounterRepo(self.session, self.owner_id)
+        for (watched,) in await self.session.execute(stmt):
+            await counters.add((movies_list(watched), -1))
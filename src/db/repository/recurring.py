@@ -0,0 +1,144 @@
+from typing import Any, Optional, Sequence
+
+from sqlalchemy import BigInteger, Row, case, cast, delete, insert, select, update
+from sqlalchemy.orm import selectinload
+
+from db.models import (
+    BalanceModel,
+    RecurringModel,
+    TagModel,
+    balance_tags,
+    recurring_tags,
+)
+from db.repository.base import BaseSqlAlchemyRepo
+
+# Записей в одном INSERT при догоне пропущенных срабатываний
+MATERIALIZE_CHUNK_SIZE = 500
+
+
+class RecurringRepo(BaseSqlAlchemyRepo):
+    async def get_all(self) -> Sequence[RecurringModel]:
+        stmt = (
+            select(RecurringModel)
+            .where(self.owned(RecurringModel))
+            .options(selectinload(RecurringModel.category))
+            .order_by(RecurringModel.id)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_many(self, ids: Sequence[int]) -> Sequence[RecurringModel]:
+        stmt = (
+            select(RecurringModel)
+            .where(RecurringModel.id.in_(ids))
+            .options(selectinload(RecurringModel.category))
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def get_due(self) -> list[tuple[int, int]]:
+        """(id, next_run) всех шаблонов, где запланировано срабатывание"""
+        stmt = select(RecurringModel.id, RecurringModel.next_run).where(
+            RecurringModel.next_run.is_not(None)
+        )
+        result = await self.session.execute(stmt)
+        return [(rid, next_run) for rid, next_run in result.all() if next_run]
+
+    async def create(
+        self,
+        *,
+        name: str,
+        amount: int,
+        balance_type: str,
+        period: str,
+        day: Optional[int],
+        next_run: Optional[int],
+        category_id: int | None = None,
+        tags: list[TagModel] | None = None,
+    ) -> RecurringModel:
+        recurring = RecurringModel(
+            name=name,
+            amount=amount,
+            type=balance_type,
+            period=period,
+            day=day,
+            next_run=next_run,
+            category_id=category_id,
+            owner_id=self.owner_id,
+            tags=tags or [],
+        )
+        self.session.add(recurring)
+        return recurring
+
+    async def materialize(self, rows: Sequence[dict[str, Any]]) -> list[Row[Any]]:
+        """
+        Создаёт записи баланса по срабатываниям шаблонов и привязывает к ним теги.
+
+        Каждая пачка - один INSERT записей и один INSERT связей записей и тегов.
+        Уже созданные срабатывания (одинаковые recurring_id и created_at)
+        пропускаются, поэтому повтор после сбоя ничего не дублирует.
+        Возвращает только действительно вставленные записи.
+        """
+        inserted: list[Row[Any]] = []
+        for i in range(0, len(rows), MATERIALIZE_CHUNK_SIZE):
+            chunk = rows[i : i + MATERIALIZE_CHUNK_SIZE]
+            stmt = (
+                self.insert(BalanceModel.__table__)
+                .values(list(chunk))
+                .on_conflict_do_nothing(index_elements=["recurring_id", "created_at"])
+                .returning(
+                    BalanceModel.id,
+                    BalanceModel.type,
+                    BalanceModel.amount,
+                    BalanceModel.category_id,
+                    BalanceModel.created_at,
+                )
+            )
+            result = (await self.session.execute(stmt)).all()
+            if not result:
+                continue
+            await self.session.execute(
+                insert(balance_tags).from_select(
+                    ["balance_id", "tag_id"],
+                    select(BalanceModel.id, recurring_tags.c.tag_id)
+                    .join(
+                        recurring_tags,
+                        recurring_tags.c.recurring_id == BalanceModel.recurring_id,
+                    )
+                    .where(BalanceModel.id.in_([row.id for row in result])),
+                )
+            )
+            inserted.extend(result)
+        return inserted
+
+    async def set_next_runs(self, next_runs: dict[int, Optional[int]]) -> None:
+        """Переносит срабатывания нескольких шаблонов одним UPDATE"""
+        if not next_runs:
+            return
+        stmt = (
+            update(RecurringModel)
+            .where(RecurringModel.id.in_(next_runs))
+            .values(
+                # Без cast PostgreSQL типизирует CASE из одних NULL как text
+                next_run=cast(
+                    case(next_runs, value=RecurringModel.id),
+                    BigInteger,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(stmt)
+
+    async def delete(self, rid: int) -> None:
+        # Созданные записи остаются, теряют только ссылку на шаблон
+        await self.session.execute(
+            update(BalanceModel)
+            .where(self.owned(BalanceModel), BalanceModel.recurring_id == rid)
+            .values(recurring_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.execute(
+            delete(RecurringModel).where(
+                RecurringModel.id == rid, self.owned(RecurringModel)
+            )
+        )
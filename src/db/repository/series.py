@@ -1,9 +1,15 @@
-from typing import Any, Optional, Sequence, overload
+from typing import Any, Collection, Optional, Sequence, overload
 
-from sqlalchemy import delete, desc, select
+from sqlalchemy import delete, desc, func, select
 
-from db.models import SeriesModel
-from db.repository.base import BaseSqlAlchemyRepo
+from db.models import SeriesModel, normalize_title
+from db.repository.base import (
+    BaseSqlAlchemyRepo,
+    Cursor,
+    after_cursor,
+    year_between,
+)
+from db.repository.counter import CounterRepo, series_lists
 
 HasNext = bool
 
@@ -16,11 +22,13 @@ class SeriesRepository(BaseSqlAlchemyRepo):
 
     async def get(self, sid: Optional[int] = None) -> Any:
         if sid is None:
-            result = await self.session.execute(select(SeriesModel))
+            result = await self.session.execute(
+                select(SeriesModel).where(self.owned(SeriesModel))
+            )
             return result.scalars().all()
 
         result = await self.session.execute(
-            select(SeriesModel).where(SeriesModel.id == sid)
+            select(SeriesModel).where(self.owned(SeriesModel), SeriesModel.id == sid)
         )
         return result.scalar_one_or_none()
 
@@ -29,7 +37,7 @@ class SeriesRepository(BaseSqlAlchemyRepo):
     ) -> tuple[Sequence[SeriesModel], HasNext]:
         stmt = (
             select(SeriesModel)
-            .where(SeriesModel.watched == is_watched)
+            .where(self.owned(SeriesModel), SeriesModel.watched == is_watched)
             .order_by(desc(SeriesModel.created_at))
             .limit(page_limit + 1)
             .offset(skip)
@@ -49,7 +57,7 @@ class SeriesRepository(BaseSqlAlchemyRepo):
     ) -> tuple[Sequence[SeriesModel], HasNext]:
         stmt = (
             select(SeriesModel)
-            .where(SeriesModel.watch_status == watch_status)
+            .where(self.owned(SeriesModel), SeriesModel.watch_status == watch_status)
             .order_by(desc(SeriesModel.created_at))
             .limit(page_limit + 1)
             .offset(skip)
@@ -64,6 +72,93 @@ class SeriesRepository(BaseSqlAlchemyRepo):
 
         return series_list, has_next
 
+    async def get_page(
+        self, watch_status: Optional[str], cursor: Optional[Cursor], limit: int
+    ) -> tuple[Sequence[SeriesModel], HasNext]:
+        """Страница от новых к старым после `cursor`, фильтр по watch_status"""
+        stmt = (
+            select(SeriesModel)
+            .where(self.owned(SeriesModel), after_cursor(SeriesModel, cursor))
+            .order_by(desc(SeriesModel.created_at), desc(SeriesModel.id))
+            .limit(limit + 1)
+        )
+        if watch_status is not None:
+            stmt = stmt.where(SeriesModel.watch_status == watch_status)
+        items = (await self.session.execute(stmt)).scalars().all()
+        return items[:limit], len(items) > limit
+
+    async def pick_planned(
+        self,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        exclude: Collection[int] = (),
+    ) -> Optional[SeriesModel]:
+        """Случайный сериал из «Хочу посмотреть», кроме `exclude`"""
+        return await self.pick_random(
+            SeriesModel,
+            self.owned(SeriesModel),
+            SeriesModel.watch_status == "planned",
+            year_between(SeriesModel, year_from, year_to),
+            exclude=exclude,
+        )
+
+    async def find_duplicate(
+        self, title: str, year: Optional[int] = None
+    ) -> Optional[SeriesModel]:
+        """Уже добавленная запись под тем же названием (и годом, если задан)"""
+        stmt = (
+            select(SeriesModel)
+            .where(
+                self.owned(SeriesModel),
+                SeriesModel.title_norm == normalize_title(title),
+            )
+            .order_by(SeriesModel.id)
+            .limit(1)
+        )
+        if year is not None:
+            stmt = stmt.where(SeriesModel.year == year)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def find_poster(self, unique_id: str) -> Optional[str]:
+        """file_id сохранённого ранее постера, совпавшего по file_unique_id"""
+        stmt = (
+            select(SeriesModel.poster)
+            .where(self.owned(SeriesModel), SeriesModel.poster_unique_id == unique_id)
+            .limit(1)
+        )
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def get_duplicate_groups(self) -> list[list[SeriesModel]]:
+        """Группы записей, совпадающих по владельцу, названию и году"""
+        keys = (
+            select(SeriesModel.owner_id, SeriesModel.title_norm, SeriesModel.year)
+            .where(self.owned(SeriesModel))
+            .group_by(SeriesModel.owner_id, SeriesModel.title_norm, SeriesModel.year)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        stmt = (
+            select(SeriesModel)
+            .join(
+                keys,
+                (SeriesModel.owner_id == keys.c.owner_id)
+                & (SeriesModel.title_norm == keys.c.title_norm)
+                & (SeriesModel.year == keys.c.year),
+            )
+            .order_by(
+                SeriesModel.owner_id,
+                SeriesModel.title_norm,
+                SeriesModel.year,
+                SeriesModel.id,
+            )
+        )
+        groups: dict[tuple[int, str, int], list[SeriesModel]] = {}
+        for item in (await self.session.execute(stmt)).scalars():
+            groups.setdefault((item.owner_id, item.title_norm, item.year), []).append(
+                item
+            )
+        return list(groups.values())
+
     async def create(
         self,
         title: str,
@@ -75,22 +170,49 @@ class SeriesRepository(BaseSqlAlchemyRepo):
         season_number: Optional[int] = None,
         episodes_count: Optional[int] = None,
         watch_status: Optional[str] = "planned",
+        poster_unique_id: Optional[str] = None,
     ) -> SeriesModel:
         entity = SeriesModel(
             title=title,
             year=year,
             description=description,
             poster=poster,
+            poster_unique_id=poster_unique_id,
             season_number=season_number,
             episodes_count=episodes_count,
             episode_current=episode_current,
             season_current=season_current,
             watched=False,
+            owner_id=self.owner_id,
             watch_status=watch_status,
         )
         self.session.add(entity)
+        await CounterRepo(self.session, self.owner_id).add(
+            *((name, 1) for name in series_lists(watch_status, False))
+        )
         return entity
 
+    async def set_watch_status(
+        self, sid: int, watch_status: str, watched: bool
+    ) -> Optional[SeriesModel]:
+        series = await self.get(sid=sid)
+        if series:
+            before = series_lists(series.watch_status, series.watched)
+            series.watch_status = watch_status
+            series.watched = watched
+            await CounterRepo(self.session, self.owner_id).move(
+                before, series_lists(watch_status, watched)
+            )
+        return series
+
     async def delete(self, sid: int) -> None:
-        stmt = delete(SeriesModel).where(SeriesModel.id == sid)
-        await self.session.execute(stmt)
+        stmt = (
+            delete(SeriesModel)
+            .where(self.owned(SeriesModel), SeriesModel.id == sid)
+            .returning(SeriesModel.watch_status, SeriesModel.watched)
+        )
+        counters = CounterRepo(self.session, self.owner_id)
+        for watch_status, watched in await self.session.execute(stmt):
+            await counters.add(
+                *((name, -1) for name in series_lists(watch_status, watched))
+            )
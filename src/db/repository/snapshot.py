@@ -0,0 +1,31 @@
+from typing import Sequence
+
+from sqlalchemy import desc, select
+
+from config.consts import DEFAULT_PAGE_LIMIT
+from db.models import CategoryPeriodSnapshotModel
+from db.repository.base import BaseSqlAlchemyRepo
+
+HasNext = bool
+
+
+class SnapshotRepo(BaseSqlAlchemyRepo):
+    async def get_by_category(
+        self, category_id: int, skip: int = 0
+    ) -> tuple[Sequence[CategoryPeriodSnapshotModel], HasNext]:
+        stmt = (
+            select(CategoryPeriodSnapshotModel)
+            .where(CategoryPeriodSnapshotModel.category_id == category_id)
+            .order_by(desc(CategoryPeriodSnapshotModel.period_end))
+            .limit(DEFAULT_PAGE_LIMIT + 1)
+            .offset(skip)
+        )
+
+        res = await self.session.execute(stmt)
+        snapshots = res.scalars().all()
+
+        has_next = len(snapshots) > DEFAULT_PAGE_LIMIT
+        if has_next:
+            snapshots = snapshots[:DEFAULT_PAGE_LIMIT]
+
+        return snapshots, has_next
@@ -1,3 +1,5 @@
+from typing import Sequence
+
 from sqlalchemy import select
 
 from db.models import TagModel
@@ -20,3 +22,28 @@ class TagRepo(BaseSqlAlchemyRepo):
         if tag:
             return tag
         return await self.create(name)
+
+    async def get_or_create_many(self, names: Sequence[str]) -> list[TagModel]:
+        """
+        Теги по именам в порядке `names`, без повторов.
+
+        Уже существующие читаются одним SELECT, недостающие создаются одним
+        INSERT ... ON CONFLICT DO NOTHING (тег мог создать параллельный
+        запрос) и дочитываются.
+        """
+        unique = list(dict.fromkeys(names))
+        if not unique:
+            return []
+        stmt = select(TagModel).where(TagModel.name.in_(unique))
+        found = {tag.name: tag for tag in (await self.session.scalars(stmt))}
+        missing = [name for name in unique if name not in found]
+        if missing:
+            await self.session.execute(
+                self.insert(TagModel).on_conflict_do_nothing(
+                    index_elements=[TagModel.name]
+                ),
+                [{"name": name} for name in missing],
+            )
+            stmt = select(TagModel).where(TagModel.name.in_(missing))
+            found.update((tag.name, tag) for tag in await self.session.scalars(stmt))
+        return [found[name] for name in unique]
@@ -1,5 +1,6 @@
+from typing import Sequence
+
 from sqlalchemy import select
-from sqlalchemy.dialects.sqlite import insert
 
 from db.models import UserModel
 from db.repository.base import BaseSqlAlchemyRepo
@@ -11,6 +12,10 @@ class UserModelRepo(BaseSqlAlchemyRepo):
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_all_ids(self) -> Sequence[int]:
+        result = await self.session.execute(select(UserModel.tg_id))
+        return result.scalars().all()
+
     async def add(
         self,
         tg_id: int,
@@ -19,13 +24,24 @@ class UserModelRepo(BaseSqlAlchemyRepo):
         last_name: str | None = None,
     ) -> None:
         stmt = (
-            insert(UserModel)
+            self.insert(UserModel)
             .values(
                 tg_id=tg_id,
                 username=username,
                 first_name=first_name,
                 last_name=last_name,
             )
-            .on_conflict_do_nothing()
+            .on_conflict_do_nothing(index_elements=[UserModel.tg_id])
+        )
+        await self.session.execute(stmt)
+
+    async def get_view_mode(self, tg_id: int) -> str | None:
+        stmt = select(UserModel.view_mode).where(UserModel.tg_id == tg_id)
+        return (await self.session.execute(stmt)).scalar_one_or_none()
+
+    async def set_view_mode(self, tg_id: int, view_mode: str) -> None:
+        stmt = self.insert(UserModel).values(tg_id=tg_id, view_mode=view_mode)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserModel.tg_id], set_={"view_mode": view_mode}
         )
         await self.session.execute(stmt)
@@ -0,0 +1,119 @@
+"""
+Ревизии данных владельца для ETag JSON API.
+
+Транзакция, изменившая строки отслеживаемой таблицы, в том же коммите
+прибавляет единицу к счётчику `rev:<раздел>` владельца в `list_counters`.
+Ревизия, в отличие от (max(updated_at), count), меняется при любой записи:
+при двух правках за одну секунду, при удалении одной записи и вставке другой.
+
+Изменения собираются событиями сессии: объекты ORM - перед flush,
+INSERT/UPDATE/DELETE через `session.execute` - при выполнении. Владельца
+объекта знает сам объект; для массовых запросов берутся владельцы
+репозиториев сессии, но если среди них есть репозиторий без владельца
+(фоновые задачи) - все пользователи. Лишний сдвиг ревизии стоит лишь
+одного ответа 200 вместо 304, пропущенный - устаревших данных.
+"""
+
+import itertools
+from typing import Any, Optional
+
+from sqlalchemy import Integer, event, literal, select, true
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from db.models import ListCounterModel, UserModel
+
+REVISION_PREFIX = "rev:"
+
+# Таблица -> разделы, чьи ревизии она меняет. Удаление категории каскадом
+# удаляет её записи, поэтому категория сдвигает и ревизию записей
+TRACKED_TABLES: dict[str, tuple[str, ...]] = {
+    "balance": ("balance",),
+    "balance_tags": ("balance",),
+    "balance_category": ("categories", "balance"),
+    "movies": ("movies",),
+    "series": ("series",),
+}
+
+# Ключи в `session.info`
+OWNERS_KEY = "revision_owners"
+_PENDING_KEY = "revision_pending"
+# Владелец «все пользователи»: в сессии был репозиторий без владельца
+ALL_OWNERS = None
+
+
+def revision_name(section: str) -> str:
+    return f"{REVISION_PREFIX}{section}"
+
+
+def _mark(session: Session, table: str, owners: set[Optional[int]]) -> None:
+    sections = TRACKED_TABLES.get(table)
+    if not sections or not owners:
+        return
+    pending: dict[str, set[Optional[int]]] = session.info.setdefault(_PENDING_KEY, {})
+    for section in sections:
+        pending.setdefault(section, set()).update(owners)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_objects(session: Session, flush_context: Any, instances: Any) -> None:
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        if obj in session.dirty and not session.is_modified(obj):
+            continue
+        owner_id = getattr(obj, "owner_id", None)
+        if owner_id is not None:
+            _mark(session, getattr(obj, "__tablename__", ""), {owner_id})
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    table = getattr(state.statement, "table", None)
+    if table is not None:
+        owners = state.session.info.get(OWNERS_KEY, {ALL_OWNERS})
+        _mark(state.session, table.name, owners)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump(session: Session) -> None:
+    # Коммит делает последний flush уже после этого события
+    session.flush()
+    pending: dict[str, set[Optional[int]]] = session.info.pop(_PENDING_KEY, {})
+    for section, owners in sorted(pending.items()):
+        name = revision_name(section)
+        if ALL_OWNERS in owners:
+            # WHERE обязателен: без него SQLite примет ON CONFLICT за JOIN ... ON
+            rows = select(UserModel.tg_id, literal(name), literal(1, Integer)).where(
+                true()
+            )
+            stmt = _insert(session).from_select(["owner_id", "name", "count"], rows)
+            session.execute(_increment(stmt))
+        else:
+            session.execute(
+                _increment(_insert(session)),
+                [
+                    {"owner_id": owner_id, "name": name, "count": 1}
+                    for owner_id in sorted(o for o in owners if o is not None)
+                ],
+            )
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget(session: Session, transaction: SessionTransaction) -> None:
+    # Откат: изменений не было, сдвигать нечего
+    if transaction.parent is None:
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _insert(session: Session) -> Any:
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(ListCounterModel)
+    return sqlite.insert(ListCounterModel)
+
+
+def _increment(stmt: Any) -> Any:
+    return stmt.on_conflict_do_update(
+        index_elements=[ListCounterModel.owner_id, ListCounterModel.name],
+        set_={"count": ListCounterModel.count + 1},
+    )
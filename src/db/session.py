@@ -1,27 +1,179 @@
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Optional
 
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
 from config.settings import settings
+from config.tracing import current_trace, span, tracer
+from db.writer import WriteQueue
 
-Engine = create_async_engine(settings.DB_URL)
-Session = async_sessionmaker(Engine, expire_on_commit=False, autoflush=False)
+
+def build_engine(url: str) -> AsyncEngine:
+    """Движок по DB_URL: sqlite+aiosqlite или postgresql+asyncpg"""
+    if make_url(url).get_backend_name() == "sqlite":
+        return create_async_engine(url)
+    return create_async_engine(
+        url,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def _sqlite_pragmas(engine: AsyncEngine, *pragmas: str) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection: Any, _: Any) -> None:
+        # BEGIN выдаём сами (см. ниже), драйвер в транзакции не вмешивается
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute(f"PRAGMA busy_timeout={settings.DB_BUSY_TIMEOUT}")
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+
+def _trace_sql(engine: AsyncEngine) -> None:
+    """Интервал на каждый SQL-запрос отобранного апдейта"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before(conn: Any, *_: Any) -> None:
+        if current_trace.get() is not None:
+            # Соединение выполняет один запрос за раз
+            conn.info["trace_started"] = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after(conn: Any, _: Any, statement: str, *__: Any) -> None:
+        trace = current_trace.get()
+        started = conn.info.pop("trace_started", None)
+        if trace is None or started is None:
+            return
+        trace.add(
+            statement.split(None, 1)[0].upper(),
+            "sql",
+            started,
+            time.perf_counter(),
+            sql=statement[:500],
+        )
+
+
+class Database:
+    """
+    Движки и сессии приложения.
+
+    Для файловой SQLite запись идёт через одно соединение-писатель
+    (`WriteQueue`), чтение - через пул read-only соединений в режиме WAL:
+    читатели не ждут писателя и не мешают ему. Для PostgreSQL и SQLite в
+    памяти чтение и запись используют один обычный пул.
+    """
+
+    def __init__(self, url: str) -> None:
+        parsed = make_url(url)
+        self.is_sqlite = parsed.get_backend_name() == "sqlite"
+        self.writer: Optional[WriteQueue] = None
+
+        if not self.is_sqlite or parsed.database in (None, "", ":memory:"):
+            self.engine = build_engine(url)
+            self.read_engine = self.engine
+        else:
+            self.engine = create_async_engine(url, pool_size=1, max_overflow=0)
+            _sqlite_pragmas(self.engine, "journal_mode=WAL", "synchronous=NORMAL")
+
+            # BEGIN IMMEDIATE сразу берёт блокировку записи: если базу держит
+            # другой процесс, ждём busy_timeout на старте, не падая посреди
+            @event.listens_for(self.engine.sync_engine, "begin")
+            def on_begin(conn: Any) -> None:
+                conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+            self.read_engine = create_async_engine(
+                url, pool_size=settings.DB_READERS, max_overflow=0
+            )
+            _sqlite_pragmas(self.read_engine, "query_only=ON")
+
+        self.session_maker = async_sessionmaker(
+            self.engine, expire_on_commit=False, autoflush=False
+        )
+        self.read_session_maker = async_sessionmaker(
+            self.read_engine, expire_on_commit=False, autoflush=False
+        )
+        if tracer.enabled:
+            _trace_sql(self.engine)
+            if self.read_engine is not self.engine:
+                _trace_sql(self.read_engine)
+        if self.engine is not self.read_engine:
+            self.writer = WriteQueue(
+                self.session_maker, max_batch=settings.DB_WRITE_BATCH
+            )
+
+        # Сессия писателя текущей задачи: вложенный transaction() её переиспользует
+        self._write_session: ContextVar[Optional[AsyncSession]] = ContextVar(
+            "write_session", default=None
+        )
+
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[AsyncSession]:
+        async with self.read_session_maker() as session:
+            yield session
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[AsyncSession]:
+        current = self._write_session.get()
+        if current is not None:
+            yield current
+            return
+
+        if self.writer is None:
+            async with self.session_maker.begin() as session:
+                yield session
+            return
+
+        with span("sqlite write queue", "db"):
+            ticket = await self.writer.acquire()
+        session = ticket.granted.result()
+        token = self._write_session.set(session)
+        try:
+            yield session
+        except BaseException as e:
+            ticket.release(e)
+            raise
+        finally:
+            self._write_session.reset(token)
+        ticket.release()
+        with span("sqlite group commit", "db"):
+            await ticket.committed
+
+    async def dispose(self) -> None:
+        if self.writer is not None:
+            await self.writer.close()
+        await self.engine.dispose()
+        if self.read_engine is not self.engine:
+            await self.read_engine.dispose()
+
+
+database = Database(settings.DB_URL)
+Engine = database.engine
+Session = database.session_maker
 
 
 @asynccontextmanager
 async def get_session() -> AsyncIterator[AsyncSession]:
-    """Базовый контекстный менеджер для сессии"""
-    async with Session() as session:
+    """Базовый контекстный менеджер для сессии (только чтение)"""
+    async with database.get_session() as session:
         yield session
 
 
 @asynccontextmanager
 async def transaction() -> AsyncIterator[AsyncSession]:
     """Отдельный контекстный менеджер для транзакции"""
-    async with Session.begin() as session:
+    async with database.transaction() as session:
         yield session
@@ -0,0 +1,196 @@
+import asyncio
+import contextlib
+import logging
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+class WriterClosedError(RuntimeError):
+    """Писатель остановлен раньше, чем транзакция была закоммичена"""
+
+
+class _Ticket:
+    """Место в очереди на запись"""
+
+    __slots__ = ("committed", "enqueued_at", "granted", "released")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.enqueued_at = loop.time()
+        # Писатель выдал сессию (внутри SAVEPOINT)
+        self.granted: asyncio.Future[AsyncSession] = loop.create_future()
+        # Вызывающий закончил работу: None или исключение, выброшенное в блоке
+        self.released: asyncio.Future[Optional[BaseException]] = loop.create_future()
+        # Пачка, в которую попала запись, закоммичена
+        self.committed: asyncio.Future[None] = loop.create_future()
+
+    def release(self, error: Optional[BaseException] = None) -> None:
+        """Возвращает сессию писателю. Остановленный писатель уже не ждёт"""
+        _resolve(self.released, error)
+
+
+def _resolve(fut: asyncio.Future, result: object = None) -> None:
+    if not fut.done():
+        fut.set_result(result)
+
+
+def _fail(fut: asyncio.Future, error: BaseException) -> None:
+    if not fut.done():
+        fut.set_exception(error)
+
+
+class WriteQueue:
+    """
+    Единственный писатель SQLite.
+
+    Транзакции на запись проходят через одно соединение по очереди,
+    поэтому внутри процесса нет борьбы за файловую блокировку и
+    "database is locked". Каждая транзакция вызывающего выполняется внутри
+    SAVEPOINT: ошибка откатывает только её. Вставшие в очередь, пока шла
+    предыдущая запись, коммитятся одной пачкой (group commit) -
+    один fsync на несколько мелких записей.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        max_batch: int = 32,
+        max_batch_delay: float = 0.05,
+    ) -> None:
+        self.session_maker = session_maker
+        self.max_batch = max_batch
+        self.max_batch_delay = max_batch_delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: asyncio.Queue[_Ticket] = asyncio.Queue()
+        self._task: Optional[asyncio.Task[None]] = None
+
+        # Счётчики для метрик и бенчмарков
+        self.batches = 0
+        self.writes = 0
+        self.failed = 0
+        self.max_batch_seen = 0
+        self.wait_total = 0.0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def acquire(self) -> "_Ticket":
+        """Встаёт в очередь и ждёт, пока писатель выдаст сессию"""
+        ticket = self._submit()
+        try:
+            await ticket.granted
+        except asyncio.CancelledError:
+            # Сессию могли выдать перед самой отменой, её надо вернуть
+            if ticket.granted.done() and not ticket.granted.cancelled():
+                ticket.release(asyncio.CancelledError())
+            ticket.granted.cancel()
+            raise
+        self.wait_total += self._loop_time() - ticket.enqueued_at
+        return ticket
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def _loop_time(self) -> float:
+        return asyncio.get_running_loop().time()
+
+    def _submit(self) -> _Ticket:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            # Писатель запускается лениво в текущем цикле событий
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = loop.create_task(self._run(), name="db-writer")
+        ticket = _Ticket(loop)
+        self._queue.put_nowait(ticket)
+        return ticket
+
+    async def _run(self) -> None:
+        try:
+            while True:
+                ticket = await self._queue.get()
+                await self._write_batch(ticket)
+        finally:
+            while not self._queue.empty():
+                self._queue.get_nowait().granted.cancel()
+
+    def _next_in_batch(self, size: int, started: float) -> Optional[_Ticket]:
+        if size >= self.max_batch:
+            return None
+        if self._loop_time() - started > self.max_batch_delay:
+            return None
+        try:
+            return self._queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return None
+
+    async def _write_batch(self, first: _Ticket) -> None:
+        started = self._loop_time()
+        batch: list[_Ticket] = []
+        ticket: Optional[_Ticket] = first
+        try:
+            async with self.session_maker() as session, session.begin():
+                while ticket is not None:
+                    if await self._serve(session, ticket):
+                        batch.append(ticket)
+                    ticket = self._next_in_batch(len(batch), started)
+        except Exception as e:
+            logger.exception("Write batch of %d failed", len(batch))
+            self.failed += len(batch)
+            self._fail_batch(batch, ticket, e)
+            return
+        except BaseException:
+            # close() отменил писателя посреди пачки: без ответа вызывающие
+            # навсегда повисли бы на `committed`
+            self._fail_batch(batch, ticket, WriterClosedError("Writer closed"))
+            raise
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.max_batch_seen = max(self.max_batch_seen, len(batch))
+        for t in batch:
+            _resolve(t.committed)
+
+    @staticmethod
+    def _fail_batch(
+        batch: list[_Ticket], ticket: Optional[_Ticket], error: BaseException
+    ) -> None:
+        """Пачка не закоммичена: ошибка всем её записям и ждущему сессию"""
+        if ticket is not None:
+            _fail(ticket.granted, error)
+            _fail(ticket.committed, error)
+        for t in batch:
+            _fail(t.committed, error)
+
+    async def _serve(self, session: AsyncSession, ticket: _Ticket) -> bool:
+        """Отдаёт сессию одному вызывающему, True - изменения вызывающего остаются"""
+        if ticket.granted.done():
+            # Вызывающего отменили, пока он стоял в очереди
+            return False
+
+        savepoint = await session.begin_nested()
+        ticket.granted.set_result(session)
+        error = await ticket.released
+
+        if error is None:
+            try:
+                await savepoint.commit()
+            except Exception as e:
+                # Ошибка flush при RELEASE: откатывается только этот SAVEPOINT
+                await savepoint.rollback()
+                self.failed += 1
+                _fail(ticket.committed, e)
+                return False
+            return True
+
+        await savepoint.rollback()
+        self.failed += 1
+        return False
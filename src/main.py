@@ -1,23 +1,50 @@
 import asyncio
-import logging
-import sys
 
 from aiogram.types import BotCommand
 
+from api import api_server
 from bot.bot import bot
 from bot.dp import dp
+from cluster.ingress import run_cluster
+from config.log import setup_logging
 from config.settings import settings
+from db.session import database
+from scheduler.archive import balance_archive_scheduler
+from scheduler.backup import backup_scheduler
+from scheduler.counters import counter_reconcile_scheduler
+from scheduler.limits import limit_reset_scheduler
+from scheduler.recurring import recurring_scheduler
 
 
 async def main() -> None:
-    await bot.delete_webhook(drop_pending_updates=True)
     await bot.set_my_commands([BotCommand(command="start", description="Начать")])
-    await dp.start_polling(bot)
+    if settings.WORKERS:
+        try:
+            await run_cluster(bot, dp.resolve_used_update_types())
+        finally:
+            await bot.session.close()
+        return
+
+    await bot.delete_webhook(drop_pending_updates=True)
+    limit_reset_scheduler.start()
+    balance_archive_scheduler.start()
+    counter_reconcile_scheduler.start()
+    backup_scheduler.start()
+    recurring_scheduler.bot = bot
+    recurring_scheduler.start()
+    await api_server.start()
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await limit_reset_scheduler.stop()
+        await balance_archive_scheduler.stop()
+        await counter_reconcile_scheduler.stop()
+        await backup_scheduler.stop()
+        await recurring_scheduler.stop()
+        await api_server.stop()
+        await database.dispose()
 
 
 if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.DEBUG if settings.DEBUG else logging.INFO,
-        stream=sys.stdout,
-    )
+    setup_logging()
     asyncio.run(main())
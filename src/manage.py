@@ -0,0 +1,165 @@
+"""
+Служебные команды для обслуживания базы.
+
+Запуск из src/:
+    python manage.py dedupe [--dry-run]
+    python manage.py backup
+    python manage.py verify backups/lifebot-20250101-030000.db.gz
+    python manage.py restore backups/lifebot-20250101-030000.db.gz  # бот остановлен
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import Sequence, Union
+
+from config.settings import settings
+from db.backup import (
+    BackupError,
+    VerifyResult,
+    restore_snapshot,
+    sqlite_backup,
+    sqlite_path,
+    verify_snapshot,
+)
+from db.models import MovieModel, SeriesModel
+from db.repository.counter import CounterRepo
+from db.repository.movies import MoviesRepository
+from db.repository.series import SeriesRepository
+from db.session import database, get_session, transaction
+
+logger = logging.getLogger("manage")
+
+# Из двух статусов сериала остаётся более продвинутый
+WATCH_STATUS_RANK = {None: 0, "planned": 1, "watching": 2, "completed": 3}
+FILLABLE = ("description", "source", "external_id")
+
+
+def merge_into(
+    keeper: Union[MovieModel, SeriesModel],
+    duplicate: Union[MovieModel, SeriesModel],
+) -> None:
+    """Переносит в старейшую запись то, чего в ней нет"""
+    for field in FILLABLE:
+        if getattr(keeper, field) is None:
+            setattr(keeper, field, getattr(duplicate, field))
+    # file_unique_id описывает именно свой file_id: поля переносятся парой
+    if not keeper.poster and duplicate.poster:
+        keeper.poster = duplicate.poster
+        keeper.poster_unique_id = duplicate.poster_unique_id
+    keeper.watched = keeper.watched or duplicate.watched
+
+    if isinstance(keeper, SeriesModel) and isinstance(duplicate, SeriesModel):
+        if (
+            WATCH_STATUS_RANK[duplicate.watch_status]
+            > WATCH_STATUS_RANK[keeper.watch_status]
+        ):
+            keeper.watch_status = duplicate.watch_status
+        progress = max(
+            (keeper.season_current or 0, keeper.episode_current or 0),
+            (duplicate.season_current or 0, duplicate.episode_current or 0),
+        )
+        if any(progress):
+            keeper.season_current, keeper.episode_current = progress
+        keeper.season_number = keeper.season_number or duplicate.season_number
+        keeper.episodes_count = keeper.episodes_count or duplicate.episodes_count
+
+
+async def dedupe(dry_run: bool) -> int:
+    """Сливает дубли фильмов и сериалов, возвращает число удалённых записей"""
+    removed = 0
+    # Пробный прогон только читает: сессия писателя не откатывается целиком
+    session_scope = get_session() if dry_run else transaction()
+    async with session_scope as session:
+        repos: Sequence[Union[MoviesRepository, SeriesRepository]] = (
+            MoviesRepository(session),
+            SeriesRepository(session),
+        )
+        for repo in repos:
+            for keeper, *duplicates in await repo.get_duplicate_groups():
+                logger.info(
+                    "%s #%d «%s» (%d, owner %d): merging %s",
+                    keeper.__tablename__,
+                    keeper.id,
+                    keeper.title,
+                    keeper.year,
+                    keeper.owner_id,
+                    [d.id for d in duplicates],
+                )
+                removed += len(duplicates)
+                if dry_run:
+                    continue
+                for duplicate in duplicates:
+                    merge_into(keeper, duplicate)
+                    await session.delete(duplicate)
+        if removed and not dry_run:
+            # Удаления шли мимо репозиториев: счётчики списков пересчитываются
+            await session.flush()
+            await CounterRepo(session).reconcile()
+    return removed
+
+
+def log_verify(snapshot: Path, result: VerifyResult) -> None:
+    logger.info(
+        "%s: integrity %s, alembic revision %s",
+        snapshot,
+        result.integrity,
+        result.revision or "-",
+    )
+
+
+async def run(args: argparse.Namespace) -> int:
+    try:
+        if args.command == "dedupe":
+            removed = await dedupe(args.dry_run)
+            verb = "would be removed" if args.dry_run else "removed"
+            logger.info("Duplicates %s: %d", verb, removed)
+        elif args.command == "backup":
+            result = await sqlite_backup.run()
+            logger.info("Snapshot %s (%d bytes)", result.path, result.size)
+        elif args.command == "verify":
+            verified = verify_snapshot(args.snapshot)
+            log_verify(args.snapshot, verified)
+            return 0 if verified.ok else 1
+        elif args.command == "restore":
+            target = sqlite_path(settings.DB_URL)
+            if target is None:
+                logger.error("Restore works for file SQLite only")
+                return 1
+            log_verify(args.snapshot, restore_snapshot(args.snapshot, target))
+            logger.info("Restored %s into %s", args.snapshot, target)
+    except BackupError as e:
+        logger.error("%s", e)
+        return 1
+    finally:
+        await database.dispose()
+    return 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    dedupe_cmd = commands.add_parser(
+        "dedupe", help="слить фильмы и сериалы с одинаковыми названием и годом"
+    )
+    dedupe_cmd.add_argument("--dry-run", action="store_true")
+
+    commands.add_parser("backup", help="снять снимок SQLite в BACKUP_DIR")
+    verify_cmd = commands.add_parser(
+        "verify", help="проверить снимок через PRAGMA integrity_check"
+    )
+    verify_cmd.add_argument("snapshot", type=Path)
+    restore_cmd = commands.add_parser(
+        "restore", help="заменить базу проверенным снимком (бот остановлен)"
+    )
+    restore_cmd.add_argument("snapshot", type=Path)
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout, format="%(message)s")
+    sys.exit(asyncio.run(run(parser.parse_args())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""title_norm
+
+Revision ID: 303abc5812c4
+Revises: fdda38804d84
+Create Date: 2026-10-19 18:38:15.726199
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.models import normalize_title
+
+
+# revision identifiers, used by Alembic.
+revision: str = '303abc5812c4'
+down_revision: Union[str, Sequence[str], None] = 'fdda38804d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ['movies', 'series']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    for table in TABLES:
+        op.add_column(table, sa.Column('title_norm', sa.String(length=255), nullable=True))
+        # casefold и пунктуацию по Unicode SQL не повторит, поэтому в Python
+        rows = bind.execute(sa.text(f'SELECT id, title FROM {table}')).all()
+        if rows:
+            bind.execute(
+                sa.text(f'UPDATE {table} SET title_norm = :title_norm WHERE id = :id'),
+                [{'id': row.id, 'title_norm': normalize_title(row.title)} for row in rows],
+            )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('title_norm', existing_type=sa.String(length=255), nullable=False)
+        op.create_index(f'ix_{table}_owner_id_title_norm_year', table, ['owner_id', 'title_norm', 'year'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_owner_id_title_norm_year', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('title_norm')
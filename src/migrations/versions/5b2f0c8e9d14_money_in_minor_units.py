@@ -0,0 +1,83 @@
+"""money_in_minor_units
+
+Revision ID: 5b2f0c8e9d14
+Revises: e1b7d93c4a20
+Create Date: 2026-10-19 14:05:27.604391
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2f0c8e9d14'
+down_revision: Union[str, Sequence[str], None] = 'e1b7d93c4a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BIGINT = sa.BigInteger().with_variant(sa.Integer(), 'sqlite')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Рубли (float) -> копейки (integer)
+    op.execute("UPDATE balance SET amount = ROUND(amount * 100)")
+    op.execute(
+        "UPDATE balance_category SET max_limit = ROUND(max_limit * 100), "
+        "period_expense = ROUND(period_expense * 100)"
+    )
+
+    with op.batch_alter_table('balance') as batch_op:
+        batch_op.alter_column(
+            'amount',
+            existing_type=sa.Float(),
+            type_=BIGINT,
+            existing_nullable=False,
+            postgresql_using='amount::bigint',
+        )
+    with op.batch_alter_table('balance_category') as batch_op:
+        batch_op.alter_column(
+            'max_limit',
+            existing_type=sa.Float(),
+            type_=BIGINT,
+            existing_nullable=True,
+            postgresql_using='max_limit::bigint',
+        )
+        batch_op.alter_column(
+            'period_expense',
+            existing_type=sa.Float(),
+            type_=BIGINT,
+            existing_nullable=False,
+            existing_server_default='0',
+            postgresql_using='period_expense::bigint',
+        )
+
+    op.create_index('ix_balance_category_id_created_at', 'balance', ['category_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_balance_category_id_created_at', table_name='balance')
+    with op.batch_alter_table('balance_category') as batch_op:
+        batch_op.alter_column(
+            'period_expense',
+            existing_type=BIGINT,
+            type_=sa.Float(),
+            existing_nullable=False,
+            existing_server_default='0',
+        )
+        batch_op.alter_column(
+            'max_limit', existing_type=BIGINT, type_=sa.Float(), existing_nullable=True
+        )
+    with op.batch_alter_table('balance') as batch_op:
+        batch_op.alter_column(
+            'amount', existing_type=BIGINT, type_=sa.Float(), existing_nullable=False
+        )
+
+    op.execute("UPDATE balance SET amount = amount / 100.0")
+    op.execute(
+        "UPDATE balance_category SET max_limit = max_limit / 100.0, "
+        "period_expense = period_expense / 100.0"
+    )
@@ -0,0 +1,35 @@
+"""users_tg_id_without_sequence
+
+Revision ID: 9a6d2e41f0c7
+Revises: 5b2f0c8e9d14
+Create Date: 2026-10-19 16:21:48.270533
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6d2e41f0c7'
+down_revision: Union[str, Sequence[str], None] = '5b2f0c8e9d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # В PostgreSQL BigInteger primary key по умолчанию становится SERIAL,
+    # а tg_id всегда приходит из Telegram
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('ALTER TABLE users ALTER COLUMN tg_id DROP DEFAULT')
+        op.execute('DROP SEQUENCE IF EXISTS users_tg_id_seq')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute('CREATE SEQUENCE IF NOT EXISTS users_tg_id_seq OWNED BY users.tg_id')
+        op.execute(
+            "ALTER TABLE users ALTER COLUMN tg_id SET DEFAULT nextval('users_tg_id_seq')"
+        )
@@ -0,0 +1,51 @@
+"""balance_autoincrement
+
+Revision ID: b7e2f4a9c1d3
+Revises: cf39a69414f9
+Create Date: 2026-10-19 21:40:12.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2f4a9c1d3'
+down_revision: Union[str, Sequence[str], None] = 'cf39a69414f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # В PostgreSQL id берутся из последовательности и не повторяются,
+    # в SQLite AUTOINCREMENT задаётся только при создании таблицы
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table(
+        'balance', recreate='always', table_kwargs={'sqlite_autoincrement': True}
+    ):
+        pass
+    # Новые id - после всех выданных, включая уже ушедшие в архив
+    op.execute(
+        "INSERT INTO sqlite_sequence (name, seq) SELECT 'balance', 0 "
+        "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = 'balance')"
+    )
+    op.execute(
+        "UPDATE sqlite_sequence SET seq = max("
+        "seq, "
+        "(SELECT coalesce(max(id), 0) FROM balance), "
+        "(SELECT coalesce(max(id), 0) FROM balance_archive)"
+        ") WHERE name = 'balance'"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    with op.batch_alter_table(
+        'balance', recreate='always', table_kwargs={'sqlite_autoincrement': False}
+    ):
+        pass
@@ -0,0 +1,107 @@
+"""owner_id
+
+Revision ID: fdda38804d84
+Revises: 881c0d0b0949
+Create Date: 2026-10-19 18:34:34.081951
+
+"""
+import time
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fdda38804d84'
+down_revision: Union[str, Sequence[str], None] = '881c0d0b0949'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BIGINT = sa.BigInteger().with_variant(sa.Integer(), 'sqlite')
+
+OWNED_TABLES = [
+    'balance_category',
+    'recurring',
+    'balance',
+    'balance_archive',
+    'movies',
+    'series',
+]
+
+
+def _drop_category_name_unique() -> None:
+    # Старое ограничение создано без имени: в PostgreSQL имя выдаёт сервер,
+    # в SQLite batch пересоздаёт таблицу и называет его по соглашению
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_constraint('balance_category_name_key', 'balance_category', type_='unique')
+        return
+    with op.batch_alter_table(
+        'balance_category',
+        naming_convention={'uq': 'uq_%(table_name)s_%(column_0_name)s'},
+    ) as batch_op:
+        batch_op.drop_constraint('uq_balance_category_name', type_='unique')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Существующие данные переходят к общему владельцу, иначе к первому админу
+    owner_id = settings.HOUSEHOLD_OWNER_ID or settings.ADMIN_IDS[0]
+    now = int(time.time())
+    op.execute(
+        sa.text(
+            'INSERT INTO users (tg_id, created_at, updated_at) '
+            'SELECT :owner_id, :now, :now '
+            'WHERE NOT EXISTS (SELECT 1 FROM users WHERE tg_id = :owner_id)'
+        ).bindparams(owner_id=owner_id, now=now)
+    )
+
+    _drop_category_name_unique()
+
+    for table in OWNED_TABLES:
+        op.add_column(table, sa.Column('owner_id', BIGINT, nullable=True))
+        op.execute(
+            sa.text(f'UPDATE {table} SET owner_id = :owner_id').bindparams(
+                owner_id=owner_id
+            )
+        )
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('owner_id', existing_type=BIGINT, nullable=False)
+            batch_op.create_foreign_key(
+                f'fk_{table}_owner_id_users', 'users', ['owner_id'], ['tg_id'], ondelete='CASCADE'
+            )
+
+    with op.batch_alter_table('balance_category') as batch_op:
+        batch_op.create_unique_constraint('uq_balance_category_owner_id_name', ['owner_id', 'name'])
+    op.create_index('ix_recurring_owner_id', 'recurring', ['owner_id'], unique=False)
+    op.create_index('ix_balance_owner_id_category_id_created_at', 'balance', ['owner_id', 'category_id', 'created_at'], unique=False)
+    op.create_index('ix_movies_owner_id_watched_created_at', 'movies', ['owner_id', 'watched', 'created_at'], unique=False)
+    op.create_index('ix_series_owner_id_watched_created_at', 'series', ['owner_id', 'watched', 'created_at'], unique=False)
+    op.create_index('ix_series_owner_id_watch_status_created_at', 'series', ['owner_id', 'watch_status', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_series_owner_id_watch_status_created_at', table_name='series')
+    op.drop_index('ix_series_owner_id_watched_created_at', table_name='series')
+    op.drop_index('ix_movies_owner_id_watched_created_at', table_name='movies')
+    op.drop_index('ix_balance_owner_id_category_id_created_at', table_name='balance')
+    op.drop_index('ix_recurring_owner_id', table_name='recurring')
+
+    with op.batch_alter_table('balance_category') as batch_op:
+        batch_op.drop_constraint('uq_balance_category_owner_id_name', type_='unique')
+
+    for table in reversed(OWNED_TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_owner_id_users', type_='foreignkey')
+            batch_op.drop_column('owner_id')
+
+    # Имена снова должны быть уникальны глобально: при совпадениях
+    # у разных владельцев миграция упадёт, а не склеит категории молча
+    if op.get_bind().dialect.name == 'postgresql':
+        op.create_unique_constraint('balance_category_name_key', 'balance_category', ['name'])
+    else:
+        with op.batch_alter_table('balance_category') as batch_op:
+            batch_op.create_unique_constraint('uq_balance_category_name', ['name'])
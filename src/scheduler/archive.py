@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import time
+from typing import Iterable
+
+from config.settings import settings
+from db.repository.archive import ArchiveRepo
+from db.session import get_session, transaction
+from scheduler.base import DueAt, HeapScheduler, Key
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceArchiveScheduler(HeapScheduler):
+    """
+    Переносит записи старше `keep` последних сбросов в архив.
+
+    Работает небольшими транзакциями по `chunk_size` записей, чтобы не держать
+    блокировку записи долго. Очередь категорий перечитывается раз в
+    `resync_interval`.
+    """
+
+    def __init__(
+        self, keep: int, chunk_size: int, resync_interval: int = 6 * 60 * 60
+    ) -> None:
+        super().__init__(resync_interval)
+        self.keep = keep
+        self.chunk_size = chunk_size
+
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        async with get_session() as session:
+            due = await ArchiveRepo(session).get_due(self.keep)
+        now = int(time.time())
+        return [(now, item.category_id) for item in due]
+
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        for category_id in keys:
+            await self.archive_category(category_id)
+        return []
+
+    async def archive_category(self, category_id: int) -> int:
+        async with get_session() as session:
+            resets = await ArchiveRepo(session).get_resets(category_id)
+        if len(resets) < self.keep:
+            return 0
+        cutoff = resets[-self.keep]
+
+        archived = 0
+        while True:
+            async with transaction() as session:
+                moved = await ArchiveRepo(session).archive_chunk(
+                    category_id, cutoff, resets, self.chunk_size
+                )
+            archived += moved
+            if moved < self.chunk_size:
+                break
+            # Между пачками пропускаем вперёд записи пользователей
+            await asyncio.sleep(0)
+
+        if archived:
+            logger.info("Archived %d records of category %d", archived, category_id)
+        return archived
+
+
+balance_archive_scheduler = BalanceArchiveScheduler(
+    keep=settings.BALANCE_HOT_PERIODS, chunk_size=settings.ARCHIVE_CHUNK_SIZE
+)
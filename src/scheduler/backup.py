@@ -0,0 +1,46 @@
+import logging
+import time
+from typing import Iterable
+
+from config.settings import settings
+from db.backup import BackupError, SqliteBackup, sqlite_backup
+from scheduler.base import DueAt, HeapScheduler, Key
+
+logger = logging.getLogger(__name__)
+
+
+class BackupScheduler(HeapScheduler):
+    """
+    Снимок базы раз в `interval` секунд.
+
+    Время следующего снимка считается от последнего снимка в каталоге,
+    поэтому перезапуск бота не снимает лишнюю копию. Для PostgreSQL
+    и при `interval=0` не запускается.
+    """
+
+    def __init__(self, backup: SqliteBackup, interval: int) -> None:
+        super().__init__(resync_interval=max(interval, 60 * 60))
+        self.backup = backup
+        self.interval = interval
+
+    def start(self) -> None:
+        if self.backup.available and self.interval > 0:
+            super().start()
+
+    def _next_run(self) -> DueAt:
+        last = self.backup.last_snapshot_at()
+        return last + self.interval if last is not None else int(time.time())
+
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        return [(self._next_run(), 0)]
+
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        try:
+            await self.backup.run()
+        except (BackupError, OSError) as e:
+            logger.error("Backup failed: %s", e)
+            return [(now + self.retry_delay, 0)]
+        return [(self._next_run(), 0)]
+
+
+backup_scheduler = BackupScheduler(sqlite_backup, settings.BACKUP_INTERVAL)
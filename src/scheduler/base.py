@@ -0,0 +1,106 @@
+import asyncio
+import contextlib
+import heapq
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DueAt = int
+Key = int
+
+
+class HeapScheduler(ABC):
+    """
+    Планировщик на min-heap из (время срабатывания, ключ).
+
+    Спит до ближайшего срабатывания, забирает все наступившие ключи разом
+    и отдаёт их в `fire` одной пачкой. Куча перечитывается из БД по `reload()`
+    и периодически — если изменения прошли мимо `reload()`.
+    """
+
+    retry_delay: int = 60
+
+    def __init__(self, resync_interval: int = 60 * 60) -> None:
+        self.resync_interval = resync_interval
+        self._heap: list[tuple[DueAt, Key]] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        # Вызывается на reload(), если планировщик работает в другом процессе
+        self.on_reload: Optional[Callable[[], None]] = None
+
+    @abstractmethod
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        """Загружает запланированные срабатывания из БД"""
+
+    @abstractmethod
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        """Выполняет наступившие срабатывания, возвращает новые"""
+
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=self.name)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    def reload(self) -> None:
+        """Просит перечитать расписание из БД (например, после правки в админке)"""
+        self._wakeup.set()
+        if self.on_reload is not None:
+            self.on_reload()
+
+    async def _reload(self) -> None:
+        entries = list(await self.load())
+        heapq.heapify(entries)
+        self._heap = entries
+        logger.debug("%s: loaded %d entries", self.name, len(entries))
+
+    def _pop_due(self, now: int) -> list[Key]:
+        due: list[Key] = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    async def _tick(self, now: int) -> None:
+        keys = self._pop_due(now)
+        if not keys:
+            return
+        try:
+            entries = await self.fire(keys, now)
+        except Exception:
+            logger.exception("%s: failed to fire %s", self.name, keys)
+            entries = [(now + self.retry_delay, key) for key in keys]
+        for entry in entries:
+            heapq.heappush(self._heap, entry)
+
+    async def _run(self) -> None:
+        last_sync = 0.0
+        while True:
+            if self._wakeup.is_set() or time.time() - last_sync >= self.resync_interval:
+                self._wakeup.clear()
+                try:
+                    await self._reload()
+                except Exception:
+                    logger.exception("%s: failed to load schedule", self.name)
+                last_sync = time.time()
+
+            now = int(time.time())
+            await self._tick(now)
+
+            timeout = float(self.resync_interval)
+            if self._heap:
+                timeout = min(timeout, max(self._heap[0][0] - time.time(), 0))
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
@@ -0,0 +1,39 @@
+import logging
+from typing import Iterable
+
+from config.settings import settings
+from db.repository.counter import CounterRepo
+from db.session import transaction
+from scheduler.base import DueAt, HeapScheduler, Key
+
+logger = logging.getLogger(__name__)
+
+
+class CounterReconcileScheduler(HeapScheduler):
+    """
+    Сверяет счётчики длин списков по данным: при старте и раз в `interval`.
+
+    Репозитории меняют счётчики в той же транзакции, что и записи; сверка
+    ловит то, что прошло мимо них (ручные правки в БД, прерванные миграции).
+    """
+
+    def __init__(self, interval: int) -> None:
+        super().__init__(resync_interval=interval)
+        self.interval = interval
+        self._next_run = 0
+
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        return [(self._next_run, 0)]
+
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        async with transaction() as session:
+            fixed = await CounterRepo(session).reconcile()
+        if fixed:
+            logger.warning("Counters: %d list counters were out of sync", fixed)
+        self._next_run = now + self.interval
+        return [(self._next_run, 0)]
+
+
+counter_reconcile_scheduler = CounterReconcileScheduler(
+    settings.COUNTER_RECONCILE_INTERVAL
+)
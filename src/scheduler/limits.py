@@ -0,0 +1,49 @@
+import logging
+from typing import Iterable
+
+from db.repository.category import CategoryRepo
+from db.session import get_session, transaction
+from scheduler.base import DueAt, HeapScheduler, Key
+from scheduler.schedule import Schedule, catch_up
+
+logger = logging.getLogger(__name__)
+
+
+class LimitResetScheduler(HeapScheduler):
+    """Автосброс лимитов категорий по их расписанию"""
+
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        async with get_session() as session:
+            cr = CategoryRepo(session)
+            return [(row.next_reset, row.id) for row in await cr.get_reset_due()]
+
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        entries: list[tuple[DueAt, Key]] = []
+        resets: dict[int, tuple[int, int | None]] = {}
+
+        async with transaction() as session:
+            cr = CategoryRepo(session)
+            for category in await cr.get_many(keys):
+                if category.next_reset is None or category.next_reset > now:
+                    continue
+                last_reset, next_reset = catch_up(
+                    Schedule(
+                        category.reset_period,
+                        category.reset_day,
+                        category.reset_interval_days,
+                    ),
+                    category.next_reset,
+                    now,
+                )
+                resets[category.id] = (last_reset, next_reset)
+                if next_reset is not None:
+                    entries.append((next_reset, category.id))
+
+            await cr.reset_limits(resets)
+
+        if resets:
+            logger.info("Limits reset for categories %s", sorted(resets))
+        return entries
+
+
+limit_reset_scheduler = LimitResetScheduler()
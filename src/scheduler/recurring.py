@@ -0,0 +1,125 @@
+import logging
+from collections import defaultdict
+from typing import Any, Iterable, Optional, Sequence
+
+from aiogram import Bot
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.alerts import BudgetAlert, check_budget_alert, send_budget_alert
+from db.models import RecurringModel
+from db.repository.category import CategoryRepo
+from db.repository.counter import CounterRepo
+from db.repository.recurring import RecurringRepo
+from db.session import get_session, transaction
+from scheduler.base import DueAt, HeapScheduler, Key
+from scheduler.schedule import Schedule, occurrences
+
+logger = logging.getLogger(__name__)
+
+
+def _balance_rows(
+    recurring: RecurringModel, runs: list[int], now: int
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "name": recurring.name,
+            "type": recurring.type,
+            "amount": recurring.amount,
+            "category_id": recurring.category_id,
+            "recurring_id": recurring.id,
+            "owner_id": recurring.owner_id,
+            "created_at": run,
+            "updated_at": now,
+        }
+        for run in runs
+    ]
+
+
+async def _add_expenses(
+    session: AsyncSession,
+    inserted: Sequence[Row[Any]],
+    last_resets: dict[int, int],
+) -> list[BudgetAlert]:
+    """Учитывает созданные расходы в лимитах, возвращает уведомления"""
+    # Расходы до последнего обнуления лимита в текущий период не входят
+    spent: dict[int, int] = defaultdict(int)
+    for row in inserted:
+        if (
+            row.type == "expense"
+            and row.category_id in last_resets
+            and row.created_at >= last_resets[row.category_id]
+        ):
+            spent[row.category_id] += row.amount
+
+    alerts: list[BudgetAlert] = []
+    cr = CategoryRepo(session)
+    for category_id, amount in spent.items():
+        totals = await cr.add_expense(category_id, amount)
+        alert = check_budget_alert(totals) if totals else None
+        if alert:
+            await cr.set_alert_level(category_id, alert.threshold)
+            alerts.append(alert)
+    return alerts
+
+
+class RecurringScheduler(HeapScheduler):
+    """
+    Создаёт записи баланса по регулярным шаблонам.
+
+    После простоя догоняет все пропущенные срабатывания: записи вставляются
+    пачкой в одной транзакции, где сдвигается и `next_run`; уникальность
+    пары (recurring_id, created_at) не даёт продублировать их при повторе.
+    """
+
+    def __init__(self, resync_interval: int = 60 * 60) -> None:
+        super().__init__(resync_interval)
+        # Бот для уведомлений про бюджет; если не задан, уведомлений нет
+        self.bot: Optional[Bot] = None
+
+    async def load(self) -> Iterable[tuple[DueAt, Key]]:
+        async with get_session() as session:
+            due = await RecurringRepo(session).get_due()
+        return [(next_run, rid) for rid, next_run in due]
+
+    async def fire(self, keys: list[Key], now: int) -> Iterable[tuple[DueAt, Key]]:
+        entries: list[tuple[DueAt, Key]] = []
+        rows: list[dict[str, Any]] = []
+        next_runs: dict[int, Optional[int]] = {}
+        last_resets: dict[int, int] = {}
+
+        async with transaction() as session:
+            rr = RecurringRepo(session)
+            for recurring in await rr.get_many(keys):
+                if recurring.next_run is None or recurring.next_run > now:
+                    continue
+                runs, next_run = occurrences(
+                    Schedule(recurring.period, recurring.day, recurring.interval_days),
+                    recurring.next_run,
+                    now,
+                )
+                rows.extend(_balance_rows(recurring, runs, now))
+                next_runs[recurring.id] = next_run
+                if next_run is not None:
+                    entries.append((next_run, recurring.id))
+                if recurring.category is not None:
+                    last_resets[recurring.category.id] = recurring.category.last_reset
+
+            inserted = await rr.materialize(rows)
+            await rr.set_next_runs(next_runs)
+            categories = {row.category_id for row in inserted if row.category_id}
+            if categories:
+                await CounterRepo(session).recount_balance(list(categories))
+            alerts = await _add_expenses(session, inserted, last_resets)
+
+        if inserted:
+            logger.info(
+                "Recurring: %d entries created for %s", len(inserted), sorted(next_runs)
+            )
+        if self.bot is not None:
+            for alert in alerts:
+                await send_budget_alert(self.bot, alert)
+        return entries
+
+
+recurring_scheduler = RecurringScheduler()
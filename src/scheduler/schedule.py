@@ -0,0 +1,86 @@
+import calendar
+import datetime
+from typing import NamedTuple, Optional
+
+DAY_SECONDS = 24 * 60 * 60
+
+# Защита от бесконечного цикла при очень долгом простое и маленьком интервале
+MAX_CATCH_UP_STEPS = 10_000
+
+
+class Schedule(NamedTuple):
+    period: str  # 'manual', 'monthly', 'weekly', 'interval'
+    day: Optional[int] = None
+    interval_days: Optional[int] = None
+
+
+def _midnight(dt: datetime.datetime) -> datetime.datetime:
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _monthly_candidate(year: int, month: int, day: int) -> datetime.datetime:
+    # 31 число в феврале превращается в последний день месяца
+    last_day = calendar.monthrange(year, month)[1]
+    return datetime.datetime(year, month, min(day, last_day))
+
+
+def next_boundary(schedule: Schedule, after: int) -> Optional[int]:
+    """Ближайшая граница периода строго после `after` (локальное время)"""
+    dt = datetime.datetime.fromtimestamp(after)
+
+    if schedule.period == "monthly":
+        day = max(1, min(schedule.day or 1, 31))
+        candidate = _monthly_candidate(dt.year, dt.month, day)
+        if candidate <= dt:
+            year, month = (
+                (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+            )
+            candidate = _monthly_candidate(year, month, day)
+        return int(candidate.timestamp())
+
+    if schedule.period == "weekly":
+        weekday = (schedule.day or 0) % 7
+        candidate = _midnight(dt) + datetime.timedelta(
+            days=(weekday - dt.weekday()) % 7
+        )
+        if candidate <= dt:
+            candidate += datetime.timedelta(days=7)
+        return int(candidate.timestamp())
+
+    if schedule.period == "interval" and schedule.interval_days:
+        return after + schedule.interval_days * DAY_SECONDS
+
+    return None
+
+
+def catch_up(schedule: Schedule, due: int, now: int) -> tuple[int, Optional[int]]:
+    """
+    Догоняет пропущенные сбросы после простоя.
+
+    Возвращает (last_reset, next_reset): последнюю наступившую границу периода
+    и следующую границу в будущем.
+    """
+    last = due
+    nxt = next_boundary(schedule, last)
+    steps = 0
+    while nxt is not None and nxt <= now and steps < MAX_CATCH_UP_STEPS:
+        last, nxt = nxt, next_boundary(schedule, nxt)
+        steps += 1
+    return last, nxt
+
+
+def occurrences(
+    schedule: Schedule, due: int, now: int
+) -> tuple[list[int], Optional[int]]:
+    """
+    Наступившие срабатывания, начиная от `due` включительно, и следующее.
+
+    Здесь, в отличие от `catch_up`, нужны все пропущенные моменты, не только
+    последний: по каждому создаётся своя запись.
+    """
+    runs: list[int] = []
+    nxt: Optional[int] = due
+    while nxt is not None and nxt <= now and len(runs) < MAX_CATCH_UP_STEPS:
+        runs.append(nxt)
+        nxt = next_boundary(schedule, nxt)
+    return runs, nxt
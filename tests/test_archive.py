@@ -0,0 +1,71 @@
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import select
+
+from db.models import (
+    BalanceArchiveModel,
+    BalanceCategoryModel,
+    BalanceModel,
+    Base,
+    UserModel,
+)
+from db.repository.archive import ArchiveRepo, period_bounds
+from db.session import Database
+
+OWNER = 1
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[Database]:
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'archive.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with database.transaction() as session:
+        session.add(UserModel(tg_id=OWNER))
+        await session.flush()
+        session.add(BalanceCategoryModel(id=1, name="c", last_reset=0, owner_id=OWNER))
+    yield database
+    await database.dispose()
+
+
+async def add_balance(db: Database, created_at: int) -> int:
+    async with db.transaction() as session:
+        balance = BalanceModel(
+            name="b",
+            amount=100,
+            type="expense",
+            category_id=1,
+            owner_id=OWNER,
+            created_at=created_at,
+        )
+        session.add(balance)
+        await session.flush()
+    return balance.id
+
+
+@pytest.mark.parametrize(
+    ("resets", "ts", "expected"),
+    [
+        ([], 50, (0, 50)),
+        ([100, 200], 50, (0, 100)),
+        ([100, 200], 100, (100, 200)),
+        ([100, 200], 250, (200, 250)),
+    ],
+)
+def test_period_bounds(resets: list[int], ts: int, expected: tuple[int, int]) -> None:
+    assert period_bounds(resets, ts) == expected
+
+
+async def test_archived_ids_are_not_reused(db: Database) -> None:
+    old = [await add_balance(db, created_at) for created_at in (10, 20)]
+    async with db.transaction() as session:
+        # Архивируется и самая новая запись: max(id) в balance уменьшается
+        assert await ArchiveRepo(session).archive_chunk(1, 100, [100], 10) == 2
+
+    new_id = await add_balance(db, 150)
+    assert new_id > max(old)
+    async with db.get_session() as session:
+        archived = await session.scalars(select(BalanceArchiveModel.id))
+        assert sorted(archived) == old
@@ -0,0 +1,98 @@
+import random
+import string
+
+import pytest
+
+from bot.callback import (
+    MAX_CALLBACK_BYTES,
+    PACKED_PREFIX,
+    ActionRegistry,
+    CallbackDecodeError,
+    CallbackTooLongError,
+    Nav,
+)
+
+SEED = 20261019
+CASES = 2000
+
+registry = ActionRegistry()
+PAGE = registry.register(1, "page", category_id=int, skip=int, desc=bool)
+SEARCH = registry.register(2, "search", query=str, cursor=int)
+DETAIL = registry.register(300, "detail", item_id=int, back=Nav)
+
+
+def random_int(rnd: random.Random) -> int:
+    bits = rnd.choice((3, 7, 14, 31, 40))
+    return rnd.randint(-(2**bits), 2**bits)
+
+
+def random_str(rnd: random.Random) -> str:
+    alphabet = string.ascii_letters + "ёжик 🎬:~"
+    return "".join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 8)))
+
+
+def random_nav(rnd: random.Random) -> Nav:
+    action = rnd.choice((PAGE, SEARCH))
+    if action is PAGE:
+        return PAGE.nav(
+            category_id=random_int(rnd),
+            skip=random_int(rnd),
+            desc=rnd.random() < 0.5,
+        )
+    return SEARCH.nav(query=random_str(rnd), cursor=random_int(rnd))
+
+
+def test_round_trip() -> None:
+    rnd = random.Random(SEED)
+    for _ in range(CASES):
+        nav = random_nav(rnd)
+        if rnd.random() < 0.5:
+            nav = DETAIL.nav(item_id=random_int(rnd), back=nav)
+        try:
+            packed = nav.pack()
+        except CallbackTooLongError:
+            continue
+        assert packed.startswith(PACKED_PREFIX)
+        assert len(packed.encode()) <= MAX_CALLBACK_BYTES
+        assert registry.unpack(packed) == nav
+
+
+def test_smaller_than_text() -> None:
+    packed = PAGE.pack(category_id=12345, skip=130, desc=False)
+    assert len(packed) < len("balance:detail:category:12345:130")
+
+
+def test_too_long() -> None:
+    with pytest.raises(CallbackTooLongError):
+        SEARCH.pack(query="x" * 60, cursor=0)
+
+
+def test_wrong_fields() -> None:
+    with pytest.raises(TypeError):
+        PAGE.pack(category_id=1, skip=0)
+
+
+def test_duplicate_action_id() -> None:
+    with pytest.raises(ValueError, match="taken"):
+        registry.register(1, "other", value=int)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        "balance:detail:category:1:0",
+        PACKED_PREFIX,
+        PACKED_PREFIX + "Ag",  # версия 2
+        PACKED_PREFIX + "AX8",  # неизвестное действие
+    ],
+)
+def test_rejects_foreign_data(data: str) -> None:
+    with pytest.raises(CallbackDecodeError):
+        registry.unpack(data)
+
+
+def test_rejects_truncated() -> None:
+    packed = PAGE.pack(category_id=7, skip=20, desc=True)
+    for cut in range(len(PACKED_PREFIX), len(packed)):
+        with pytest.raises(CallbackDecodeError):
+            registry.unpack(packed[:cut])
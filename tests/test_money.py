@@ -0,0 +1,42 @@
+from typing import Optional
+
+import pytest
+
+from bot.money import format_amount, parse_amount
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("350", 35000),
+        ("0", 0),
+        ("350.5", 35050),
+        ("350.05", 35005),
+        ("99,9", 9990),
+        ("99,99", 9999),
+        ("0,01", 1),
+        ("1 234.56", 123456),
+        ("1 234,5", 123450),
+        (" 42 ", 4200),
+        # Копейки не округляются: больше двух знаков после запятой - ошибка
+        ("1.234", None),
+        ("1,", None),
+        (".5", None),
+        ("1.2.3", None),
+        ("-5", None),
+        ("+5", None),
+        ("12a", None),
+        ("", None),
+        ("1" * 13, None),
+    ],
+)
+def test_parse_amount(text: str, expected: Optional[int]) -> None:
+    assert parse_amount(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("amount", "expected"),
+    [(35000, "350.00"), (9990, "99.90"), (1, "0.01"), (0, "0.00"), (-150, "-1.50")],
+)
+def test_format_amount(amount: int, expected: str) -> None:
+    assert format_amount(amount) == expected
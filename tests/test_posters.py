@@ -0,0 +1,67 @@
+import asyncio
+import io
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+from aiogram import Bot
+
+from bot.posters import SHEET_CELL, SHEET_COLUMNS, THUMB_SIDE, Poster, PosterCache
+
+Image = pytest.importorskip("PIL.Image")
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.downloads = 0
+
+    async def download(self, file_id: str, destination: io.BytesIO) -> None:
+        self.downloads += 1
+        await asyncio.sleep(0.01)
+        Image.new("RGB", (800, 1200), "red").save(destination, "JPEG")
+
+
+@pytest.fixture
+def bot() -> Any:
+    return FakeBot()
+
+
+async def test_thumb_downloads_once(tmp_path: Path, bot: Any) -> None:
+    cache = PosterCache(tmp_path)
+    poster = Poster("file", "unique")
+    paths = await asyncio.gather(
+        *(cache.thumb(cast(Bot, bot), poster) for _ in range(5))
+    )
+    assert bot.downloads == 1
+    assert set(paths) == {tmp_path / "unique_thumb.jpg"}
+    with Image.open(paths[0]) as image:
+        assert max(image.size) == THUMB_SIDE
+
+    await cache.thumb(cast(Bot, bot), poster)
+    assert bot.downloads == 1
+
+
+async def test_sheet_waits_for_thumbs(tmp_path: Path, bot: Any) -> None:
+    cache = PosterCache(tmp_path)
+    posters = [Poster("a", "a"), None, Poster("b", "b")]
+
+    assert await cache.sheet(cast(Bot, bot), posters, 1) is None
+    await asyncio.gather(*cache._tasks)
+    assert bot.downloads == 2
+
+    sheet = await cache.sheet(cast(Bot, bot), posters, 1)
+    assert sheet is not None
+    with Image.open(sheet.path) as image:
+        assert image.size == (SHEET_CELL[0] * SHEET_COLUMNS, SHEET_CELL[1])
+
+    # Повторный показ страницы берёт готовый файл, сдвиг нумерации даёт новый
+    again = await cache.sheet(cast(Bot, bot), posters, 1)
+    assert again is not None and again.path == sheet.path
+    shifted = await cache.sheet(cast(Bot, bot), posters, 11)
+    assert shifted is not None and shifted.path != sheet.path
+    assert bot.downloads == 2
+
+
+async def test_sheet_without_posters(tmp_path: Path, bot: Any) -> None:
+    assert await PosterCache(tmp_path).sheet(cast(Bot, bot), [None, None], 1) is None
+    assert bot.downloads == 0
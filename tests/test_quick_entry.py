@@ -0,0 +1,100 @@
+from typing import Optional
+
+import pytest
+
+from bot.quick_entry import (
+    NAME_MAX_LEN,
+    TAG_MAX_LEN,
+    BatchLine,
+    QuickEntry,
+    QuickEntryError,
+    parse_batch,
+    parse_quick_entry,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        (
+            "кафе 350 #еда #друзья @Продукты",
+            QuickEntry("кафе", 35000, "expense", ["еда", "друзья"], "Продукты"),
+        ),
+        ("+5000 зарплата", QuickEntry("зарплата", 500000, "income", [], None)),
+        ("такси -420,5", QuickEntry("такси", 42050, "expense", [], None)),
+        ("кофе 180₽", QuickEntry("кофе", 18000, "expense", [], None)),
+        ("кофе 180руб", QuickEntry("кофе", 18000, "expense", [], None)),
+        # Цифра внутри слова - часть названия, сумма - отдельное число
+        ("m2 аренда 1500", QuickEntry("m2 аренда", 150000, "expense", [], None)),
+        (
+            "iphone15 чехол 990",
+            QuickEntry("iphone15 чехол", 99000, "expense", [], None),
+        ),
+        # Разряды через пробел - одна сумма
+        ("кафе 1 234", QuickEntry("кафе", 123400, "expense", [], None)),
+        ("билет 2 500 кино", QuickEntry("билет кино", 250000, "expense", [], None)),
+        ("+1 000 000 премия", QuickEntry("премия", 100000000, "income", [], None)),
+        ("ремонт 12 345,50₽", QuickEntry("ремонт", 1234550, "expense", [], None)),
+        # Разрядом считаются только три цифры подряд и только до копеек
+        ("билет 2 500кино", QuickEntry("билет 500кино", 200, "expense", [], None)),
+        ("рейс 2 1234", QuickEntry("рейс 1234", 200, "expense", [], None)),
+        ("чай 2,5 100", QuickEntry("чай 100", 250, "expense", [], None)),
+        # Сумма - первое число, следующие числа остаются в названии
+        ("кофе 250 кассир 2", QuickEntry("кофе кассир 2", 25000, "expense", [], None)),
+        (
+            "@мелочи_дом лампа 99.9 #дом #дом",
+            QuickEntry("лампа", 9990, "expense", ["дом"], "мелочи дом"),
+        ),
+        ("подарок # 100 @", QuickEntry("подарок # @", 10000, "expense", [], None)),
+    ],
+)
+def test_parse_quick_entry(text: str, expected: QuickEntry) -> None:
+    assert parse_quick_entry(text) == expected
+
+
+@pytest.mark.parametrize(
+    ("text", "error"),
+    [
+        ("кафе", "Нет суммы"),
+        ("кафе 1.234", "Нет суммы"),
+        ("350", "Нет названия"),
+        ("350 #еда @Продукты", "Нет названия"),
+        ("кафе 0", "больше нуля"),
+        ("кафе 1 @a @b", "одну категорию"),
+        ("x" * (NAME_MAX_LEN + 1) + " 1", "Название длиннее"),
+        ("кафе 1 #" + "x" * (TAG_MAX_LEN + 1), "длинный тег"),
+    ],
+)
+def test_parse_quick_entry_errors(text: str, error: str) -> None:
+    with pytest.raises(QuickEntryError, match=error):
+        parse_quick_entry(text)
+
+
+def test_parse_batch() -> None:
+    text = "кафе 350 #еда\n\n  такси 420  \nбез суммы\n+5000 зарплата\n"
+    assert parse_batch(text) == [
+        BatchLine(1, "кафе 350 #еда", parse_quick_entry("кафе 350 #еда"), None),
+        BatchLine(3, "такси 420", parse_quick_entry("такси 420"), None),
+        BatchLine(4, "без суммы", None, "Нет суммы"),
+        BatchLine(5, "+5000 зарплата", parse_quick_entry("+5000 зарплата"), None),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("", []),
+        ("\n \n", []),
+        # Строки разбираются независимо: категория одной не влияет на другую
+        ("a 1 @x\nb 2", [("a", "x"), ("b", None)]),
+        ("кофе 100\r\nчай 50", [("кофе", None), ("чай", None)]),
+    ],
+)
+def test_parse_batch_lines(
+    text: str, expected: list[tuple[str, Optional[str]]]
+) -> None:
+    assert [
+        (line.entry.name, line.entry.category)
+        for line in parse_batch(text)
+        if line.entry
+    ] == expected
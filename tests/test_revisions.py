@@ -0,0 +1,88 @@
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import update
+
+from db.models import Base, MovieModel, UserModel
+from db.repository.counter import CounterRepo
+from db.repository.movies import MoviesRepository
+from db.session import Database
+
+OWNER = 1
+OTHER = 2
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[Database]:
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'revisions.db'}")
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with database.transaction() as session:
+        session.add_all([UserModel(tg_id=OWNER), UserModel(tg_id=OTHER)])
+    yield database
+    await database.dispose()
+
+
+async def revision(db: Database, owner_id: int = OWNER) -> int:
+    async with db.get_session() as session:
+        (value,) = await CounterRepo(session, owner_id).revisions("movies")
+    return value
+
+
+async def add_movie(db: Database, title: str) -> int:
+    async with db.transaction() as session:
+        movie = await MoviesRepository(session, OWNER).create(
+            title=title, year=2000, description=None, poster=None
+        )
+        await session.flush()
+    return movie.id
+
+
+async def test_every_write_bumps(db: Database) -> None:
+    assert await revision(db) == 0
+    first = await add_movie(db, "a")
+    # Две записи за одну секунду - две разные ревизии
+    await add_movie(db, "b")
+    assert await revision(db) == 2
+
+    async with db.transaction() as session:
+        await MoviesRepository(session, OWNER).delete(first)
+    await add_movie(db, "c")
+    assert await revision(db) == 4
+    assert await revision(db, OTHER) == 0
+
+
+async def test_orm_update_bumps(db: Database) -> None:
+    movie_id = await add_movie(db, "a")
+    async with db.transaction() as session:
+        await MoviesRepository(session, OWNER).set_watched(movie_id)
+    assert await revision(db) == 2
+
+
+async def test_rollback_keeps_revision(db: Database) -> None:
+    with pytest.raises(RuntimeError):
+        async with db.transaction() as session:
+            await MoviesRepository(session, OWNER).create(
+                title="a", year=2000, description=None, poster=None
+            )
+            await session.flush()
+            raise RuntimeError
+    await add_movie(db, "b")
+    assert await revision(db) == 1
+
+
+async def test_bulk_without_owner_bumps_everyone(db: Database) -> None:
+    await add_movie(db, "a")
+    async with db.transaction() as session:
+        CounterRepo(session)
+        await session.execute(update(MovieModel).values(description="x"))
+    assert await revision(db) == 2
+    assert await revision(db, OTHER) == 1
+
+
+async def test_reconcile_ignores_revisions(db: Database) -> None:
+    await add_movie(db, "a")
+    async with db.transaction() as session:
+        await CounterRepo(session).reconcile()
+    assert await revision(db) == 1
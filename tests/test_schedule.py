@@ -0,0 +1,93 @@
+import datetime
+from typing import Optional
+
+import pytest
+
+from scheduler.schedule import Schedule, catch_up, next_boundary
+
+
+def ts(year: int, month: int, day: int, hour: int = 0) -> int:
+    """Метка времени в локальной зоне, как её считает планировщик"""
+    return int(datetime.datetime(year, month, day, hour).timestamp())
+
+
+@pytest.mark.parametrize(
+    ("schedule", "after", "expected"),
+    [
+        (Schedule("monthly", day=1), ts(2026, 10, 19, 12), ts(2026, 11, 1)),
+        (Schedule("monthly", day=1), ts(2026, 12, 5), ts(2027, 1, 1)),
+        # Граница строго после `after`
+        (Schedule("monthly", day=19), ts(2026, 10, 19), ts(2026, 11, 19)),
+        (Schedule("monthly", day=31), ts(2026, 1, 31), ts(2026, 2, 28)),
+        (Schedule("monthly", day=31), ts(2026, 2, 28), ts(2026, 3, 31)),
+        (Schedule("monthly", day=31), ts(2026, 4, 1), ts(2026, 4, 30)),
+        (Schedule("monthly", day=30), ts(2026, 1, 30), ts(2026, 2, 28)),
+        (Schedule("monthly", day=29), ts(2026, 2, 1), ts(2026, 2, 28)),
+        (Schedule("monthly", day=29), ts(2028, 2, 1), ts(2028, 2, 29)),
+        (Schedule("monthly", day=29), ts(2028, 2, 29), ts(2028, 3, 29)),
+        # 2026-10-19 - понедельник
+        (Schedule("weekly", day=0), ts(2026, 10, 19), ts(2026, 10, 26)),
+        (Schedule("weekly", day=2), ts(2026, 10, 19, 9), ts(2026, 10, 21)),
+        (Schedule("weekly", day=6), ts(2026, 10, 25, 23), ts(2026, 11, 1)),
+        (
+            Schedule("interval", interval_days=3),
+            ts(2026, 10, 19, 9),
+            ts(2026, 10, 22, 9),
+        ),
+        (Schedule("interval"), ts(2026, 10, 19), None),
+        (Schedule("manual"), ts(2026, 10, 19), None),
+    ],
+)
+def test_next_boundary(schedule: Schedule, after: int, expected: Optional[int]) -> None:
+    assert next_boundary(schedule, after) == expected
+
+
+@pytest.mark.parametrize(
+    ("schedule", "due", "now", "expected"),
+    [
+        # Простоя не было: граница наступила, следующая - через период
+        (
+            Schedule("monthly", day=1),
+            ts(2026, 10, 1),
+            ts(2026, 10, 19),
+            (ts(2026, 10, 1), ts(2026, 11, 1)),
+        ),
+        # Пропущено несколько месяцев: last_reset - последняя прошедшая граница
+        (
+            Schedule("monthly", day=1),
+            ts(2026, 6, 1),
+            ts(2026, 10, 19),
+            (ts(2026, 10, 1), ts(2026, 11, 1)),
+        ),
+        # Через февраль день 31 не «прилипает» к 28 числу
+        (
+            Schedule("monthly", day=31),
+            ts(2026, 1, 31),
+            ts(2026, 4, 15),
+            (ts(2026, 3, 31), ts(2026, 4, 30)),
+        ),
+        (
+            Schedule("weekly", day=0),
+            ts(2026, 9, 28),
+            ts(2026, 10, 20),
+            (ts(2026, 10, 19), ts(2026, 10, 26)),
+        ),
+        # Граница, равная now, уже наступила
+        (
+            Schedule("interval", interval_days=7),
+            ts(2026, 9, 28),
+            ts(2026, 10, 19),
+            (ts(2026, 10, 19), ts(2026, 10, 26)),
+        ),
+        (
+            Schedule("manual"),
+            ts(2026, 9, 28),
+            ts(2026, 10, 19),
+            (ts(2026, 9, 28), None),
+        ),
+    ],
+)
+def test_catch_up(
+    schedule: Schedule, due: int, now: int, expected: tuple[int, Optional[int]]
+) -> None:
+    assert catch_up(schedule, due, now) == expected
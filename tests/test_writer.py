@@ -0,0 +1,92 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+
+from db.session import Database
+from db.writer import WriterClosedError
+
+
+@pytest.fixture
+async def db(tmp_path: Path) -> AsyncIterator[Database]:
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'writer.db'}")
+    async with database.engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE t (v INTEGER UNIQUE)")
+    yield database
+    await database.dispose()
+
+
+async def insert(db: Database, value: int) -> None:
+    async with db.transaction() as session:
+        await session.execute(text("INSERT INTO t (v) VALUES (:v)"), {"v": value})
+
+
+async def values(db: Database) -> list[int]:
+    async with db.get_session() as session:
+        rows = await session.execute(text("SELECT v FROM t ORDER BY v"))
+        return list(rows.scalars())
+
+
+async def test_group_commit(db: Database) -> None:
+    await asyncio.gather(*(insert(db, v) for v in range(20)))
+    assert await values(db) == list(range(20))
+    assert db.writer is not None
+    assert db.writer.writes == 20
+    assert db.writer.batches < 20
+
+
+async def test_failed_write_rolls_back_only_itself(db: Database) -> None:
+    results = await asyncio.gather(
+        insert(db, 1), insert(db, 1), insert(db, 2), return_exceptions=True
+    )
+    assert sum(isinstance(r, Exception) for r in results) == 1
+    assert await values(db) == [1, 2]
+
+
+async def test_error_in_block_rolls_back(db: Database) -> None:
+    with pytest.raises(ValueError, match="boom"):
+        async with db.transaction() as session:
+            await session.execute(text("INSERT INTO t (v) VALUES (1)"))
+            raise ValueError("boom")
+    await insert(db, 2)
+    assert await values(db) == [2]
+
+
+async def test_nested_transaction_reuses_session(db: Database) -> None:
+    async with db.transaction() as outer:
+        async with db.transaction() as inner:
+            assert inner is outer
+            await inner.execute(text("INSERT INTO t (v) VALUES (1)"))
+    assert await values(db) == [1]
+
+
+async def test_close_mid_batch(db: Database) -> None:
+    assert db.writer is not None
+    granted = asyncio.Event()
+    release = asyncio.Event()
+
+    async def holder() -> None:
+        async with db.transaction() as session:
+            await session.execute(text("INSERT INTO t (v) VALUES (1)"))
+            granted.set()
+            await release.wait()
+
+    task = asyncio.create_task(holder())
+    await granted.wait()
+    queued = asyncio.create_task(insert(db, 2))
+    await asyncio.sleep(0)
+
+    await asyncio.wait_for(db.writer.close(), 1)
+    release.set()
+    # Владелец сессии и стоявший в очереди получают ошибку вместо зависания
+    with pytest.raises(WriterClosedError):
+        await asyncio.wait_for(task, 1)
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(queued, 1)
+    assert await values(db) == []
+
+    # Следующая запись снова запускает писателя
+    await insert(db, 3)
+    assert await values(db) == [3]